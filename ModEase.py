@@ -1,21 +1,121 @@
-import customtkinter as ctk
-import tkinter as tk
-from tkinter import filedialog, messagebox
 import requests
-from bs4 import BeautifulSoup
 import os
+import sys
+import argparse
 import time
 import threading
+import contextvars
+import asyncio
 import re
 import json
+import random
+import hashlib
+import shutil
+import sqlite3
+import zlib
+import heapq
+import itertools
+import concurrent.futures
+import functools
+from urllib.parse import urlsplit, urlencode, parse_qsl
+from html.parser import HTMLParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from email.utils import parsedate_to_datetime
 from collections import Counter
 
 API_KEY = "you might want to you use your own api key. (from curse forge)"
 
-BASE_API_URL = "https://api.curseforge.com/v1"
-MODRINTH_API_BASE_URL = "https://api.modrinth.com/v2"
+DEFAULT_CF_API_URL = "https://api.curseforge.com/v1"
+DEFAULT_MODRINTH_API_URL = "https://api.modrinth.com/v2"
+BASE_API_URL = DEFAULT_CF_API_URL
+MODRINTH_API_BASE_URL = DEFAULT_MODRINTH_API_URL
+MIRROR_URL = None
 GAME_ID_MINECRAFT = 432
 
+MAX_CONCURRENT_DOWNLOADS = 8
+DEFAULT_PER_HOST_DOWNLOAD_LIMIT = 4
+PER_HOST_DOWNLOAD_LIMITS = {
+    "edge.forgecdn.net": 6, "mediafilez.forgecdn.net": 6,
+    "cdn.modrinth.com": 4
+}
+MC_RELEASE_VERSION_RE = re.compile(r"^\d+(\.\d+)+(\.\d+)?(-\w+(\.\d+)?)?$")
+ANY_LOADER_KEY = "*"
+CF_DEPENDENCY_RELATIONS = {2: "optional", 3: "required", 5: "incompatible"}
+FOLLOWED_DEPENDENCY_RELATIONS = ("required", "optional")
+MODRINTH_PROJECT_URL_RE = re.compile(r"modrinth\.com/(?:mod|plugin|resourcepack|shader|datapack|modpack)/([^/?#]+)")
+DEPENDENCY_GRAPH_NAME = "modease.deps.json"
+MODRINTH_COLLECTION_HREF_RE = re.compile(r"^/(?:mod|plugin|resourcepack|shader|datapack|modpack)/([^/?#]{2,})")
+MODRINTH_COLLECTION_CARD_CLASS_RE = re.compile(r"(project-card|item|result|hit|flex-item)", re.I)
+HTML_READ_CHUNK_SIZE = 64 * 1024
+HTML_VOID_ELEMENTS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"))
+VERSION_PART_SPLIT_RE = re.compile(r"[.-]")
+VERSION_PART_NUMBER_RE = re.compile(r"^\D?(\d+)")
+DOWNLOAD_STATUS_INTERVAL_SECONDS = 5.0
+METRICS_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRICS_MAX_EVENTS = 50000
+RESOLVE_WORKERS = 8
+CF_BULK_CHUNK_SIZE = 500
+CF_PIPELINE_BATCH_SIZE = 50
+MODRINTH_BULK_CHUNK_SIZE = 100
+CF_FILES_PAGE_SIZE = 50
+CF_FILES_MAX_INDEX = 10000
+CF_FILE_HISTORY_WORKERS = 4
+
+HOST_RATE_LIMITS = {
+    "api.curseforge.com": (20.0, 20),
+    "api.modrinth.com": (5.0, 10)
+}
+MAX_REQUEST_RETRIES = 4
+RETRY_BASE_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 60.0
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+USE_HTTP2 = False
+USE_ASYNC_ENGINE = False
+ASYNC_MAX_CONCURRENCY = 64
+ASYNC_WRITE_BATCH_BYTES = 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT_SECONDS = 300
+DOWNLOAD_RESUME_ATTEMPTS = 5
+PART_FILE_SUFFIX = ".part"
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-\d+/(\d+|\*)$")
+API_POOL_SIZE = RESOLVE_WORKERS * 2
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".modease")
+LOCKFILE_NAME = "modease.lock.json"
+LOCKFILE_VERSION = 1
+SYNC_MODE_NAME = "Sync from Lockfile"
+BATCH_MODE_NAME = "Batch Manifest"
+BATCH_MAX_CONCURRENT_JOBS = 3
+ARTIFACT_STORE_ENABLED = True
+ARTIFACT_STORE_DIR = os.path.join(CACHE_DIR, "store")
+CONFIG_PATH = os.path.join(CACHE_DIR, "config.json")
+CONFIG_ENV_VARS = {
+    "cfApiUrl": "MODEASE_CF_API_URL", "modrinthApiUrl": "MODEASE_MODRINTH_API_URL",
+    "mirrorUrl": "MODEASE_MIRROR_URL", "apiKey": "MODEASE_API_KEY", "http2": "MODEASE_HTTP2"
+}
+MIRROR_DEFAULT_BIND = "127.0.0.1:8780"
+MIRROR_CACHE_DIR = os.path.join(CACHE_DIR, "mirror")
+MIRROR_ALLOWED_HOST_SUFFIXES = ("curseforge.com", "forgecdn.net", "modrinth.com")
+CF_HASH_ALGOS = {1: "sha1", 2: "md5"}
+HASH_ALGO_PREFERENCE = ("sha512", "sha1", "md5")
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_PATH = os.path.join(CACHE_DIR, "http_cache.sqlite3")
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+HTTP_CACHE_DEFAULT_TTL_SECONDS = 3600
+HTTP_CACHE_ACCESS_RESOLUTION_SECONDS = 600  # LRU recency granularity; hits within it skip the last_access write
+FILE_HISTORY_ENABLED = True
+FILE_HISTORY_PATH = os.path.join(CACHE_DIR, "file_history.sqlite3")
+HTTP_CACHE_TTLS = [
+    (re.compile(r"/mods/search$"), 24 * 3600),
+    (re.compile(r"/mods(/\d+)?$"), 6 * 3600),
+    (re.compile(r"/mods/\d+/files$|/mods/files$"), 3600),
+    (re.compile(r"/projects?(/[^/]+)?$"), 6 * 3600),
+    (re.compile(r"/project/[^/]+/version$|/versions$|/version_files/update$"), 3600),
+    (re.compile(r"/search$"), 6 * 3600),
+    (re.compile(r"/collection/"), 1800)
+]
+
 MODRINTH_HEADERS = {
     "User-Agent": "ProjectDownloaderGUI/1.1 (PythonScript)"
 }
@@ -30,6 +130,8 @@ _CLASS_ID_TO_NAME_MAP = {}
 for data_val in PROJECT_TYPES.values():
     if data_val["classId"] not in _CLASS_ID_TO_NAME_MAP:
         _CLASS_ID_TO_NAME_MAP[data_val["classId"]] = data_val["name"]
+CF_PROJECT_URL_RE = re.compile(r"curseforge\.com/minecraft/(" + "|".join(map(re.escape, PROJECT_TYPES)) + r")/", re.I)
+
 if 6 not in _CLASS_ID_TO_NAME_MAP: _CLASS_ID_TO_NAME_MAP[6] = "mod"
 if 12 not in _CLASS_ID_TO_NAME_MAP: _CLASS_ID_TO_NAME_MAP[12] = "resource pack"
 
@@ -49,158 +151,1332 @@ MODRINTH_API_TYPE_TO_DISPLAY_NAME = {
     "datapack": "Datapack", "plugin": "Plugin"
 }
 
-session = requests.Session()
-session.headers.update({"x-api-key": API_KEY, "Accept": "application/json"})
+class DownloadScheduler:
+    """Runs download jobs on a fixed pool of worker threads, honoring per-host concurrency limits and job priority."""
+    def __init__(self, max_workers=MAX_CONCURRENT_DOWNLOADS, per_host_limits=None, default_host_limit=DEFAULT_PER_HOST_DOWNLOAD_LIMIT):
+        self.max_workers = max_workers
+        self.per_host_limits = dict(per_host_limits or {})
+        self.default_host_limit = default_host_limit
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._in_flight = Counter()
+        self._seq = itertools.count()
+        self._workers = []
+
+    def host_limit(self, host):
+        """Returns the maximum number of simultaneous downloads allowed for a host."""
+        return self.per_host_limits.get(host, self.default_host_limit)
+
+    def submit(self, fn, *args, host="", priority=0):
+        """Queues fn(*args) to run in the caller's context (JobContext included); lower priority values run first. Returns a Future."""
+        future = concurrent.futures.Future()
+        with self._cond:
+            job = (priority, next(self._seq), future, contextvars.copy_context().run, (fn,) + args)
+            heapq.heappush(self._pending.setdefault(host, []), job)
+            while len(self._workers) < self.max_workers:
+                t = threading.Thread(target=self._worker_loop, name=f"download-worker-{len(self._workers)}", daemon=True)
+                self._workers.append(t); t.start()
+            self._cond.notify()
+        return future
+
+    def stats(self):
+        """Returns a snapshot of queue depth and in-flight counts, overall and per host."""
+        with self._cond:
+            hosts = set(self._pending) | set(self._in_flight)
+            return {
+                "queued": sum(len(heap) for heap in self._pending.values()),
+                "in_flight": sum(self._in_flight.values()),
+                "per_host": {h: {"queued": len(self._pending.get(h, [])), "in_flight": self._in_flight.get(h, 0)} for h in hosts}
+            }
+
+    def _take_next_job_locked(self):
+        best_host, best_entry = None, None
+        for host, heap in self._pending.items():
+            if self._in_flight[host] >= self.host_limit(host): continue
+            if best_entry is None or heap[0][:2] < best_entry[:2]:
+                best_host, best_entry = host, heap[0]
+        if best_entry is None: return None, None
+        heapq.heappop(self._pending[best_host])
+        if not self._pending[best_host]: del self._pending[best_host]
+        self._in_flight[best_host] += 1
+        return best_host, best_entry
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                host, entry = self._take_next_job_locked()
+                while entry is None:
+                    self._cond.wait()
+                    host, entry = self._take_next_job_locked()
+            _, _, future, fn, args = entry
+            try:
+                if future.set_running_or_notify_cancel():
+                    try: future.set_result(fn(*args))
+                    except BaseException as e: future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._in_flight[host] -= 1
+                    if self._in_flight[host] <= 0: del self._in_flight[host]
+                    self._cond.notify_all()
 
-MC_VERSION_INPUT_GLOBAL = ""
-MC_VERSION_GLOBAL = ""
-LOADER_GLOBAL = ""
-LOADER_API_ID_GLOBAL = 0
-DOWNLOAD_FOLDER_GLOBAL = ""
-MISSED_ITEMS_GLOBAL = []
 
+download_scheduler = DownloadScheduler(per_host_limits=PER_HOST_DOWNLOAD_LIMITS)
 
-def parse_version_string_backend(v_str):
-    """Converts a version string (e.g., '1.16.5') to a tuple of integers for comparison."""
-    parts = []
-    for part in re.split(r'[.-]', str(v_str)):
-        numeric_prefix = ""
-        for char_idx, char_val in enumerate(part):
-            if char_val.isdigit():
-                numeric_prefix += char_val
-            else:
-                if char_idx == 0 and len(part) > 1 and not numeric_prefix :
-                    continue
-                break
-        if numeric_prefix:
-            parts.append(int(numeric_prefix))
-        elif not parts:
-            parts.append(0)
-    return tuple(parts) if parts else (0,)
 
+class Http2Response:
+    """Wraps an httpx response in the subset of the requests.Response interface the backend uses."""
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
 
-def gui_log(message):
-    """Safely logs a message to the GUI's log area."""
-    if app and hasattr(app, 'log_message'):
-        app.log_message(message)
-    else: 
-        print(f"GUI_LOG_FALLBACK: {message}")
+    @property
+    def content(self): return self._response.read()
+
+    @property
+    def text(self): return self.content.decode(self._response.encoding or "utf-8", errors="replace")
+
+    def json(self): return json.loads(self.content)
+
+    def iter_content(self, chunk_size=8192): return self._response.iter_bytes(chunk_size)
+
+    def close(self): self._response.close()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class Http2Session:
+    """requests.Session stand-in backed by an httpx HTTP/2 client; needs the optional httpx[http2] package."""
+    def __init__(self, headers=None, pool_size=10):
+        import httpx
+        self._httpx = httpx
+        self.headers = dict(headers or {})
+        self._client = httpx.Client(
+            http2=True, headers=self.headers,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    def request(self, method, url, params=None, json=None, headers=None, timeout=None, stream=False, allow_redirects=True):
+        try:
+            request = self._client.build_request(method, url, params=params, json=json, headers={**self.headers, **(headers or {})}, timeout=timeout)
+            return Http2Response(self._client.send(request, stream=stream, follow_redirects=allow_redirects))
+        except self._httpx.TimeoutException as e: raise requests.exceptions.Timeout(str(e))
+        except self._httpx.TransportError as e: raise requests.exceptions.ConnectionError(str(e))
+
+    def get(self, url, **kwargs): return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs): return self.request("POST", url, **kwargs)
+
+
+def create_http_session_backend(headers, pool_size):
+    """Creates a keep-alive session whose connection pool matches the given concurrency, using HTTP/2 when enabled and available."""
+    if USE_HTTP2:
+        try: return Http2Session(headers, pool_size)
+        except ImportError as e: print(f"HTTP/2 transport unavailable ({e}); falling back to HTTP/1.1 keep-alive.")
+    http_session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    http_session.mount("https://", adapter)
+    http_session.mount("http://", adapter)
+    http_session.headers.update(headers)
+    return http_session
 
 
-def make_api_request_backend(url, params=None, use_cf_session=True, is_json=True):
-    """Makes an API request and handles common errors, logging to GUI."""
+session = create_http_session_backend({"x-api-key": API_KEY, "Accept": "application/json"}, API_POOL_SIZE)
+modrinth_session = create_http_session_backend(MODRINTH_HEADERS, API_POOL_SIZE)
+_download_sessions = {}
+_download_sessions_lock = threading.Lock()
+
+def rebuild_http_sessions_backend(api_key=API_KEY):
+    """Recreates the API sessions and drops the pooled download sessions, so a changed USE_HTTP2 applies to later requests."""
+    global session, modrinth_session
+    session = create_http_session_backend({"x-api-key": api_key, "Accept": "application/json"}, API_POOL_SIZE)
+    modrinth_session = create_http_session_backend(MODRINTH_HEADERS, API_POOL_SIZE)
+    with _download_sessions_lock: _download_sessions.clear()
+
+
+def load_config_backend(config_path=None, overrides=None):
+    """Merges endpoint settings (cfApiUrl, modrinthApiUrl, mirrorUrl, apiKey, http2).
+
+    Later sources win: the JSON config file (config_path, $MODEASE_CONFIG or ~/.modease/config.json), then the MODEASE_*
+    environment variables, then overrides (CLI flags). Raises ValueError when an explicitly given config file is missing.
+    """
+    config = {}
+    path = config_path or os.environ.get("MODEASE_CONFIG") or CONFIG_PATH
     try:
-        if use_cf_session:
-            response = session.get(url, params=params, timeout=20)
-        else:
-            response = requests.get(url, params=params, headers=MODRINTH_HEADERS, timeout=20)
-        response.raise_for_status()
-        return response.json() if is_json else response.content
-    except requests.exceptions.HTTPError as e:
-        err_msg = f"API HTTP Error: {e.response.status_code} for {url}"
-        try: err_msg += f" - {e.response.json().get('description', e.response.json().get('error', e.response.text))}"
-        except: err_msg += f" - {e.response.text[:100]}"
-        gui_log(err_msg)
+        with open(path, "r", encoding="utf-8") as f: file_config = json.load(f)
+        if not isinstance(file_config, dict): raise ValueError("expected a JSON object")
+        config.update({key: value for key, value in file_config.items() if key in CONFIG_ENV_VARS and value})
+    except FileNotFoundError:
+        if config_path: raise ValueError(f"Config file not found: {config_path}")
+    except (OSError, ValueError) as e: print(f"Ignoring config file {path}: {e}")
+    config.update({key: os.environ[env] for key, env in CONFIG_ENV_VARS.items() if os.environ.get(env)})
+    config.update({key: value for key, value in (overrides or {}).items() if value})
+    return config
+
+def apply_config_backend(config):
+    """Points the API clients at the configured endpoints. With a mirror, API calls, pages and downloads all go through it.
+
+    The HTTP sessions are rebuilt, so the http2 setting and API key take effect for every later request.
+    """
+    global BASE_API_URL, MODRINTH_API_BASE_URL, MIRROR_URL, USE_HTTP2
+    BASE_API_URL = config.get("cfApiUrl", DEFAULT_CF_API_URL).rstrip("/")
+    MODRINTH_API_BASE_URL = config.get("modrinthApiUrl", DEFAULT_MODRINTH_API_URL).rstrip("/")
+    MIRROR_URL = (config.get("mirrorUrl") or "").rstrip("/") or None
+    if MIRROR_URL:
+        BASE_API_URL, MODRINTH_API_BASE_URL = f"{MIRROR_URL}/cf", f"{MIRROR_URL}/modrinth"
+        download_scheduler.per_host_limits.setdefault(urlsplit(MIRROR_URL).hostname or "", MAX_CONCURRENT_DOWNLOADS)
+    USE_HTTP2 = str(config.get("http2", False)).lower() in ("1", "true", "yes", "on")
+    rebuild_http_sessions_backend(config.get("apiKey", API_KEY))
+
+
+def get_download_session_backend(host):
+    """Returns the pooled keep-alive session for a download host, sized to that host's concurrency limit."""
+    with _download_sessions_lock:
+        if host not in _download_sessions:
+            _download_sessions[host] = create_http_session_backend(MODRINTH_HEADERS, download_scheduler.host_limit(host))
+        return _download_sessions[host]
+
+
+class HostRateLimiter:
+    """Per-host token buckets (requests per second, burst) that also follow X-Ratelimit-* and Retry-After hints."""
+    def __init__(self, limits=None):
+        self.limits = dict(limits or {})
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._blocked_until = {}
+
+    def try_acquire(self, host):
+        """Takes a token for host if one is available. Returns 0 on success, else the seconds to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._blocked_until.get(host, 0) - now
+            if wait > 0: return wait
+            if host not in self.limits: return 0
+            rate, burst = self.limits[host]
+            tokens, last_refill = self._buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + (now - last_refill) * rate)
+            if tokens >= 1:
+                self._buckets[host] = (tokens - 1, now)
+                return 0
+            self._buckets[host] = (tokens, now)
+            return (1 - tokens) / rate
+
+    def acquire(self, host):
+        """Blocks until a request to host is allowed. Hosts without a configured limit only honor server backoff."""
+        while (wait := self.try_acquire(host)) > 0: time.sleep(wait)
+
+    def block(self, host, seconds):
+        """Holds back every request to host for the given number of seconds."""
+        with self._lock:
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0), time.monotonic() + seconds)
+
+    def observe(self, host, response):
+        """Applies the server's rate-limit headers. Returns the Retry-After delay in seconds, or None."""
+        remaining, reset = response.headers.get("X-Ratelimit-Remaining"), response.headers.get("X-Ratelimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                if int(remaining) <= 0: self.block(host, float(reset))
+            except ValueError: pass
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is None: return None
+        try: return max(0.0, float(retry_after))
+        except ValueError: pass
+        try: return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError): return None
+
+
+rate_limiter = HostRateLimiter(HOST_RATE_LIMITS)
+
+
+class ResponseCache:
+    """Persistent SQLite cache of API responses with per-endpoint TTLs, ETag/Last-Modified validators and LRU size capping."""
+    def __init__(self, path=HTTP_CACHE_PATH, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._total_bytes = 0
+
+    def _connect_locked(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT, body BLOB, size INTEGER, "
+                "etag TEXT, last_modified TEXT, fetched_at REAL, expires_at REAL, last_access REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        return self._conn
+
+    @staticmethod
+    def make_key(method, url, params=None, json_body=None):
+        """Builds the cache key for a request from its method, URL, query params and JSON body."""
+        raw = json.dumps([method, url, sorted((params or {}).items()), json_body], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def ttl_for_url(url):
+        """Returns the freshness lifetime configured for an endpoint."""
+        path = urlsplit(url).path.rstrip("/")
+        for pattern, ttl in HTTP_CACHE_TTLS:
+            if pattern.search(path): return ttl
+        return HTTP_CACHE_DEFAULT_TTL_SECONDS
+
+    def get(self, key):
+        """Returns the cached entry as a dict (body, etag, last_modified, fresh), or None.
+
+        last_access is only rewritten once it is older than HTTP_CACHE_ACCESS_RESOLUTION_SECONDS, so repeated hits stay read-only.
+        """
+        with self._lock:
+            conn = self._connect_locked()
+            row = conn.execute("SELECT body, etag, last_modified, expires_at, last_access FROM responses WHERE key = ?", (key,)).fetchone()
+            if not row: return None
+            now = time.time()
+            if now - row[4] >= HTTP_CACHE_ACCESS_RESOLUTION_SECONDS:
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                conn.commit()
+        return {"body": zlib.decompress(row[0]), "etag": row[1], "last_modified": row[2], "fresh": row[3] > now}
+
+    def put(self, key, url, body, etag=None, last_modified=None):
+        """Stores a response body, then evicts least recently used entries beyond the size cap."""
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            conn = self._connect_locked()
+            old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, compressed, len(compressed), etag, last_modified, now, now + self.ttl_for_url(url), now)
+            )
+            self._total_bytes += len(compressed) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes: self._evict_locked(conn)
+            conn.commit()
+
+    def refresh(self, key, url):
+        """Marks an entry fresh again after a 304 Not Modified revalidation."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect_locked()
+            conn.execute("UPDATE responses SET fetched_at = ?, expires_at = ?, last_access = ? WHERE key = ?", (now, now + self.ttl_for_url(url), now, key))
+            conn.commit()
+
+    def _evict_locked(self, conn):
+        target = int(self.max_bytes * 0.9)
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if self._total_bytes <= target: break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+
+    def clear(self):
+        """Removes every cached response."""
+        with self._lock:
+            conn = self._connect_locked()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+            self._total_bytes = 0
+
+
+response_cache = ResponseCache()
+
+
+class FileHistoryStore:
+    """Persistent SQLite store of each CF project's full file list, with the API's totalCount when it was last synced."""
+    def __init__(self, path=FILE_HISTORY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect_locked(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS file_history (mod_id INTEGER PRIMARY KEY, files BLOB, total_count INTEGER, "
+                "latest_date TEXT, latest_id INTEGER, updated_at REAL)"
+            )
+        return self._conn
+
+    def get(self, mod_id):
+        """Returns the stored history as a dict (files, total_count, watermark: newest (fileDate, id)), or None."""
+        with self._lock:
+            row = self._connect_locked().execute(
+                "SELECT files, total_count, latest_date, latest_id FROM file_history WHERE mod_id = ?", (mod_id,)
+            ).fetchone()
+        if not row: return None
+        return {"files": json.loads(zlib.decompress(row[0])), "total_count": row[1], "watermark": (row[2] or "", row[3] or 0)}
+
+    def put(self, mod_id, files, total_count):
+        """Replaces a project's stored history."""
+        latest = max((get_cf_file_sort_key_backend(f) for f in files), default=("", 0))
+        compressed = zlib.compress(json.dumps(files, separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            conn = self._connect_locked()
+            conn.execute("INSERT OR REPLACE INTO file_history VALUES (?, ?, ?, ?, ?, ?)", (mod_id, compressed, total_count, latest[0], latest[1], time.time()))
+            conn.commit()
+
+    def clear(self):
+        """Removes every stored history."""
+        with self._lock:
+            conn = self._connect_locked()
+            conn.execute("DELETE FROM file_history")
+            conn.commit()
+
+
+file_history_store = FileHistoryStore()
+
+
+class WorkAbandoned(Exception):
+    """Raised inside work whose result is no longer wanted, e.g. version analysis still running after an early exit."""
+
+
+class RunMemo:
+    """Memo of API lookups for one job (or one batch); concurrent callers asking for the same key share a single fetch.
+
+    Each JobContext gets a fresh memo unless a batch hands its jobs a shared one, so nothing carries over between runs.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._pending = {}
+
+    def get_or_compute(self, key, compute_fn):
+        """Returns the memoized value for key, calling compute_fn only if no other caller has fetched it.
+
+        Callers that waited on a fetch that raised get the same exception; the next caller after that tries again. A fetch
+        that was abandoned (WorkAbandoned) is instead retried by one of its waiters.
+        """
+        with self._lock:
+            if key in self._values: return self._values[key]
+            pending = self._pending.get(key)
+            is_owner = pending is None
+            if is_owner: pending = self._pending[key] = [threading.Event(), None]
+        if not is_owner:
+            pending[0].wait()
+            with self._lock:
+                if key in self._values: return self._values[key]
+            if isinstance(pending[1], WorkAbandoned): return self.get_or_compute(key, compute_fn)
+            raise pending[1]
+        try:
+            value = compute_fn()
+            with self._lock: self._values[key] = value
+            return value
+        except BaseException as e:
+            pending[1] = e
+            raise
+        finally:
+            with self._lock: self._pending.pop(key, None)
+            pending[0].set()
+
+    def peek(self, key):
+        """Returns the value already memoized for key, or None without computing anything."""
+        with self._lock: return self._values.get(key)
+
+    def forget(self, key):
+        """Drops the value memoized for key, so the next caller computes it again."""
+        with self._lock: self._values.pop(key, None)
+
+
+class Metrics:
+    """Thread-safe run metrics: labelled counters, latency histograms and a bounded trace of timed events.
+
+    Exported at the end of a run as JSON lines (every event, then every counter and histogram) or as Prometheus text.
+    """
+    def __init__(self, buckets=METRICS_LATENCY_BUCKETS, max_events=METRICS_MAX_EVENTS):
+        self.buckets = tuple(buckets)
+        self.max_events = max_events
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._events = []
+        self.dropped_events = 0
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock: self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None: histogram = self._histograms[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            histogram["counts"][next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def record_event(self, event_type, **fields):
+        with self._lock:
+            if len(self._events) >= self.max_events: self.dropped_events += 1; return
+            self._events.append(dict(fields, type=event_type, ts=round(time.time(), 6)))
+
+    def counter_value(self, name, **labels):
+        """Sums a counter over every label set that includes the given labels."""
+        with self._lock:
+            return sum(value for (n, label_items), value in self._counters.items() if n == name and set(labels.items()) <= set(label_items))
+
+    def histogram_totals(self, name, label):
+        """Returns {label value: (count, sum)} for a histogram, summed over its other labels."""
+        totals = {}
+        with self._lock:
+            for (n, label_items), histogram in self._histograms.items():
+                if n != name: continue
+                count, total = totals.get(dict(label_items).get(label), (0, 0.0))
+                totals[dict(label_items).get(label)] = (count + histogram["count"], total + histogram["sum"])
+        return totals
+
+    def to_jsonl(self):
+        with self._lock:
+            lines = [json.dumps(event) for event in self._events]
+            lines += [json.dumps({"type": "counter", "name": n, "labels": dict(l), "value": v}) for (n, l), v in sorted(self._counters.items())]
+            for (n, l), histogram in sorted(self._histograms.items()):
+                cumulative = list(itertools.accumulate(histogram["counts"]))
+                lines.append(json.dumps({
+                    "type": "histogram", "name": n, "labels": dict(l), "sum": round(histogram["sum"], 6), "count": histogram["count"],
+                    "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], cumulative))
+                }))
+        return "\n".join(lines) + "\n"
+
+    def to_prometheus(self):
+        def format_labels(label_items, extra=()):
+            items = list(label_items) + list(extra)
+            if not items: return ""
+            escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+            return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+        lines, typed = [], set()
+        with self._lock:
+            for (n, l), v in sorted(self._counters.items()):
+                if n not in typed: lines.append(f"# TYPE {n} counter"); typed.add(n)
+                lines.append(f"{n}{format_labels(l)} {v}")
+            for (n, l), histogram in sorted(self._histograms.items()):
+                if n not in typed: lines.append(f"# TYPE {n} histogram"); typed.add(n)
+                for bound, cumulative in zip([str(b) for b in self.buckets] + ["+Inf"], itertools.accumulate(histogram["counts"])):
+                    lines.append(f"{n}_bucket{format_labels(l, [('le', bound)])} {cumulative}")
+                lines.append(f"{n}_sum{format_labels(l)} {round(histogram['sum'], 6)}")
+                lines.append(f"{n}_count{format_labels(l)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Writes the metrics to path: Prometheus text for a .prom file, JSON lines otherwise."""
+        content = self.to_prometheus() if path.endswith(".prom") else self.to_jsonl()
+        with open(path, 'w', encoding='utf-8') as f: f.write(content)
+
+def timed_phase_backend(phase):
+    """Decorator recording each call's wall time as `phase` in the current job's metrics (modease_phase_seconds plus a trace event)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            metrics, start = current_job().metrics, time.perf_counter()
+            try: return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                metrics.observe("modease_phase_seconds", elapsed, phase=phase)
+                metrics.record_event("phase", phase=phase, seconds=round(elapsed, 6), thread=threading.current_thread().name)
+        return wrapper
+    return decorator
+
+
+_console_lock = threading.Lock()
+
+class JobContext:
+    """One download job: its settings, thread-safe result collection and its own progress/log channel.
+
+    `memo` (API lookups), `downloads` (fetched artifacts) and `metrics` may be shared between the jobs of a batch.
+    The active job lives in a contextvar, so resolver/download worker threads (see submit_in_job_context_backend) and
+    asyncio tasks started for a job see the same context, and several jobs can run in one process at once. `progress` is
+    any object with the GUI window's progress/log methods (e.g. ModEaseGUI.App); without one, logs go to stdout.
+    """
+    def __init__(self, download_folder="", mc_version_input="best", loader="forge", offline=False,
+                 preferred_source="curseforge", progress=None, quiet=False, memo=None, downloads=None, label="", parent=None,
+                 metrics=None, metrics_path=None):
+        self.download_folder = download_folder
+        self.mc_version_input = mc_version_input
+        self.mc_version = "" if str(mc_version_input).lower() == "best" else mc_version_input
+        self.set_loader(loader)
+        self.offline = offline
+        self.preferred_source = preferred_source
+        self.progress = progress
+        self.quiet = quiet
+        self.memo = memo or RunMemo()
+        self.downloads = downloads or RunMemo()
+        self.metrics = metrics or Metrics()
+        self.metrics_path = metrics_path
+        self.label = label
+        self.parent = parent
+        self.children = []
+        self.async_engine = None
+        self._lock = threading.Lock()
+        self._missed_items = []
+        self._lock_entries = {}
+
+    def set_loader(self, loader):
+        self.loader = str(loader).lower()
+        self.loader_api_id = MODLOADER_MAP_CF_API.get(self.loader, 0)
+
+    def add_missed_item(self, item):
+        """Records a missed/skipped item ({'name', 'url', 'reason'}); safe to call from any thread. Abandoned work reports nothing."""
+        if is_work_abandoned_backend(): return
+        with self._lock: self._missed_items.append(item)
+
+    @property
+    def missed_items(self):
+        with self._lock: return list(self._missed_items)
+
+    def set_lock_entry(self, key, entry):
+        with self._lock: self._lock_entries[key] = entry
+
+    def clear_lock_entries(self):
+        with self._lock: self._lock_entries.clear()
+
+    @property
+    def lock_entries(self):
+        with self._lock: return dict(self._lock_entries)
+
+    def log(self, message):
+        if self.parent is not None: self.parent.log(f"[{self.label}] {message}")
+        elif self.progress is not None and hasattr(self.progress, 'log_message'): self.progress.log_message(message)
+        elif not self.quiet:
+            with _console_lock: print(message, flush=True)
+
+    def set_progress_total_steps(self, total_steps):
+        if self.progress is not None: self.progress.set_progress_total_steps(total_steps)
+
+    def set_progress(self, value):
+        if self.progress is not None: self.progress.set_progress(value)
+
+    def update_progress_indeterminate(self):
+        if self.progress is not None: self.progress.update_progress_indeterminate()
+
+    def update_progress_determinate_step(self, stop_indeterminate=False):
+        if self.progress is not None: self.progress.update_progress_determinate_step(stop_indeterminate=stop_indeterminate)
+
+    def update_mc_version_display(self, version_str):
+        if self.progress is not None: self.progress.update_mc_version_display(version_str)
+
+    def cancel(self):
+        """Cancels the job's (and its batch sub-jobs') in-flight async runs, if any. Safe to call from any thread."""
+        if self.async_engine: self.async_engine.cancel()
+        for child in list(self.children): child.cancel()
+
+
+current_job_var = contextvars.ContextVar("modease_current_job", default=JobContext())
+
+def current_job():
+    """Returns the JobContext of the running job (a default, GUI-less context outside any job)."""
+    return current_job_var.get()
+
+stop_event_var = contextvars.ContextVar("modease_stop_event", default=None)
+
+def is_work_abandoned_backend():
+    """True inside work started with a stop event (see stop_event_var) once that event is set."""
+    stop_event = stop_event_var.get()
+    return stop_event is not None and stop_event.is_set()
+
+def submit_in_job_context_backend(executor, fn, *args):
+    """executor.submit that runs fn inside the caller's context, so the worker sees the caller's JobContext."""
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+class McVersion:
+    """Interned, sortable Minecraft version: McVersion.of('1.20.1') parses a string once and then compares by its numeric key.
+
+    Each dot/dash part contributes its leading number, after at most one non-digit character ('w14a' -> 14, '24w14a' -> 24).
+    Parts with no such number, like 'rc2' or 'pre1', are dropped, so '1.20.1-rc2' keys as (1, 20, 1); a version whose
+    first part has no number starts with 0.
+    """
+    __slots__ = ("text", "key", "is_release")
+    _interned = {}
+
+    def __init__(self, text):
+        self.text = text
+        parts = []
+        for part in VERSION_PART_SPLIT_RE.split(text):
+            match = VERSION_PART_NUMBER_RE.match(part)
+            if match: parts.append(int(match.group(1)))
+            elif not parts: parts.append(0)
+        self.key = tuple(parts) if parts else (0,)
+        self.is_release = bool(MC_RELEASE_VERSION_RE.match(text))
+
+    @classmethod
+    def of(cls, v_str):
+        text = str(v_str)
+        version = cls._interned.get(text)
+        if version is None: version = cls._interned.setdefault(text, cls(text))
+        return version
+
+    def __lt__(self, other): return (self.key, self.text) < (other.key, other.text)
+    def __eq__(self, other): return isinstance(other, McVersion) and self.text == other.text
+    def __hash__(self): return hash(self.text)
+    def __repr__(self): return f"McVersion({self.text!r})"
+
+class McVersionMatcher:
+    """Decides which game-version strings count as compatible with one target MC version.
+
+    Strict matching is membership of the exact target; loose matching also accepts prefix matches either way (e.g. '1.20'
+    for '1.20.1'). Each distinct game-version string is classified once and then answered from a lookup table.
+    """
+    __slots__ = ("target", "_loose_matches")
+    _by_target = {}
+
+    def __init__(self, target):
+        self.target = target
+        self._loose_matches = {target: True}
+
+    @classmethod
+    def for_version(cls, target):
+        target = str(target)
+        matcher = cls._by_target.get(target)
+        if matcher is None: matcher = cls._by_target.setdefault(target, cls(target))
+        return matcher
+
+    def matches(self, game_versions, loose=False):
+        """True if any of a file's game versions is compatible with the target."""
+        if not loose: return self.target in game_versions
+        loose_matches = self._loose_matches
+        for game_version in game_versions:
+            hit = loose_matches.get(game_version)
+            if hit is None:
+                text = str(game_version)
+                hit = loose_matches[game_version] = text.startswith(self.target) or self.target.startswith(text.split('-')[0])
+            if hit: return True
+        return False
+
+class FileIndex:
+    """Per-project index over fetched file (or version) records, keyed by (MC version, loader) and pre-sorted newest first.
+
+    Built once per fetched list; strict lookups are dict hits, and every (version, loader, loose) answer is cached, so trying
+    several target versions against the same pack re-scans nothing.
+    """
+    __slots__ = ("entries", "_newest_by_version", "_newest_by_version_loader", "_selections")
+
+    def __init__(self, entries, versions_field, loaders_field, date_field=None, wildcard_loaders=False):
+        if date_field: entries = sorted(entries, key=lambda x: x.get(date_field, '1970-01-01'), reverse=True)
+        self.entries = entries
+        self._newest_by_version = {}
+        self._newest_by_version_loader = {}
+        self._selections = {}
+        for rank, entry in enumerate(entries):
+            loaders = {str(l).lower() for l in entry.get(loaders_field) or []}
+            if wildcard_loaders and (not loaders or "any" in loaders): loaders.add(ANY_LOADER_KEY)
+            for game_version in entry.get(versions_field) or []:
+                self._newest_by_version.setdefault(game_version, rank)
+                for loader in loaders: self._newest_by_version_loader.setdefault((game_version, loader), rank)
+
+    def _newest_rank(self, game_version, loader):
+        if loader is None: return self._newest_by_version.get(game_version)
+        ranks = [rank for rank in (self._newest_by_version_loader.get((game_version, loader)),
+                                   self._newest_by_version_loader.get((game_version, ANY_LOADER_KEY))) if rank is not None]
+        return min(ranks) if ranks else None
+
+    def select(self, mc_version, loader=None, loose=False):
+        """Returns the newest entry for mc_version and loader (None = any loader), or None. Loose uses McVersionMatcher rules."""
+        cache_key = (mc_version, loader, loose)
+        if cache_key not in self._selections:
+            if loose:
+                version_matcher = McVersionMatcher.for_version(mc_version)
+                game_versions = [gv for gv in self._newest_by_version if version_matcher.matches((gv,), loose=True)]
+            else:
+                game_versions = [mc_version]
+            ranks = [rank for rank in (self._newest_rank(gv, loader) for gv in game_versions) if rank is not None]
+            self._selections[cache_key] = self.entries[min(ranks)] if ranks else None
+        return self._selections[cache_key]
+
+def parse_version_string_backend(v_str):
+    """Converts a version string (e.g., '1.16.5') to a tuple of integers for comparison."""
+    return McVersion.of(v_str).key
+
+
+def gui_log(message):
+    """Logs a message to the current job's GUI log area (or stdout when headless)."""
+    current_job().log(message)
+
+
+def get_cached_response_backend(cache_key):
+    """Reads an entry from the response cache, treating cache failures as misses."""
+    if not HTTP_CACHE_ENABLED: return None
+    try: return response_cache.get(cache_key)
+    except (sqlite3.Error, OSError, zlib.error) as e:
+        gui_log(f"Response cache read failed: {e}")
+        return None
+
+def get_retry_delay_backend(attempt, retry_after=None):
+    """Seconds to wait before a retry: the server's Retry-After when given, else exponential backoff, both with jitter."""
+    if retry_after is not None: return min(RETRY_MAX_DELAY_SECONDS, retry_after) + random.uniform(0, 1)
+    return min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+def get_response_retry_delay_backend(host, status_code, response, attempt):
+    """Retry decision for an HTTP response, shared by the threaded and async transports.
+
+    Applies the response's rate-limit headers, then returns None to accept the response or the seconds to sleep before
+    retrying a 429/5xx. A 429 blocks the host in the rate limiter for the delay instead, so 0 is returned.
+    """
+    retry_after = rate_limiter.observe(host, response)
+    if status_code not in RETRYABLE_STATUS_CODES or attempt >= MAX_REQUEST_RETRIES: return None
+    delay = get_retry_delay_backend(attempt, retry_after)
+    current_job().metrics.inc("modease_http_retries_total", host=host, reason=str(status_code))
+    gui_log(f"HTTP {status_code} from {host}, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_REQUEST_RETRIES})")
+    if status_code == 429:
+        rate_limiter.block(host, delay)
+        return 0
+    return delay
+
+def get_network_retry_delay_backend(host, error, attempt):
+    """Retry decision for a connection error or timeout: the seconds to sleep before retrying, or None once retries are exhausted."""
+    if attempt >= MAX_REQUEST_RETRIES: return None
+    delay = get_retry_delay_backend(attempt)
+    current_job().metrics.inc("modease_http_retries_total", host=host, reason=error.__class__.__name__)
+    gui_log(f"Network error talking to {host} ({error.__class__.__name__}), retrying in {delay:.1f}s")
+    return delay
+
+def send_with_retries_backend(host, send_request):
+    """Sends a request through the host rate limiter, retrying 429/5xx responses and connection errors with jittered backoff."""
+    for attempt in range(MAX_REQUEST_RETRIES + 1):
+        rate_limiter.acquire(host)
+        try: response = send_request()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            delay = get_network_retry_delay_backend(host, e, attempt)
+            if delay is None: raise
+            time.sleep(delay); continue
+        delay = get_response_retry_delay_backend(host, response.status_code, response, attempt)
+        if delay is None: return response
+        response.close()
+        time.sleep(delay)
+
+
+class CachedApiRequest:
+    """The cache and bookkeeping side of one API request, shared by make_api_request_backend and AsyncEngine.request.
+
+    The transports only send: lookup() answers from the response cache (or offline mode) and sets conditional headers,
+    finish() turns the final response into the result. Both do blocking SQLite I/O.
+    """
+    def __init__(self, url, params=None, json_body=None, is_json=True):
+        self.url = url
+        self.is_json = is_json
+        self.cache_key = ResponseCache.make_key("POST" if json_body is not None else "GET", url, params, json_body)
+        self.host = urlsplit(url).hostname or ""
+        self.metrics = current_job().metrics
+        self.cached = None
+        self.headers = {}
+
+    def decode(self, body):
+        return json.loads(body) if self.is_json else body
+
+    def lookup(self):
+        """Returns (True, result) when the cache or offline mode already answers the request, else (False, None)."""
+        cached = self.cached = get_cached_response_backend(self.cache_key)
+        if cached and (cached["fresh"] or current_job().offline):
+            self.metrics.inc("modease_api_cache_hits_total", host=self.host, kind="fresh" if cached["fresh"] else "offline")
+            return True, self.decode(cached["body"])
+        if current_job().offline:
+            self.metrics.inc("modease_api_cache_misses_total", host=self.host)
+            gui_log(f"Offline: no cached response for {self.url}")
+            return True, None
+        if cached and cached["etag"]: self.headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]: self.headers["If-Modified-Since"] = cached["last_modified"]
+        return False, None
+
+    def finish(self, status_code, content, headers, seconds):
+        """Returns the result of the final response: the cached body after a 304, None (logged) on HTTP errors, else the
+        decoded body, which is also stored in the response cache."""
+        self.metrics.observe("modease_api_request_seconds", seconds, host=self.host)
+        self.metrics.inc("modease_api_requests_total", host=self.host, status=str(status_code))
+        if status_code == 304 and self.cached:
+            self.metrics.inc("modease_api_cache_hits_total", host=self.host, kind="revalidated")
+            if HTTP_CACHE_ENABLED: response_cache.refresh(self.cache_key, self.url)
+            return self.decode(self.cached["body"])
+        if status_code >= 400:
+            err_msg = f"API HTTP Error: {status_code} for {self.url}"
+            try:
+                body = json.loads(content)
+                err_msg += f" - {body.get('description', body.get('error', content.decode('utf-8', 'replace')))}"
+            except (ValueError, AttributeError): err_msg += f" - {content[:100].decode('utf-8', 'replace')}"
+            gui_log(err_msg)
+            return None
+        result = self.decode(content)
+        if HTTP_CACHE_ENABLED:
+            try: response_cache.put(self.cache_key, self.url, content, headers.get("ETag"), headers.get("Last-Modified"))
+            except (sqlite3.Error, OSError) as e: gui_log(f"Response cache write failed: {e}")
+        return result
+
+    def fail(self, error):
+        """Records a request that failed at the network level."""
+        self.metrics.inc("modease_api_requests_total", host=self.host, status="error")
+        gui_log(f"Network Error: {error} for {self.url.split('/')[-1]}")
+
+
+def make_api_request_backend(url, params=None, use_cf_session=True, is_json=True, json_body=None):
+    """Makes an API request (a POST when json_body is given) and handles common errors, logging to GUI.
+
+    Requests are paced by the per-host rate limiter; 429/5xx responses and connection errors are retried with backoff.
+
+    Responses are served from the persistent cache while fresh and revalidated with ETag/Last-Modified once stale.
+    In offline mode only cached responses are returned.
+    """
+    api_request = CachedApiRequest(url, params, json_body, is_json)
+    answered, result = api_request.lookup()
+    if answered: return result
+    if is_work_abandoned_backend(): raise WorkAbandoned(url)
+    http_session = session if use_cf_session else modrinth_session
+    def send_request():
+        if json_body is not None: return http_session.post(url, params=params, json=json_body, headers=api_request.headers, timeout=20)
+        return http_session.get(url, params=params, headers=api_request.headers, timeout=20)
+    start = time.perf_counter()
+    try: response = send_with_retries_backend(api_request.host, send_request)
     except requests.exceptions.RequestException as e:
-        gui_log(f"Network Error: {e} for {url.split('/')[-1]}")
-    return None
+        api_request.fail(e)
+        return None
+    return api_request.finish(response.status_code, response.content, response.headers, time.perf_counter() - start)
 
 def get_project_type_from_url_backend(url):
     """Determines project type from a CurseForge URL."""
-    for keyword, data_val in PROJECT_TYPES.items():
-        if f"curseforge.com/minecraft/{keyword}/" in url.lower(): return data_val
-    return None
+    match = CF_PROJECT_URL_RE.search(url)
+    return PROJECT_TYPES[match.group(1).lower()] if match else None
+
+class HtmlLinkExtractor(HTMLParser):
+    """Incremental <a href> extractor: feed() HTML in chunks and drain() the matching links parsed so far, without building a tree.
+
+    With container_class_re, only links inside an element whose class matches it are kept.
+    """
+    def __init__(self, href_re, container_class_re=None):
+        super().__init__(convert_charrefs=True)
+        self.href_re = href_re
+        self.container_class_re = container_class_re
+        self._open_tags = []
+        self._open_containers = 0
+        self._links = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "a" and attrs.get("href") and (self.container_class_re is None or self._open_containers):
+            match = self.href_re.search(attrs["href"])
+            if match: self._links.append((attrs["href"], match))
+        if self.container_class_re is None or tag in HTML_VOID_ELEMENTS: return
+        is_container = bool(self.container_class_re.search(attrs.get("class") or ""))
+        self._open_tags.append((tag, is_container))
+        self._open_containers += is_container
+
+    def handle_endtag(self, tag):
+        for i in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[i][0] == tag:
+                self._open_containers -= sum(is_container for _, is_container in self._open_tags[i:])
+                del self._open_tags[i:]
+                return
+
+    def drain(self):
+        """Returns the (href, regex match) pairs found since the last drain."""
+        links, self._links = self._links, []
+        return links
+
+def iter_html_links_backend(chunks, extractor):
+    """Feeds HTML chunks to an HtmlLinkExtractor, yielding (href, match) pairs as soon as each chunk is parsed."""
+    for chunk in chunks:
+        extractor.feed(chunk)
+        yield from extractor.drain()
+    extractor.close()
+    yield from extractor.drain()
 
 def get_slug_from_url_backend(url):
     """Extracts slug from a Modrinth or CurseForge URL."""
     return url.rstrip("/").split("/")[-1]
 
+@timed_phase_backend("slug_lookup")
 def get_project_details_by_slug_backend(slug, class_id, original_source_url):
     """Gets CurseForge project details by slug and class ID."""
     params = {"gameId": GAME_ID_MINECRAFT, "slug": slug, "classId": class_id}
-    data_val = make_api_request_backend(f"{BASE_API_URL}/mods/search", params=params)
+    data_val = current_job().memo.get_or_compute(("cf_slug", slug.lower(), class_id), lambda: make_api_request_backend(f"{BASE_API_URL}/mods/search", params=params))
     if data_val and data_val.get("data"):
         for proj in data_val["data"]:
             if proj["slug"].lower() == slug.lower(): return proj
-    MISSED_ITEMS_GLOBAL.append({"name": slug, "url": original_source_url, "reason": f"CF project details not found (slug: {slug}, classId: {class_id})"})
+    current_job().add_missed_item({"name": slug, "url": original_source_url, "reason": f"CF project details not found (slug: {slug}, classId: {class_id})"})
     return None
 
-def get_latest_compatible_file_info_backend(project_id_or_slug, project_name_api, project_source, cf_project_type_name_if_any, original_source_url):
-    """Gets the latest compatible file info from CurseForge or Modrinth."""
-    global MC_VERSION_GLOBAL, LOADER_GLOBAL, LOADER_API_ID_GLOBAL
+def get_cf_mods_by_ids_backend(mod_ids):
+    """Fetches many CurseForge projects with the bulk POST /mods endpoint. Returns a dict of mod ID to project data."""
+    mods_by_id = {}
+    mod_ids = list(dict.fromkeys(mod_ids))
+    for start in range(0, len(mod_ids), CF_BULK_CHUNK_SIZE):
+        chunk = mod_ids[start:start + CF_BULK_CHUNK_SIZE]
+        data_val = make_api_request_backend(f"{BASE_API_URL}/mods", json_body={"modIds": chunk, "filterPcOnly": True})
+        if data_val and data_val.get("data"):
+            for proj in data_val["data"]: mods_by_id[proj["id"]] = proj
+    return mods_by_id
+
+def get_cf_files_by_ids_backend(file_ids):
+    """Fetches many CurseForge files with the bulk POST /mods/files endpoint. Returns a dict of file ID to file data."""
+    files_by_id = {}
+    file_ids = list(dict.fromkeys(file_ids))
+    for start in range(0, len(file_ids), CF_BULK_CHUNK_SIZE):
+        chunk = file_ids[start:start + CF_BULK_CHUNK_SIZE]
+        data_val = make_api_request_backend(f"{BASE_API_URL}/mods/files", json_body={"fileIds": chunk})
+        if data_val and data_val.get("data"):
+            for file_info in data_val["data"]: files_by_id[file_info["id"]] = file_info
+    return files_by_id
+
+def select_cf_file_id_from_index_backend(project_details, cf_project_type_name_if_any):
+    """Picks the newest fileId in a project's latestFilesIndexes that matches the current MC version and loader."""
+    is_mod = cf_project_type_name_if_any and cf_project_type_name_if_any.lower() == "mod"
+    check_loader = is_mod and current_job().loader.lower() not in ["any", "none"]
+    best_file_id = None
+    for file_index in project_details.get("latestFilesIndexes", []):
+        if file_index.get("gameVersion") != current_job().mc_version: continue
+        if check_loader and file_index.get("modLoader") not in (None, 0, current_job().loader_api_id): continue
+        if best_file_id is None or file_index["fileId"] > best_file_id: best_file_id = file_index["fileId"]
+    return best_file_id
+
+def get_indexed_cf_file_ids_backend(cf_projects):
+    """Returns {project ID: file ID} for the CF projects whose latestFilesIndexes name a compatible file."""
+    chosen_file_ids = {}
+    for proj_info in cf_projects:
+        file_id = select_cf_file_id_from_index_backend(proj_info.get('details') or {}, proj_info['cf_project_type_name'])
+        if file_id: chosen_file_ids[proj_info['id_or_slug']] = file_id
+    return chosen_file_ids
+
+def match_indexed_cf_files_backend(cf_projects, chosen_file_ids, files_by_id):
+    """Pairs projects with their bulk-fetched indexed files. Returns ([(project, file_info)], [projects needing per-project lookup])."""
+    results, unmatched = [], []
+    for proj_info in cf_projects:
+        file_info = files_by_id.get(chosen_file_ids.get(proj_info['id_or_slug']))
+        if file_info and file_info.get("downloadUrl") and current_job().mc_version in file_info.get("gameVersions", []):
+            results.append((proj_info, file_info))
+        else: unmatched.append(proj_info)
+    return results, unmatched
+
+def get_cf_files_for_projects_batched_backend(cf_projects):
+    """Chooses files for many CF projects. Index-selected files are fetched in one bulk request; the rest fall back to per-project lookup.
+
+    Each project is a dict with 'id_or_slug', 'name', 'cf_project_type_name', 'original_url' and 'details' (the CF project data).
+    Returns a list of (project, file_info) pairs for projects with a compatible file.
+    """
+    chosen_file_ids = get_indexed_cf_file_ids_backend(cf_projects)
+    files_by_id = get_cf_files_by_ids_backend(list(chosen_file_ids.values())) if chosen_file_ids else {}
+    if chosen_file_ids: gui_log(f"Fetched {len(files_by_id)}/{len(chosen_file_ids)} indexed CF files in bulk.")
+
+    results, unmatched = match_indexed_cf_files_backend(cf_projects, chosen_file_ids, files_by_id)
+    for proj_info in unmatched:
+        file_info, _ = get_latest_compatible_file_info_backend(
+            proj_info['id_or_slug'], proj_info['name'], 'curseforge',
+            proj_info['cf_project_type_name'], proj_info['original_url']
+        )
+        if file_info: results.append((proj_info, file_info))
+    return results
+
+def get_cf_file_sort_key_backend(file_info):
+    """Orders CF files by (fileDate, id); the newest key in a stored history is its refresh watermark."""
+    return file_info.get("fileDate") or "", file_info.get("id") or 0
+
+def get_cf_files_page_params_backend(index):
+    return {"index": index, "pageSize": CF_FILES_PAGE_SIZE}
+
+def parse_cf_files_page_backend(files_data, index):
+    """Returns (files, totalCount) from one page of /mods/{id}/files, or (None, None) if the request failed."""
+    if not files_data: return None, None
+    files = files_data.get("data") or []
+    return files, (files_data.get("pagination") or {}).get("totalCount", index + len(files))
+
+def get_cf_files_page_indexes_backend(total_count):
+    """Start indexes of every page after the first. The API serves at most CF_FILES_MAX_INDEX files per project."""
+    return range(CF_FILES_PAGE_SIZE, min(total_count, CF_FILES_MAX_INDEX), CF_FILES_PAGE_SIZE)
+
+def is_cf_history_refresh_done_backend(page, index, total_count, watermark):
+    """True once a page (newest first) reaches files at or before the stored watermark, or the list ends."""
+    next_index = index + CF_FILES_PAGE_SIZE
+    if len(page) < CF_FILES_PAGE_SIZE or next_index >= min(total_count, CF_FILES_MAX_INDEX): return True
+    return any(get_cf_file_sort_key_backend(f) <= watermark for f in page)
+
+def merge_cf_file_history_backend(stored_files, fetched_files, total_count):
+    """Merges freshly fetched files into a stored history by id, fetched records replacing stored ones.
+
+    Returns (files, complete, changed): complete means the list matches the API's totalCount (past CF_FILES_MAX_INDEX
+    files the API can't list everything, so a history at least that long counts), changed that a fetched file is new or
+    differs from its stored record.
+    """
+    files_by_id = {f.get("id"): f for f in stored_files}
+    changed = any(files_by_id.get(f.get("id")) != f for f in fetched_files)
+    files_by_id.update((f.get("id"), f) for f in fetched_files)
+    files = list(files_by_id.values())
+    return files, len(files) == total_count if total_count <= CF_FILES_MAX_INDEX else len(files) >= CF_FILES_MAX_INDEX, changed
+
+def get_stored_file_history_backend(cf_mod_id):
+    """Reads a project's stored file history, treating store failures as misses."""
+    if not FILE_HISTORY_ENABLED: return None
+    try: return file_history_store.get(cf_mod_id)
+    except (sqlite3.Error, OSError, zlib.error, ValueError) as e:
+        gui_log(f"File history read failed: {e}")
+        return None
+
+def store_file_history_backend(cf_mod_id, files, total_count):
+    if not FILE_HISTORY_ENABLED: return
+    try: file_history_store.put(cf_mod_id, files, total_count)
+    except (sqlite3.Error, OSError) as e: gui_log(f"File history write failed: {e}")
+
+def fetch_cf_files_page_backend(cf_mod_id, index):
+    files_data = make_api_request_backend(f"{BASE_API_URL}/mods/{cf_mod_id}/files", params=get_cf_files_page_params_backend(index))
+    return parse_cf_files_page_backend(files_data, index)
+
+def iter_cf_file_history_steps_backend(cf_mod_id, stored):
+    """The paging plan for a CF project's file history, shared by the threaded and async fetchers as a generator.
+
+    Yields lists of page start indexes to fetch and must be sent their (files, totalCount) results in the same order.
+    Returns (files, complete, save_total_count): the totalCount to (re-)save the history with, or None to leave it.
+
+    A stored history is refreshed incrementally: pages are read newest first only until files at or before its
+    watermark show up. Without one, or when the merged list doesn't add up to the API's totalCount (files were removed),
+    every page is fetched at once. If the API is unreachable the stored history is used as is.
+    """
+    [(first_page, total_count)] = yield [0]
+    if first_page is None:
+        if not stored: return [], False, None
+        return merge_cf_file_history_backend(stored["files"], [], stored["total_count"])[:2] + (None,)
+    if stored:
+        page, index, new_files = first_page, 0, []
+        while not is_cf_history_refresh_done_backend(page, index, total_count, stored["watermark"]):
+            index += CF_FILES_PAGE_SIZE
+            [(page, _)] = yield [index]
+            if page is None: return merge_cf_file_history_backend(stored["files"], first_page + new_files, total_count)[0], False, None
+            new_files.extend(page)
+        files, complete, changed = merge_cf_file_history_backend(stored["files"], first_page + new_files, total_count)
+        if complete: return files, True, total_count if changed else None
+        gui_log(f"File history of CF project {cf_mod_id} is out of date; fetching all {total_count} files.")
+
+    pages = yield list(get_cf_files_page_indexes_backend(total_count))
+    all_pages = all(page is not None for page, _ in pages)
+    files, complete, _ = merge_cf_file_history_backend([], first_page + [f for page, _ in pages if page for f in page], total_count)
+    return files, complete and all_pages, total_count if all_pages else None
+
+def fetch_cf_files_pages_backend(cf_mod_id, page_indexes):
+    """Fetches pages of a CF project's file list, several at once on a small pool; results are in index order."""
+    if len(page_indexes) <= 1: return [fetch_cf_files_page_backend(cf_mod_id, index) for index in page_indexes]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(CF_FILE_HISTORY_WORKERS, len(page_indexes))) as pool:
+        futures = [submit_in_job_context_backend(pool, fetch_cf_files_page_backend, cf_mod_id, index) for index in page_indexes]
+        return [future.result() for future in futures]
+
+def get_cf_file_history_backend(cf_mod_id):
+    """Returns (files, complete): a CF project's whole file list, following pagination and kept in the local history store."""
+    steps = iter_cf_file_history_steps_backend(cf_mod_id, get_stored_file_history_backend(cf_mod_id))
+    try:
+        page_indexes = next(steps)
+        while True: page_indexes = steps.send(fetch_cf_files_pages_backend(cf_mod_id, page_indexes))
+    except StopIteration as done: files, complete, save_total_count = done.value
+    if save_total_count is not None: store_file_history_backend(cf_mod_id, files, save_total_count)
+    return files, complete
+
+def get_cf_project_files_backend(cf_mod_id):
+    """Returns a CF project's full file list, its FileIndex and whether the list is complete, fetched at most once per run."""
+    def fetch():
+        files, complete = get_cf_file_history_backend(cf_mod_id)
+        return {"files": files, "complete": complete, "index": build_cf_file_index_backend(files)}
+    return current_job().memo.get_or_compute(("cf_files", cf_mod_id), fetch)
+
+def get_modrinth_project_versions_backend(project_id_or_slug):
+    """Returns every version of a Modrinth project (newest first), fetched at most once per run."""
+    return current_job().memo.get_or_compute(
+        ("modrinth_versions", project_id_or_slug),
+        lambda: make_api_request_backend(f"{MODRINTH_API_BASE_URL}/project/{project_id_or_slug}/version", use_cf_session=False) or []
+    )
+
+def get_modrinth_version_index_backend(project_id_or_slug):
+    """Returns the FileIndex over a Modrinth project's versions, built at most once per run."""
+    return current_job().memo.get_or_compute(
+        ("modrinth_version_index", project_id_or_slug),
+        lambda: build_modrinth_version_index_backend(get_modrinth_project_versions_backend(project_id_or_slug))
+    )
+
+def build_cf_file_index_backend(files):
+    """Indexes CF files by gameVersions/modLoaders, newest fileDate first; files with no (or 'any') loader match every loader."""
+    return FileIndex(files, "gameVersions", "modLoaders", "fileDate", wildcard_loaders=True)
+
+def build_modrinth_version_index_backend(versions):
+    """Indexes Modrinth versions (already newest first) by game_versions/loaders, skipping versions without files."""
+    return FileIndex([v for v in versions if v.get("files")], "game_versions", "loaders")
+
+def get_loader_filter_backend(check_loader=True):
+    """Returns the lowercased loader to filter files by, or None when any loader is acceptable."""
+    loader = current_job().loader.lower()
+    return loader if check_loader and loader not in ["any", "none"] else None
+
+def select_cf_file_from_list_backend(files, is_mod, loose=False):
+    """Returns the newest file compatible with the current MC version and loader.
+
+    Strict matching requires the exact MC version; loose matching also accepts prefix matches (e.g. '1.20' for '1.20.1').
+    Accepts a raw file list or a prebuilt FileIndex (as returned by get_cf_project_files_backend).
+    """
+    file_index = files if isinstance(files, FileIndex) else build_cf_file_index_backend(files)
+    return file_index.select(current_job().mc_version, get_loader_filter_backend(is_mod), loose)
+
+def get_cf_filtered_files_params_backend(is_mod):
+    """Query for one page of a CF project's files filtered by the job's MC version (and loader, for mods)."""
+    api_params = {"gameVersion": current_job().mc_version, "pageSize": CF_FILES_PAGE_SIZE}
+    if is_mod and current_job().loader.lower() not in ["any", "none"]: api_params["modLoaderType"] = current_job().loader_api_id
+    return api_params
+
+def select_cf_file_from_filtered_list_backend(files, is_mod):
+    """Strict, then loose selection from a version-filtered CF file page."""
+    file_index = build_cf_file_index_backend(files)
+    return select_cf_file_from_list_backend(file_index, is_mod) or select_cf_file_from_list_backend(file_index, is_mod, loose=True)
+
+def iter_cf_file_selection_steps_backend(project_name_api, cf_project_type_name_if_any, project_files):
+    """The CF file-selection plan, shared by the threaded and async engines as a generator.
+
+    Yields ("filtered", params) to be sent the response to a version- and loader-filtered /mods/{id}/files request and,
+    only when that finds nothing, ("history", None) to be sent the project's full file list (get_cf_project_files_backend).
+    A project_files already fetched earlier in the run skips both. Returns the selected file info, or None.
+    """
+    is_mod = cf_project_type_name_if_any and cf_project_type_name_if_any.lower() == "mod"
+    if project_files is None:
+        files_data = yield "filtered", get_cf_filtered_files_params_backend(is_mod)
+        file_info = select_cf_file_from_filtered_list_backend((files_data or {}).get("data") or [], is_mod)
+        if file_info: return file_info
+        project_files = yield "history", None
+    file_info = select_cf_file_from_list_backend(project_files["index"], is_mod)
+    if file_info: return file_info
+
+    gui_log(f"Fallback CF: Searching all CF files for {project_name_api} ({cf_project_type_name_if_any or 'N/A'})")
+    return select_cf_file_from_list_backend(project_files["index"], is_mod, loose=True)
+
+def add_no_compatible_file_missed_item_backend(project_name_api, original_source_url, source_label):
+    current_job().add_missed_item({"name": project_name_api, "url": original_source_url, "reason": f"No compatible {source_label} file (MC: {current_job().mc_version}, L: {current_job().loader})"})
+
+@timed_phase_backend("file_selection")
+def get_latest_compatible_file_info_backend(project_id_or_slug, project_name_api, project_source, cf_project_type_name_if_any, original_source_url, prefetched_modrinth_versions=None):
+    """Gets the latest compatible file info from CurseForge or Modrinth.
+
+    CF selection follows iter_cf_file_selection_steps_backend. Bulk-prefetched Modrinth versions are tried first.
+    """
     
     if project_source == 'curseforge':
-        api_params = {"gameVersion": MC_VERSION_GLOBAL, "pageSize": 50}
-        is_mod = cf_project_type_name_if_any and cf_project_type_name_if_any.lower() == "mod"
-        if is_mod and LOADER_GLOBAL.lower() not in ["any", "none"]:
-            api_params["modLoaderType"] = LOADER_API_ID_GLOBAL
-
-        files_data = make_api_request_backend(f"{BASE_API_URL}/mods/{project_id_or_slug}/files", params=api_params)
-        if files_data and files_data.get("data"):
-            for file_info in sorted(files_data["data"], key=lambda x: x.get('fileDate', '1970-01-01'), reverse=True):
-                v_match = any(MC_VERSION_GLOBAL == gv or str(gv).startswith(MC_VERSION_GLOBAL) or MC_VERSION_GLOBAL.startswith(str(gv)) for gv in file_info.get("gameVersions", []))
-                if not v_match: continue
-                if is_mod:
-                    if LOADER_GLOBAL.lower() in ["any", "none"]: return file_info, 'curseforge'
-                    loaders_lower = [str(l).lower() for l in file_info.get("modLoaders", [])]
-                    if not loaders_lower or "any" in loaders_lower or LOADER_GLOBAL.lower() in loaders_lower: return file_info, 'curseforge'
-                else: return file_info, 'curseforge'
-        
-        gui_log(f"Fallback CF: Searching all CF files for {project_name_api} ({cf_project_type_name_if_any or 'N/A'})")
-        all_files_data = make_api_request_backend(f"{BASE_API_URL}/mods/{project_id_or_slug}/files", params={"pageSize": 200})
-        if all_files_data and all_files_data.get("data"):
-            for file_info in sorted(all_files_data["data"], key=lambda x: x.get('fileDate', '1970-01-01'), reverse=True):
-                v_match = any(MC_VERSION_GLOBAL == gv or str(gv).startswith(MC_VERSION_GLOBAL) or MC_VERSION_GLOBAL.startswith(str(gv).split('-')[0]) for gv in file_info.get("gameVersions", []))
-                if not v_match: continue
-                if is_mod:
-                    if LOADER_GLOBAL.lower() in ["any", "none"]: return file_info, 'curseforge'
-                    loaders_lower = [str(l).lower() for l in file_info.get("modLoaders", [])]
-                    if not loaders_lower or "any" in loaders_lower or LOADER_GLOBAL.lower() in loaders_lower: return file_info, 'curseforge'
-                else: return file_info, 'curseforge'
-        MISSED_ITEMS_GLOBAL.append({"name": project_name_api, "url": original_source_url, "reason": f"No compatible CF file (MC: {MC_VERSION_GLOBAL}, L: {LOADER_GLOBAL})"})
+        steps = iter_cf_file_selection_steps_backend(project_name_api, cf_project_type_name_if_any, current_job().memo.peek(("cf_files", project_id_or_slug)))
+        try:
+            step, params = next(steps)
+            while True:
+                if step == "filtered": result = make_api_request_backend(f"{BASE_API_URL}/mods/{project_id_or_slug}/files", params=params)
+                else: result = get_cf_project_files_backend(project_id_or_slug)
+                step, params = steps.send(result)
+        except StopIteration as done: file_info = done.value
+        if file_info: return file_info, 'curseforge'
+        add_no_compatible_file_missed_item_backend(project_name_api, original_source_url, "CF")
         return None, None
     
     elif project_source == 'modrinth':
-        params = { "game_versions": json.dumps([MC_VERSION_GLOBAL]) }
-        if LOADER_GLOBAL.lower() not in ["any", "none"]:
-            params["loaders"] = json.dumps([LOADER_GLOBAL.lower()])
-
-        versions_data = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/project/{project_id_or_slug}/version", params=params, use_cf_session=False)
-        time.sleep(0.05)
-        if not versions_data and "loaders" in params:
-            gui_log(f"Retrying Modrinth for {project_name_api} without loader filter.")
-            del params["loaders"]
-            versions_data = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/project/{project_id_or_slug}/version", params=params, use_cf_session=False)
-        
-        if versions_data:
-            for version_info in versions_data:
-                if MC_VERSION_GLOBAL not in version_info.get("game_versions", []): continue
-                if LOADER_GLOBAL.lower() not in ["any", "none"] and LOADER_GLOBAL.lower() not in [str(l).lower() for l in version_info.get("loaders", [])]: continue
-                primary_file = next((f for f in version_info.get("files", []) if f.get("primary")), None)
-                file_to_download = primary_file or (version_info.get("files")[0] if version_info.get("files") else None)
-                if file_to_download:
-                    return {
-                        "fileName": file_to_download["filename"], "downloadUrl": file_to_download["url"],
-                        "fileLength": file_to_download["size"]
-                    }, 'modrinth'
-        MISSED_ITEMS_GLOBAL.append({"name": project_name_api, "url": original_source_url, "reason": f"No compatible Modrinth file (MC: {MC_VERSION_GLOBAL}, L: {LOADER_GLOBAL})"})
+        if prefetched_modrinth_versions:
+            file_info = select_modrinth_file_from_versions_backend(prefetched_modrinth_versions)
+            if file_info: return file_info, 'modrinth'
+
+        file_info = select_modrinth_file_from_versions_backend(get_modrinth_version_index_backend(project_id_or_slug))
+        if file_info: return file_info, 'modrinth'
+        add_no_compatible_file_missed_item_backend(project_name_api, original_source_url, "Modrinth")
         return None, None
     return None, None
 
+def select_modrinth_file_from_versions_backend(versions):
+    """Returns download info for the newest Modrinth version matching the current MC version and loader, or None.
+
+    Accepts a raw version list or a prebuilt FileIndex (as returned by get_modrinth_version_index_backend).
+    """
+    version_index = versions if isinstance(versions, FileIndex) else build_modrinth_version_index_backend(versions)
+    version_info = version_index.select(current_job().mc_version, get_loader_filter_backend())
+    if not version_info: return None
+    file_to_download = next((f for f in version_info["files"] if f.get("primary")), None) or version_info["files"][0]
+    return {
+        "fileName": file_to_download["filename"], "downloadUrl": file_to_download["url"],
+        "fileLength": file_to_download["size"], "hashes": file_to_download.get("hashes") or {},
+        "projectId": version_info.get("project_id"), "versionId": version_info.get("id"),
+        "dependencies": version_info.get("dependencies") or []
+    }
+
+def get_modrinth_projects_bulk_backend(ids_or_slugs):
+    """Fetches many Modrinth projects via GET /projects?ids=[...]. Returns a dict keyed by both project ID and lowercased slug."""
+    projects = {}
+    ids_or_slugs = list(dict.fromkeys(ids_or_slugs))
+    for start in range(0, len(ids_or_slugs), MODRINTH_BULK_CHUNK_SIZE):
+        chunk = ids_or_slugs[start:start + MODRINTH_BULK_CHUNK_SIZE]
+        data_val = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/projects", params={"ids": json.dumps(chunk)}, use_cf_session=False)
+        for proj in data_val or []:
+            projects[proj["id"]] = proj
+            projects[str(proj.get("slug", "")).lower()] = proj
+    return projects
+
+def get_modrinth_versions_bulk_backend(version_ids):
+    """Fetches many Modrinth versions via GET /versions?ids=[...]. Returns a dict of version ID to version data."""
+    versions = {}
+    version_ids = list(dict.fromkeys(version_ids))
+    for start in range(0, len(version_ids), MODRINTH_BULK_CHUNK_SIZE):
+        chunk = version_ids[start:start + MODRINTH_BULK_CHUNK_SIZE]
+        data_val = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/versions", params={"ids": json.dumps(chunk)}, use_cf_session=False)
+        for version_info in data_val or []: versions[version_info["id"]] = version_info
+    return versions
+
+def get_modrinth_updates_by_hash_backend(file_hashes, algorithm="sha1"):
+    """Asks POST /version_files/update for the newest compatible version of each file hash. Returns a dict of hash to version data."""
+    if not file_hashes: return {}
+    body = {"hashes": list(file_hashes), "algorithm": algorithm, "game_versions": [current_job().mc_version]}
+    if current_job().loader.lower() not in ["any", "none"]: body["loaders"] = [current_job().loader.lower()]
+    return make_api_request_backend(f"{MODRINTH_API_BASE_URL}/version_files/update", use_cf_session=False, json_body=body) or {}
+
+def hash_file_backend(path, algorithm, digest=None, length=-1):
+    """Returns the hex digest of a file (or of its first `length` bytes), optionally continuing an existing hashlib object."""
+    digest = digest or hashlib.new(algorithm)
+    remaining = length if length >= 0 else float("inf")
+    with open(path, "rb") as f:
+        while remaining > 0:
+            chunk = f.read(int(min(1024 * 1024, remaining)))
+            if not chunk: break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+def get_local_modrinth_lock_entries_backend(folder, project_ids):
+    """Returns the folder's lock entries for these Modrinth projects whose files are still on disk, hashing (SHA-1) only entries that recorded no hash."""
+    lock = read_lockfile_backend(os.path.join(folder, LOCKFILE_NAME)) if folder else None
+    entries = []
+    for entry in (lock or {}).get("entries", []):
+        path = os.path.join(folder, entry["fileName"])
+        if entry["source"] != 'modrinth' or entry.get("projectId") not in project_ids or not os.path.isfile(path): continue
+        if not entry.get("hashes"): entry = dict(entry, hashes={"sha1": hash_file_backend(path, "sha1")})
+        entries.append(entry)
+    return entries
+
+def get_modrinth_updates_for_lock_entries_backend(entries):
+    """Looks up the newest compatible version of each Modrinth lock entry by the hashes it recorded. Returns a dict of hash to version data."""
+    updates_by_hash = {}
+    for algorithm in ("sha512", "sha1"):
+        file_hashes = [entry["hashes"][algorithm] for entry in entries if algorithm in entry.get("hashes", {})]
+        updates_by_hash.update(get_modrinth_updates_by_hash_backend(file_hashes, algorithm))
+    return updates_by_hash
+
+def group_modrinth_versions_by_project_backend(versions):
+    """Groups Modrinth version data by project ID, newest (by date_published) first."""
+    versions_by_project = {}
+    for version_info in sorted(versions, key=lambda v: v.get("date_published", ""), reverse=True):
+        versions_by_project.setdefault(version_info["project_id"], []).append(version_info)
+    return versions_by_project
+
+def prefetch_modrinth_versions_backend(modrinth_projects):
+    """Bulk-loads candidate versions for many Modrinth projects. Returns a dict of project ID to versions, newest first.
+
+    Files this folder's lockfile recorded as Modrinth are checked for updates with a hash lookup; every other
+    project's versions are fetched with /versions multi-gets. Projects left without a match fall back to per-project lookup.
+    """
+    local_entries = get_local_modrinth_lock_entries_backend(current_job().download_folder, {proj["id"] for proj in modrinth_projects})
+    versions_by_project = group_modrinth_versions_by_project_backend(get_modrinth_updates_for_lock_entries_backend(local_entries).values())
+    version_ids = [vid for proj in modrinth_projects if proj["id"] not in versions_by_project for vid in proj.get("versions", [])]
+    versions_by_project.update(group_modrinth_versions_by_project_backend(get_modrinth_versions_bulk_backend(version_ids).values()))
+    return versions_by_project
+
 def get_modrinth_slugs_from_collection_backend(collection_url):
     """Extracts project slugs from a Modrinth collection page."""
     gui_log(f"Fetching Modrinth collection: {collection_url}")
-    html_content = make_api_request_backend(collection_url, use_cf_session=False, is_json=False)
+    html_content = make_api_request_backend(get_page_url_backend(collection_url), use_cf_session=False, is_json=False)
     if not html_content:
-        MISSED_ITEMS_GLOBAL.append({"name": "Modrinth Collection", "url": collection_url, "reason": "Failed to fetch or parse HTML"})
+        current_job().add_missed_item({"name": "Modrinth Collection", "url": collection_url, "reason": "Failed to fetch or parse HTML"})
         return []
-    soup = BeautifulSoup(html_content, "html.parser")
-    slugs = set()
-    for a_tag in soup.find_all("a", href=re.compile(r"^/(?:mod|plugin|resourcepack|shader|datapack|modpack)/[^/?#]+")):
-        match = re.match(r"^/(?:mod|plugin|resourcepack|shader|datapack|modpack)/([^/?#]+)", a_tag['href'])
-        if match and len(match.group(1)) > 1 :
-            if a_tag.find_parent(class_=re.compile(r"(project-card|item|result|hit|flex-item)", re.I)):
-                 slugs.add(match.group(1))
+    if isinstance(html_content, bytes): html_content = html_content.decode("utf-8", errors="replace")
+    extractor = HtmlLinkExtractor(MODRINTH_COLLECTION_HREF_RE, MODRINTH_COLLECTION_CARD_CLASS_RE)
+    slugs = {match.group(1) for _, match in iter_html_links_backend([html_content], extractor)}
     if not slugs: gui_log(f"No project slugs robustly identified on Modrinth collection page: {collection_url}")
     else: gui_log(f"Found {len(slugs)} unique project slugs from Modrinth collection.")
     return list(slugs)
@@ -210,26 +1486,23 @@ def get_modrinth_project_by_name_backend(project_name):
     gui_log(f"Searching Modrinth by name: '{project_name}'")
     search_params = {"query": project_name, "limit": 5, "index": "relevance", "facets": json.dumps([["project_type:mod"],["project_type:resourcepack"]])} 
     search_results = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/search", params=search_params, use_cf_session=False)
-    time.sleep(0.05)
     if search_results and search_results.get("hits"):
         for hit in search_results["hits"]:
             if hit.get("title", "").lower() == project_name.lower():
                 gui_log(f"Found Modrinth project by name: '{hit['title']}' (Slug: {hit['slug']})")
-                
-                full_project_data = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/project/{hit['slug']}", use_cf_session=False)
-                return full_project_data
+                return dict(hit, id=hit.get("project_id"))
     gui_log(f"Modrinth project named '{project_name}' not found or no exact match.")
     return None
 
 
-def find_curseforge_equivalent_backend(modrinth_slug):
-    """Finds a CurseForge equivalent for a Modrinth project."""
+def find_curseforge_equivalent_backend(modrinth_slug, mod_data=None):
+    """Finds a CurseForge equivalent for a Modrinth project, using bulk-prefetched project data when given."""
     modrinth_page_url = f"https://modrinth.com/mod/{modrinth_slug}"
     gui_log(f"  Finding CF equivalent for Modrinth slug: {modrinth_slug}")
-    mod_data = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/project/{modrinth_slug}", use_cf_session=False)
-    time.sleep(0.05)
+    if mod_data is None:
+        mod_data = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/project/{modrinth_slug}", use_cf_session=False)
     if not mod_data:
-        MISSED_ITEMS_GLOBAL.append({"name": modrinth_slug, "url": modrinth_page_url, "reason": "Modrinth API project request failed"})
+        current_job().add_missed_item({"name": modrinth_slug, "url": modrinth_page_url, "reason": "Modrinth API project request failed"})
         return None, None, modrinth_page_url, modrinth_slug, "unknown"
 
     mod_display_name = mod_data.get('title', modrinth_slug)
@@ -245,121 +1518,464 @@ def find_curseforge_equivalent_backend(modrinth_slug):
     gui_log(f"    No direct CF link for '{mod_display_name}'. Searching CF by name.")
     cf_class_id_search = MODRINTH_TYPE_TO_CF_CLASSID.get(mod_project_type_api)
     if not cf_class_id_search:
-        MISSED_ITEMS_GLOBAL.append({"name": mod_display_name, "url": modrinth_page_url, "reason": f"Unsupported Modrinth type '{mod_project_type_api}' for CF search"})
+        current_job().add_missed_item({"name": mod_display_name, "url": modrinth_page_url, "reason": f"Unsupported Modrinth type '{mod_project_type_api}' for CF search"})
         return None, None, modrinth_page_url, mod_display_name, mod_project_type_api
 
     params = {"gameId": GAME_ID_MINECRAFT, "classId": cf_class_id_search, "searchFilter": mod_display_name, "sortField": 2, "pageSize": 5}
     cf_results = make_api_request_backend(f"{BASE_API_URL}/mods/search", params=params)
-    time.sleep(0.05)
     if cf_results and cf_results.get("data"):
         for cf_proj in cf_results["data"]:
             if cf_proj.get("name", "").lower() == mod_display_name.lower():
                 return cf_proj['slug'], cf_proj['classId'], modrinth_page_url, mod_display_name, mod_project_type_api
     return None, None, modrinth_page_url, mod_display_name, mod_project_type_api
 
-def download_worker_backend(file_info, project_type_name_display, original_source_url, source_api):
-    """Downloads a file, logging progress to GUI."""
-    global DOWNLOAD_FOLDER_GLOBAL
+def get_expected_hash_backend(file_info):
+    """Returns the strongest (algorithm, hex digest) the API published for a file: Modrinth's hash dict or CF's hashes list. (None, None) if absent."""
+    file_hashes = file_info.get("hashes") or {}
+    if isinstance(file_hashes, list):
+        file_hashes = {CF_HASH_ALGOS.get(h.get("algo")): h.get("value") for h in file_hashes}
+    for algorithm in HASH_ALGO_PREFERENCE:
+        if file_hashes.get(algorithm): return algorithm, file_hashes[algorithm].lower()
+    return None, None
+
+def get_artifact_store_path_backend(hash_algo, file_hash):
+    """Returns where the content-addressed store keeps a blob: <store>/<algo>/<first two hex chars>/<hash>."""
+    return os.path.join(ARTIFACT_STORE_DIR, hash_algo, file_hash[:2], file_hash)
+
+def link_artifact_backend(blob_path, filepath):
+    """Hardlinks a store blob into place (atomically replacing any old file), copying when the filesystem can't link."""
+    tmp_path = filepath + PART_FILE_SUFFIX + ".link"
+    if os.path.exists(tmp_path): os.remove(tmp_path)
+    try: os.link(blob_path, tmp_path)
+    except OSError: shutil.copy2(blob_path, tmp_path)
+    os.replace(tmp_path, filepath)
+
+def link_from_artifact_store_backend(hash_algo, file_hash, filepath):
+    """Places a file from the shared store if its blob exists and still hashes correctly. Returns True on success."""
+    if not ARTIFACT_STORE_ENABLED or not file_hash: return False
+    blob_path = get_artifact_store_path_backend(hash_algo, file_hash)
+    if not os.path.exists(blob_path): return False
+    try:
+        if hash_file_backend(blob_path, hash_algo) != file_hash:
+            gui_log(f"Corrupt store blob {file_hash[:12]}; discarding it.")
+            os.remove(blob_path); return False
+        link_artifact_backend(blob_path, filepath)
+        return True
+    except OSError as e:
+        gui_log(f"Artifact store link failed for {os.path.basename(filepath)}: {e}")
+        return False
+
+def finalize_download_backend(part_path, filepath, file_info, actual_hash):
+    """Checks a finished .part against the API hash, then moves it into the shared store (and links it) or straight into place."""
+    hash_algo, expected_hash = get_expected_hash_backend(file_info)
+    if expected_hash and actual_hash != expected_hash:
+        os.remove(part_path)
+        raise IOError(f"{hash_algo} mismatch (expected {expected_hash[:12]}..., got {str(actual_hash)[:12]}...)")
+    if not (ARTIFACT_STORE_ENABLED and expected_hash):
+        os.replace(part_path, filepath); return
+    blob_path = get_artifact_store_path_backend(hash_algo, expected_hash)
+    try:
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(part_path, blob_path)
+        link_artifact_backend(blob_path, filepath)
+    except OSError as e:
+        gui_log(f"Artifact store unavailable ({e}); keeping {os.path.basename(filepath)} in the download folder only.")
+        if os.path.exists(part_path): os.replace(part_path, filepath)
+        elif os.path.exists(blob_path) and not os.path.exists(filepath): shutil.copy2(blob_path, filepath)
+
+def get_download_target_backend(file_info, project_type_name_display, original_source_url, source_api):
+    """Returns the path a file should be downloaded to, or None when it already exists (recorded in the lockfile) or cannot be downloaded."""
     dl_url, filename = file_info.get("downloadUrl"), file_info.get("fileName")
     file_len = file_info.get("fileLength", -1)
 
     if not dl_url:
-        MISSED_ITEMS_GLOBAL.append({"name": filename or "Unknown", "url": original_source_url, "reason": "No download URL"})
-        return
-    filepath = os.path.join(DOWNLOAD_FOLDER_GLOBAL, filename)
+        current_job().add_missed_item({"name": filename or "Unknown", "url": original_source_url, "reason": "No download URL"})
+        return None
+    filepath = os.path.join(current_job().download_folder, filename)
+    hash_algo, expected_hash = get_expected_hash_backend(file_info)
     if os.path.exists(filepath) and (file_len == -1 or os.path.getsize(filepath) == file_len):
-        gui_log(f"Exists: {filename}"); return
+        if not expected_hash or hash_file_backend(filepath, hash_algo) == expected_hash:
+            current_job().metrics.inc("modease_downloads_total", result="existing")
+            gui_log(f"Exists: {filename}")
+            record_lock_entry_backend(file_info, project_type_name_display, original_source_url, source_api)
+            return None
+        gui_log(f"Hash mismatch for existing {filename}; replacing it.")
+    if link_from_artifact_store_backend(hash_algo, expected_hash, filepath):
+        current_job().metrics.inc("modease_downloads_total", result="store")
+        gui_log(f"Linked from store: {filename}")
+        record_lock_entry_backend(file_info, project_type_name_display, original_source_url, source_api)
+        return None
+    if current_job().offline:
+        current_job().add_missed_item({"name": filename, "url": original_source_url, "reason": "Offline mode: file not downloaded"})
+        return None
+    return filepath
+
+def get_resume_offset_backend(part_path, expected_len):
+    """Returns how many bytes of an existing .part file can be kept (0 to start over)."""
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if expected_len > 0 and offset > expected_len:
+        os.remove(part_path)
+        return 0
+    return offset
+
+def get_response_start_offset_backend(status_code, content_range, requested_offset):
+    """Returns the byte offset a response body starts at: the requested offset for a matching 206, else 0 (full body)."""
+    if requested_offset and status_code == 206:
+        match = CONTENT_RANGE_RE.match(content_range or "")
+        if match and int(match.group(1)) == requested_offset: return requested_offset
+    return 0
+
+def get_download_total_backend(expected_len, headers, start_offset):
+    """Returns the full size of the file being downloaded, from the API metadata or the response headers (-1 if unknown)."""
+    if expected_len > 0: return expected_len
+    match = CONTENT_RANGE_RE.match(headers.get("Content-Range") or "")
+    if match and match.group(2) != "*": return int(match.group(2))
+    content_length = headers.get("Content-Length")
+    return start_offset + int(content_length) if content_length and content_length.isdigit() else -1
+
+def write_part_chunk_backend(f, digest, chunk):
+    """Appends a downloaded chunk to an open .part file and feeds it to the running hash, if any."""
+    f.write(chunk)
+    if digest: digest.update(chunk)
+
+def download_to_part_file_backend(dl_url, part_path, expected_len=-1, hash_algo=None):
+    """Streams a URL into part_path, resuming with HTTP Range requests after interruptions.
+
+    Returns the file's hex digest (hashed while streaming, resumed prefix included) once complete, or None without hash_algo.
+    """
+    host = urlsplit(dl_url).hostname or ""
+    http_session = get_download_session_backend(host)
+    for attempt in range(DOWNLOAD_RESUME_ATTEMPTS):
+        offset = get_resume_offset_backend(part_path, expected_len)
+        if offset and offset == expected_len: return hash_file_backend(part_path, hash_algo) if hash_algo else None
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        try:
+            r = send_with_retries_backend(host, lambda: http_session.get(dl_url, stream=True, timeout=DOWNLOAD_TIMEOUT_SECONDS, allow_redirects=True, headers=headers))
+            if r.status_code == 416 and offset:
+                r.close(); os.remove(part_path); continue
+            r.raise_for_status()
+            start_offset = get_response_start_offset_backend(r.status_code, r.headers.get("Content-Range"), offset)
+            total = get_download_total_backend(expected_len, r.headers, start_offset)
+            digest = hashlib.new(hash_algo) if hash_algo else None
+            if digest and start_offset: hash_file_backend(part_path, hash_algo, digest, start_offset)
+            with open(part_path, 'ab' if start_offset else 'wb') as f:
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE): write_part_chunk_backend(f, digest, chunk)
+            if total <= 0 or os.path.getsize(part_path) == total: return digest.hexdigest() if digest else None
+            gui_log(f"Short read for {os.path.basename(part_path)} ({os.path.getsize(part_path)}/{total} bytes); resuming...")
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if attempt >= DOWNLOAD_RESUME_ATTEMPTS - 1: raise
+            gui_log(f"Download of {os.path.basename(part_path)} interrupted ({e.__class__.__name__}); resuming...")
+            time.sleep(get_retry_delay_backend(attempt))
+    raise IOError(f"download incomplete after {DOWNLOAD_RESUME_ATTEMPTS} attempts")
+
+def record_download_metrics_backend(dl_url, filepath, seconds):
+    """Records a finished download's size, duration and throughput in the current job's metrics."""
+    host, size = urlsplit(dl_url or "").hostname or "", os.path.getsize(filepath) if os.path.exists(filepath) else 0
+    metrics = current_job().metrics
+    metrics.inc("modease_download_bytes_total", size, host=host)
+    metrics.observe("modease_download_seconds", seconds, host=host)
+    metrics.record_event("download", host=host, file=os.path.basename(filepath), bytes=size, seconds=round(seconds, 6),
+                         bytes_per_second=round(size / seconds) if seconds > 0 else None)
+
+def fetch_artifact_backend(file_info, filepath):
+    """Downloads a file into a .part file (resuming any earlier attempt), verifies its hash and moves it into place. Returns filepath."""
+    start = time.perf_counter()
+    part_path = filepath + PART_FILE_SUFFIX
+    hash_algo, dl_url = get_expected_hash_backend(file_info)[0], get_download_url_backend(file_info)
+    actual_hash = download_to_part_file_backend(dl_url, part_path, file_info.get("fileLength", -1), hash_algo)
+    finalize_download_backend(part_path, filepath, file_info, actual_hash)
+    record_download_metrics_backend(dl_url, filepath, time.perf_counter() - start)
+    return filepath
+
+def get_download_url_backend(file_info):
+    """Returns where to fetch a file from: its upstream URL, or the configured mirror's /dl endpoint for it."""
+    dl_url = file_info.get("downloadUrl")
+    if not (MIRROR_URL and dl_url): return dl_url
+    hash_algo, expected_hash = get_expected_hash_backend(file_info)
+    params = {"url": dl_url, "algo": hash_algo, "hash": expected_hash} if expected_hash else {"url": dl_url}
+    return f"{MIRROR_URL}/dl?{urlencode(params)}"
+
+def get_page_url_backend(url):
+    """Returns where to fetch a web page (e.g. a Modrinth collection) from: the URL itself, or the mirror's /fetch endpoint."""
+    return f"{MIRROR_URL}/fetch?{urlencode({'url': url})}" if MIRROR_URL else url
+
+def get_artifact_key_backend(file_info):
+    """Identifies a jar across jobs: by its API hash when known, else by download URL."""
+    hash_algo, expected_hash = get_expected_hash_backend(file_info)
+    return (hash_algo, expected_hash) if expected_hash else ("url", file_info.get("downloadUrl"))
+
+def place_fetched_artifact_backend(file_info, fetched_path, filepath):
+    """Links a jar another job (or an earlier request for the same file) fetched into filepath, and counts the download."""
+    if fetched_path != filepath:
+        if not link_from_artifact_store_backend(*get_expected_hash_backend(file_info), filepath): link_artifact_backend(fetched_path, filepath)
+        current_job().metrics.inc("modease_downloads_total", result="reused")
+        gui_log(f"Reused from another job: {file_info.get('fileName')}")
+    else:
+        current_job().metrics.inc("modease_downloads_total", result="downloaded")
+        gui_log(f"Downloaded: {file_info.get('fileName')}")
+
+def download_worker_backend(file_info, project_type_name_display, original_source_url, source_api):
+    """Downloads a file and moves it into place once verified. Jobs sharing a `downloads` memo fetch each jar only once."""
+    filename = file_info.get("fileName")
+    filepath = get_download_target_backend(file_info, project_type_name_display, original_source_url, source_api)
+    if not filepath: return
 
     gui_log(f"Downloading ({source_api}) {project_type_name_display}: {filename}")
-    if app: app.update_progress_indeterminate()
+    current_job().update_progress_indeterminate()
     try:
-        s = session if source_api == 'curseforge' else requests
-        r = s.get(dl_url, stream=True, timeout=300, allow_redirects=True, headers=None if source_api == 'curseforge' else MODRINTH_HEADERS)
-        r.raise_for_status()
-        with open(filepath, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192): f.write(chunk)
-        gui_log(f"Downloaded: {filename}")
+        fetched_path = current_job().downloads.get_or_compute(get_artifact_key_backend(file_info), lambda: fetch_artifact_backend(file_info, filepath))
+        place_fetched_artifact_backend(file_info, fetched_path, filepath)
+        record_lock_entry_backend(file_info, project_type_name_display, original_source_url, source_api)
     except Exception as e:
-        MISSED_ITEMS_GLOBAL.append({"name": filename, "url": original_source_url, "reason": f"Download error: {e}"})
+        current_job().metrics.inc("modease_downloads_total", result="failed")
+        current_job().add_missed_item({"name": filename, "url": original_source_url, "reason": f"Download error: {e}"})
     finally:
-        if app: app.update_progress_determinate_step(stop_indeterminate=True)
-
+        current_job().update_progress_determinate_step(stop_indeterminate=True)
+
+def get_download_priority_backend(project_type_name_display):
+    """Mods are queued ahead of resource packs and shaders, which tend to be much larger."""
+    return 0 if str(project_type_name_display).lower().endswith("mod") else 1
+
+def submit_download_backend(file_info, project_type_name_display, original_source_url, source_api):
+    """Queues a file on the shared download scheduler and returns its Future."""
+    host = urlsplit(get_download_url_backend(file_info) or "").hostname or ""
+    return download_scheduler.submit(
+        download_worker_backend, file_info, project_type_name_display, original_source_url, source_api,
+        host=host, priority=get_download_priority_backend(project_type_name_display)
+    )
+
+@timed_phase_backend("download_wait")
+def wait_for_downloads_backend(futures):
+    """Blocks until the given download jobs finish, periodically logging scheduler queue depth."""
+    pending = set(futures)
+    if not pending: return
+    gui_log(f"Queued {len(pending)} downloads (max {download_scheduler.max_workers} concurrent).")
+    while pending:
+        _, pending = concurrent.futures.wait(pending, timeout=DOWNLOAD_STATUS_INTERVAL_SECONDS)
+        if pending:
+            stats = download_scheduler.stats()
+            gui_log(f"Downloads: {stats['queued']} queued, {stats['in_flight']} in flight, {len(pending)} remaining for this job.")
+
+def get_project_mc_versions_backend(project):
+    """Returns the set of MC release versions a project has files for, reusing project data already fetched where possible.
+
+    CF projects vote with their latestFilesIndexes (one entry per game version) and only fall back to the full file list;
+    Modrinth projects use the project's game_versions, falling back to the version list.
+    """
+    project_id_or_slug = project['id_or_slug']
+    if project['source'] == 'curseforge':
+        index_entries = (project.get('details') or {}).get("latestFilesIndexes")
+        if index_entries:
+            raw_versions = [file_index.get("gameVersion") for file_index in index_entries]
+        elif project.get('cf_mod_id'):
+            raw_versions = [v for f_info in get_cf_project_files_backend(project['cf_mod_id'])["files"] for v in f_info.get("gameVersions", [])]
+        else:
+            gui_log(f"    Skipping CF project {project.get('name', project_id_or_slug)}, no numeric ID provided for version analysis.")
+            return set()
+    else:
+        raw_versions = (project.get('modrinth_project') or {}).get("game_versions") or [
+            v for v_info in get_modrinth_project_versions_backend(project_id_or_slug) for v in v_info.get("game_versions", [])
+        ]
+    return {version.text for version in map(McVersion.of, raw_versions) if version.is_release}
+
+def get_best_version_leader_backend(version_support):
+    """Returns (version, vote count) for the most supported version, newest first on ties, from per-version project bitsets."""
+    return max(((v, bin(bits).count("1")) for v, bits in version_support.items()),
+               key=lambda item: (item[1], McVersion.of(item[0]).key))
+
+def is_best_version_decided_backend(version_support, remaining_projects):
+    """True once no other version, seen or not, could overtake the leader even if every remaining project voted for it."""
+    if not remaining_projects: return True
+    leader, leader_votes = get_best_version_leader_backend(version_support)
+    if remaining_projects >= leader_votes: return False
+    leader_key = McVersion.of(leader).key
+    for version, bits in version_support.items():
+        if version == leader: continue
+        best_case = bin(bits).count("1") + remaining_projects
+        if best_case > leader_votes or (best_case == leader_votes and McVersion.of(version).key > leader_key): return False
+    return True
+
+@timed_phase_backend("best_version")
 def determine_and_set_best_mc_version_backend(projects_to_analyze):
-    """Determines the 'best' (most common, latest) MC version from a list of projects."""
-    global MC_VERSION_GLOBAL
+    """Determines the 'best' (most common, latest) MC version from a list of projects.
+
+    Projects are analyzed concurrently; each known version keeps a bitset of the projects supporting it, and analysis stops
+    as soon as the leading version can no longer be overtaken. Analyses still running then send no further API requests
+    and report no missed items.
+    """
     gui_log("Determining best Minecraft version...")
-    if app: app.update_progress_indeterminate()
-    all_supported_versions_flat = []
-    
+    current_job().update_progress_indeterminate()
+
     total_projects_to_analyze = len(projects_to_analyze)
-    for i, project in enumerate(projects_to_analyze):
-        if app: app.set_progress((i + 1) / total_projects_to_analyze if total_projects_to_analyze > 0 else 0)
-        project_id_or_slug = project['id_or_slug']
-        source = project['source']
-        project_name_for_log = project.get('name', project_id_or_slug)
-        gui_log(f"  Analyzing versions for ({source}): {project_name_for_log}")
-        time.sleep(0.05)
-
-        project_versions = []
-        if source == 'curseforge':
-            cf_mod_id = project.get('cf_mod_id')
-            if not cf_mod_id:
-                gui_log(f"    Skipping CF project {project_name_for_log}, no numeric ID provided for version analysis.")
-                continue
-            files_data = make_api_request_backend(f"{BASE_API_URL}/mods/{cf_mod_id}/files", params={"pageSize": 500})
-            if files_data and files_data.get("data"):
-                for f_info in files_data["data"]:
-                    project_versions.extend(f_info.get("gameVersions", []))
-        elif source == 'modrinth':
-            modrinth_versions_data = make_api_request_backend(f"{MODRINTH_API_BASE_URL}/project/{project_id_or_slug}/version", use_cf_session=False)
-            if modrinth_versions_data:
-                for v_info in modrinth_versions_data:
-                    project_versions.extend(v_info.get("game_versions", []))
-        
-        unique_project_versions = set(str(v) for v in project_versions if re.match(r"^\d+(\.\d+)+(\.\d+)?(-\w+(\.\d+)?)?$", str(v))) 
-        all_supported_versions_flat.extend(list(unique_project_versions))
+    version_support = {}
+    analyzed = 0
+    stop_event = threading.Event()
+    def analyze(project):
+        stop_event_var.set(stop_event)
+        return get_project_mc_versions_backend(project)
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=RESOLVE_WORKERS)
+    try:
+        futures = {submit_in_job_context_backend(pool, analyze, project): i for i, project in enumerate(projects_to_analyze)}
+        for future in concurrent.futures.as_completed(futures):
+            analyzed += 1
+            current_job().set_progress(analyzed / total_projects_to_analyze)
+            try: project_versions = future.result()
+            except Exception as e:
+                gui_log(f"  Version analysis failed for {projects_to_analyze[futures[future]].get('name')}: {e}"); continue
+            project_bit = 1 << futures[future]
+            for version in project_versions: version_support[version] = version_support.get(version, 0) | project_bit
+            if version_support and analyzed < total_projects_to_analyze and is_best_version_decided_backend(version_support, total_projects_to_analyze - analyzed):
+                gui_log(f"  Leading version can no longer be overtaken; stopped after {analyzed}/{total_projects_to_analyze} projects.")
+                break
+    finally:
+        stop_event.set()
+        pool.shutdown(wait=False, cancel_futures=True)
 
-    if not all_supported_versions_flat:
+    if not version_support:
         gui_log("Could not determine best version (no version data found). Please specify a version.")
-        if app: app.update_progress_determinate_step(stop_indeterminate=True)
+        current_job().update_progress_determinate_step(stop_indeterminate=True)
         return False
 
-    version_counts = Counter(all_supported_versions_flat)
-    if not version_counts:
-        gui_log("Could not determine best version (no valid versions counted). Please specify a version.")
-        if app: app.update_progress_determinate_step(stop_indeterminate=True)
-        return False
-        
-    max_support = max(version_counts.values())
-    best_candidates = [v for v, count in version_counts.items() if count == max_support]
-    
-    best_candidates.sort(key=parse_version_string_backend, reverse=True)
-    
-    if best_candidates:
-        MC_VERSION_GLOBAL = best_candidates[0]
-        gui_log(f"Determined best Minecraft version: {MC_VERSION_GLOBAL} (supported by {max_support}/{len(projects_to_analyze)} main projects)")
-        if app: app.update_mc_version_display(MC_VERSION_GLOBAL)
-        if app: app.update_progress_determinate_step(stop_indeterminate=True)
-        return True
+    current_job().mc_version, max_support = get_best_version_leader_backend(version_support)
+    gui_log(f"Determined best Minecraft version: {current_job().mc_version} (supported by {max_support}/{analyzed} analyzed of {total_projects_to_analyze} main projects)")
+    current_job().update_mc_version_display(current_job().mc_version)
+    current_job().update_progress_determinate_step(stop_indeterminate=True)
+    return True
+
+class ResolutionPipeline:
+    """Streams projects through resolution stages on a bounded resolver pool, handing each resolved file straight to the download scheduler."""
+    def __init__(self, max_workers=RESOLVE_WORKERS):
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resolver")
+        self._stage_futures = []
+        self._claimed = set()
+        self._claim_lock = threading.Lock()
+
+    def submit(self, stage_fn, *args):
+        """Schedules a stage; it should return a download Future, a list of them, or None if nothing was queued."""
+        self._stage_futures.append(submit_in_job_context_backend(self._pool, stage_fn, *args))
+
+    def claim(self, identifier):
+        """Returns True the first time an identifier is claimed, so concurrent stages never queue the same project twice."""
+        with self._claim_lock:
+            if identifier in self._claimed: return False
+            self._claimed.add(identifier)
+            return True
+
+    @timed_phase_backend("resolve_and_download")
+    def finish(self, after_stages=None):
+        """Waits for every submitted stage, then for the downloads they queued plus any queued by after_stages()."""
+        download_futures = []
+        total = len(self._stage_futures)
+        current_job().set_progress_total_steps(total)
+        for i, stage_future in enumerate(concurrent.futures.as_completed(self._stage_futures)):
+            current_job().set_progress((i + 1) / total)
+            try: stage_result = stage_future.result()
+            except Exception as e:
+                gui_log(f"Resolution error: {e}"); continue
+            if isinstance(stage_result, list): download_futures.extend(stage_result)
+            elif stage_result: download_futures.append(stage_result)
+        self._pool.shutdown()
+        if after_stages: download_futures.extend(after_stages())
+        wait_for_downloads_backend(download_futures)
+
+def queue_project_download_backend(proj_info):
+    """Selects the compatible file for a resolved project and queues it for download. Returns the download Future or None."""
+    display_type = get_project_display_type_backend(proj_info)
+    if proj_info['source'] == 'curseforge':
+        file_info, source_api_used = get_latest_compatible_file_info_backend(
+            proj_info['id_or_slug'], proj_info['name'], 'curseforge',
+            display_type, proj_info['original_url']
+        )
     else:
-        gui_log("Could not determine best version. No candidates found. Please specify a version.")
-        if app: app.update_progress_determinate_step(stop_indeterminate=True)
-        return False
+        file_info, source_api_used = get_latest_compatible_file_info_backend(
+            proj_info['id_or_slug'], proj_info['name'], 'modrinth',
+            None, proj_info['original_url'], proj_info.get('modrinth_versions')
+        )
+    if file_info and source_api_used:
+        return submit_download_backend(file_info, display_type, proj_info['original_url'], source_api_used)
+    gui_log(f"Could not find compatible file for {proj_info['name']} from {proj_info['source']}")
+    return None
+
+def queue_cf_projects_batched_backend(cf_projects):
+    """Selects files for a group of CF projects in bulk and queues them for download. Returns the download Futures."""
+    return [
+        submit_download_backend(file_info, proj_info['cf_project_type_name'], proj_info['original_url'], 'curseforge')
+        for proj_info, file_info in get_cf_files_for_projects_batched_backend(cf_projects)
+    ]
+
+class CfProjectBatch:
+    """Collects CF projects resolved by concurrent pipeline stages so their files are selected from latestFilesIndexes with bulk requests."""
+    def __init__(self, batch_size=CF_PIPELINE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def add(self, proj_info):
+        """Adds a project. Returns the download Futures of the batch it completed, or [] while the batch is still filling."""
+        with self._lock:
+            self._pending.append(proj_info)
+            if len(self._pending) < self.batch_size: return []
+            batch, self._pending = self._pending, []
+        return queue_cf_projects_batched_backend(batch)
+
+    def flush(self):
+        """Queues whatever is left. Returns the download Futures."""
+        with self._lock: batch, self._pending = self._pending, []
+        return queue_cf_projects_batched_backend(batch) if batch else []
+
+def resolve_and_queue_cf_url_backend(url, type_info, cf_batch):
+    """Pipeline stage for one CurseForge URL: slug lookup, then batched file selection and download."""
+    details = get_project_details_by_slug_backend(get_slug_from_url_backend(url), type_info["classId"], url)
+    if not details: return None
+    return cf_batch.add({
+        'id_or_slug': details["id"], 'name': details["name"], 'source': 'curseforge',
+        'cf_project_type_name': type_info["name"], 'original_url': url, 'details': details
+    })
+
+def iter_cf_items_from_html_backend(modlist_path):
+    """Yields the CurseForge project links of an HTML modlist as {'url', 'type_data'} dicts while the file is still being read.
+
+    The file is parsed in HTML_READ_CHUNK_SIZE pieces, so memory stays flat however large the export is.
+    """
+    try:
+        with open(modlist_path, "r", encoding="utf-8") as f:
+            chunks = iter(lambda: f.read(HTML_READ_CHUNK_SIZE), "")
+            for href, match in iter_html_links_backend(chunks, HtmlLinkExtractor(CF_PROJECT_URL_RE)):
+                yield {'url': href, 'type_data': PROJECT_TYPES[match.group(1).lower()]}
+    except Exception as e:
+        current_job().add_missed_item({"name": "HTML Modlist", "url": modlist_path, "reason": f"Read error: {e}"})
+
+def get_cf_items_from_html_backend(modlist_path):
+    """Returns the CurseForge project links in an HTML modlist as {'url', 'type_data'} dicts, or None if there are none."""
+    raw_items = list(iter_cf_items_from_html_backend(modlist_path))
+    if not raw_items: gui_log("No CF URLs in HTML."); return None
+    return raw_items
 
+@timed_phase_backend("html_modlist")
 def process_modlist_from_html_backend(modlist_path):
     """Processes mods from an HTML file."""
-    global MISSED_ITEMS_GLOBAL, MC_VERSION_GLOBAL
     projects_for_best_version_analysis = []
     initial_project_items = []
 
-    try:
-        with open(modlist_path, "r", encoding="utf-8") as f: soup = BeautifulSoup(f.read(), "html.parser")
-    except Exception as e:
-        MISSED_ITEMS_GLOBAL.append({"name": "HTML Modlist", "url": modlist_path, "reason": f"Read error: {e}"})
+    if USE_ASYNC_ENGINE and current_job().mc_version_input.lower() != "best" and is_async_engine_available_backend():
+        return run_async_engine_backend("process_modlist_from_html", modlist_path)
+
+    if current_job().mc_version_input.lower() != "best":
+        current_job().mc_version = current_job().mc_version_input
+        gui_log(f"Using specified MC Version: {current_job().mc_version}")
+        gui_log("Resolving and downloading CF projects as the HTML is parsed...")
+        pipeline = ResolutionPipeline()
+        cf_batch = CfProjectBatch()
+        item_count = 0
+        for item_data in iter_cf_items_from_html_backend(modlist_path):
+            pipeline.submit(resolve_and_queue_cf_url_backend, item_data["url"], item_data["type_data"], cf_batch)
+            item_count += 1
+        gui_log(f"Found {item_count} potential CF projects in HTML." if item_count else "No CF URLs in HTML.")
+        pipeline.finish(cf_batch.flush)
         return
-    
-    raw_items = [{'url': a['href'], 'type_data': pt} for a in soup.find_all('a', href=True) if (pt := get_project_type_from_url_backend(a['href']))]
-    if not raw_items: gui_log("No CF URLs in HTML."); return
+
+    raw_items = get_cf_items_from_html_backend(modlist_path)
+    if not raw_items: return
 
     gui_log(f"Found {len(raw_items)} potential CF projects in HTML. Analyzing...")
     for item_data in raw_items:
@@ -367,176 +1983,386 @@ def process_modlist_from_html_backend(modlist_path):
         slug = get_slug_from_url_backend(url)
         details = get_project_details_by_slug_backend(slug, type_info["classId"], url)
         if details:
-            initial_project_items.append({'details': details, 'type_name': type_info["name"], 'original_url': url, 'source': 'curseforge'})
-            projects_for_best_version_analysis.append({'id_or_slug': slug, 'source': 'curseforge', 'cf_mod_id': details.get('id'), 'name': details.get('name')})
-        time.sleep(0.05)
-    
-    if MC_VERSION_INPUT_GLOBAL.lower() == "best":
-        if not projects_for_best_version_analysis:
-            gui_log("No projects found to determine 'best' version from HTML. Please specify a version.")
-            return
-        if not determine_and_set_best_mc_version_backend(projects_for_best_version_analysis):
-            return 
-    else:
-        MC_VERSION_GLOBAL = MC_VERSION_INPUT_GLOBAL
-        gui_log(f"Using specified MC Version: {MC_VERSION_GLOBAL}")
-
-    threads = []
-    if app: app.set_progress_total_steps(len(initial_project_items))
-    for i, item in enumerate(initial_project_items):
-        if app: app.set_progress((i + 1) / len(initial_project_items) if initial_project_items else 0)
-        details, type_n, original_url, source_api = item['details'], item['type_name'], item['original_url'], item['source']
-        file_info, _ = get_latest_compatible_file_info_backend(details["id"], details["name"], source_api, type_n, original_url)
-        if file_info:
-            t = threading.Thread(target=download_worker_backend, args=(file_info, type_n, original_url, source_api))
-            threads.append(t); t.start(); time.sleep(0.02)
-    for t in threads: t.join()
-
-def process_single_mod_and_dependencies_backend(cf_url):
-    """Processes a single CurseForge mod and its dependencies."""
-    global MISSED_ITEMS_GLOBAL, MC_VERSION_GLOBAL
-    main_type = get_project_type_from_url_backend(cf_url)
-    if not ("curseforge.com/minecraft/" in cf_url and main_type):
-        MISSED_ITEMS_GLOBAL.append({"name": "Main Mod URL", "url": cf_url, "reason": "Invalid CF URL/type"}); return
-    main_slug = get_slug_from_url_backend(cf_url)
-    main_details = get_project_details_by_slug_backend(main_slug, main_type["classId"], cf_url)
-    if not main_details: return
-
-    projects_to_download_info = {}
-    resolve_queue = [(main_details["id"], main_details.get("name", main_slug))] 
-    visited_for_resolution = set()
-    projects_for_best_version_analysis = []
+            initial_project_items.append({
+                'id_or_slug': details["id"], 'name': details["name"], 'source': 'curseforge',
+                'cf_project_type_name': type_info["name"], 'original_url': url, 'details': details
+            })
+            projects_for_best_version_analysis.append({'id_or_slug': slug, 'source': 'curseforge', 'cf_mod_id': details.get('id'), 'name': details.get('name'), 'details': details})
 
-    gui_log("Resolving dependencies...")
-    while resolve_queue:
-        current_mod_id, current_mod_name = resolve_queue.pop(0)
-        if current_mod_id in visited_for_resolution: continue
-        visited_for_resolution.add(current_mod_id)
-        
-        mod_api_resp = make_api_request_backend(f"{BASE_API_URL}/mods/{current_mod_id}"); time.sleep(0.05)
-        if mod_api_resp and mod_api_resp.get("data"):
-            p_data = mod_api_resp["data"]
-            if p_data["id"] not in projects_to_download_info:
-                 projects_to_download_info[p_data["id"]] = {
-                    "id": p_data["id"], "name": p_data["name"], 
-                    "type_name": _CLASS_ID_TO_NAME_MAP.get(p_data["classId"], "Project"), 
-                    "url": p_data.get("links", {}).get("websiteUrl", f"CF_ID_{p_data['id']}"),
-                    "source": "curseforge"
-                 }
-                 projects_for_best_version_analysis.append({'id_or_slug': p_data["slug"], 'source': 'curseforge', 'cf_mod_id': p_data["id"], 'name': p_data["name"]})
-
-            for dep in p_data.get("dependencies", []):
-                if dep["relationType"] in [2,3] and dep["modId"] not in visited_for_resolution:
-                    resolve_queue.append((dep["modId"], f"Dependency of {p_data['name']}")) 
-        else: MISSED_ITEMS_GLOBAL.append({"name": f"Dep ID {current_mod_id}", "url": f"CF_ID_{current_mod_id}", "reason": "Dep API fetch fail"})
-
-    if MC_VERSION_INPUT_GLOBAL.lower() == "best":
-        if not projects_for_best_version_analysis:
-            gui_log("No projects found to determine 'best' version. Please specify a version.")
-            return
-        if not determine_and_set_best_mc_version_backend(projects_for_best_version_analysis):
-            return
+    if not projects_for_best_version_analysis:
+        gui_log("No projects found to determine 'best' version from HTML. Please specify a version.")
+        return
+    if not determine_and_set_best_mc_version_backend(projects_for_best_version_analysis):
+        return
+
+    current_job().set_progress_total_steps(len(initial_project_items))
+    wait_for_downloads_backend(queue_cf_projects_batched_backend(initial_project_items))
+
+def make_cf_proj_info_backend(p_data):
+    """Builds the project info used for download from CF project data."""
+    return {
+        'id_or_slug': p_data["id"], 'name': p_data["name"], 'source': 'curseforge',
+        'cf_project_type_name': _CLASS_ID_TO_NAME_MAP.get(p_data["classId"], "Project"),
+        'original_url': p_data.get("links", {}).get("websiteUrl", f"CF_ID_{p_data['id']}"),
+        'details': p_data
+    }
+
+def make_modrinth_proj_info_backend(project):
+    """Builds the project info used for download from Modrinth project data."""
+    project_type = project.get("project_type", "mod")
+    return {
+        'id_or_slug': project["id"], 'name': project.get("title", project["id"]), 'source': 'modrinth',
+        'modrinth_project_type_api': project_type,
+        'original_url': f"https://modrinth.com/{project_type}/{project.get('slug', project['id'])}",
+        'modrinth_project': project
+    }
+
+def get_project_display_type_backend(proj_info):
+    """Returns the project type shown in logs and used for download priority."""
+    if proj_info['source'] == 'curseforge': return proj_info['cf_project_type_name']
+    return f"Modrinth {MODRINTH_API_TYPE_TO_DISPLAY_NAME.get(proj_info['modrinth_project_type_api'], 'Project')}"
+
+def get_graph_key_backend(source_api, project_id):
+    return f"{source_api}:{project_id}"
+
+def get_file_dependencies_backend(source_api, file_info):
+    """Returns (source, project ID, relation, pinned version ID) for each dependency declared by a selected file or version.
+
+    Relations are 'required', 'optional' or 'incompatible'; other kinds (embedded libraries, tools) are ignored. Modrinth
+    dependencies that name only a version come back with a None project ID.
+    """
+    dependencies = []
+    if source_api == 'curseforge':
+        for dep in file_info.get("dependencies") or []:
+            relation = CF_DEPENDENCY_RELATIONS.get(dep.get("relationType"))
+            if relation and dep.get("modId"): dependencies.append(('curseforge', dep["modId"], relation, None))
     else:
-        MC_VERSION_GLOBAL = MC_VERSION_INPUT_GLOBAL
-        gui_log(f"Using specified MC Version: {MC_VERSION_GLOBAL}")
-
-    threads = []
-    final_projects_list = list(projects_to_download_info.values())
-    if app: app.set_progress_total_steps(len(final_projects_list))
-    for i, p_info in enumerate(final_projects_list):
-        if app: app.set_progress((i + 1) / len(final_projects_list) if final_projects_list else 0)
-        f_info, _ = get_latest_compatible_file_info_backend(p_info['id'], p_info['name'], 'curseforge', p_info['type_name'], p_info['url'])
-        if f_info:
-            t = threading.Thread(target=download_worker_backend, args=(f_info, p_info['type_name'], p_info['url'], 'curseforge'))
-            threads.append(t); t.start(); time.sleep(0.02)
-    for t in threads: t.join()
+        for dep in file_info.get("dependencies") or []:
+            relation = dep.get("dependency_type")
+            if relation in ("required", "optional", "incompatible") and (dep.get("project_id") or dep.get("version_id")):
+                dependencies.append(('modrinth', dep.get("project_id"), relation, dep.get("version_id")))
+    return dependencies
+
+class DependencyGraph:
+    """Dependency graph of the files selected for a run: nodes are projects keyed 'source:id', edges point at what a file needs.
+
+    Cycles are tolerated (and reported); topological_order() lists dependencies before their dependents. Version pins the
+    selected file does not match are only warnings, since the newest compatible file usually satisfies them anyway.
+    """
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+        self.incompatibilities = []
+        self.version_pins = []
+
+    def add_node(self, key, proj_info, file_info):
+        self.nodes[key] = {"project": proj_info, "file": file_info}
+        self.edges.setdefault(key, {})
+
+    def add_dependency(self, key, dep_key, relation, pinned_version_id=None):
+        if relation == "incompatible":
+            self.incompatibilities.append((key, dep_key)); return
+        self.edges.setdefault(key, {})[dep_key] = relation
+        if pinned_version_id: self.version_pins.append((key, dep_key, pinned_version_id))
+
+    def node_name(self, key):
+        return self.nodes[key]["project"]["name"] if key in self.nodes else key
+
+    def _walk(self):
+        """Iterative depth-first search over resolved nodes. Returns (post-order, cycles)."""
+        post_order, cycles, state, path = [], [], {}, []
+        for root in self.nodes:
+            if root in state: continue
+            state[root] = "open"; path.append(root)
+            stack = [(root, iter(self.edges.get(root, {})))]
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop(); path.pop(); state[node] = "done"; post_order.append(node); continue
+                if child not in self.nodes: continue
+                if state.get(child) == "open": cycles.append(path[path.index(child):] + [child])
+                elif child not in state:
+                    state[child] = "open"; path.append(child)
+                    stack.append((child, iter(self.edges.get(child, {}))))
+        return post_order, cycles
+
+    def topological_order(self):
+        return self._walk()[0]
+
+    def find_cycles(self):
+        return self._walk()[1]
+
+    def find_required_cycles(self):
+        """Returns the cycles whose every edge is a required dependency."""
+        return [cycle for cycle in self.find_cycles() if all(self.edges[a].get(b) == "required" for a, b in zip(cycle, cycle[1:]))]
+
+    def find_conflicts(self):
+        """Returns human-readable conflicts: incompatible projects that were both selected."""
+        return [f"{self.node_name(key)} is incompatible with {self.node_name(other_key)}"
+                for key, other_key in self.incompatibilities if key in self.nodes and other_key in self.nodes]
+
+    def find_version_pin_mismatches(self):
+        """Returns human-readable warnings for dependencies pinned to a version other than the one selected."""
+        mismatches = []
+        for key, dep_key, version_id in self.version_pins:
+            selected_version = (self.nodes.get(dep_key) or {}).get("file", {}).get("versionId")
+            if selected_version and selected_version != version_id:
+                mismatches.append(f"{self.node_name(key)} pins version {version_id} of {self.node_name(dep_key)}, but {selected_version} was selected")
+        return mismatches
+
+    def to_dict(self):
+        post_order, cycles = self._walk()
+        return {
+            "mcVersion": current_job().mc_version, "loader": current_job().loader,
+            "nodes": {key: {"name": node["project"]["name"], "fileName": node["file"].get("fileName")} for key, node in self.nodes.items()},
+            "edges": self.edges, "order": post_order, "cycles": cycles, "conflicts": self.find_conflicts(),
+            "versionPinMismatches": self.find_version_pin_mismatches()
+        }
+
+def select_files_for_dependency_level_backend(projects):
+    """Selects files for one frontier of the dependency graph: CF in bulk, Modrinth from bulk-fetched versions with concurrent fallbacks."""
+    cf_projects = [p for p in projects if p['source'] == 'curseforge']
+    modrinth_projects = [p for p in projects if p['source'] == 'modrinth']
+    selected = get_cf_files_for_projects_batched_backend(cf_projects) if cf_projects else []
+    if modrinth_projects:
+        version_ids = [vid for p in modrinth_projects for vid in (p.get('modrinth_project') or {}).get("versions", [])]
+        versions_by_project = group_modrinth_versions_by_project_backend(get_modrinth_versions_bulk_backend(version_ids).values())
+        def select(proj_info):
+            return get_latest_compatible_file_info_backend(
+                proj_info['id_or_slug'], proj_info['name'], 'modrinth', None, proj_info['original_url'],
+                versions_by_project.get(proj_info['id_or_slug'])
+            )[0]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=RESOLVE_WORKERS) as pool:
+            futures = [submit_in_job_context_backend(pool, select, p) for p in modrinth_projects]
+            for proj_info, future in zip(modrinth_projects, futures):
+                try:
+                    file_info = future.result()
+                except Exception as e:
+                    current_job().add_missed_item({"name": proj_info['name'], "url": proj_info['original_url'], "reason": f"File selection failed: {e}"})
+                    continue
+                if file_info: selected.append((proj_info, file_info))
+    return selected
+
+@timed_phase_backend("dependency_resolution")
+def resolve_dependency_graph_backend(seed_projects, on_file_selected=None):
+    """Builds the DependencyGraph for seed projects from the dependencies declared by each selected file/version.
+
+    Each frontier level costs a handful of bulk calls (CF /mods and /mods/files, Modrinth /projects and /versions)
+    however wide it is. on_file_selected(proj_info, file_info) fires as each level is selected, so downloads overlap resolution.
+    """
+    graph = DependencyGraph()
+    seen = {get_graph_key_backend(p['source'], p['id_or_slug']) for p in seed_projects}
+    frontier = list(seed_projects)
+    while frontier:
+        next_ids = {'curseforge': [], 'modrinth': []}
+        version_only_deps = {}
+        def follow(key, dep_source, dep_id, relation, pinned_version_id):
+            dep_key = get_graph_key_backend(dep_source, dep_id)
+            graph.add_dependency(key, dep_key, relation, pinned_version_id)
+            if relation in FOLLOWED_DEPENDENCY_RELATIONS and dep_key not in seen:
+                seen.add(dep_key); next_ids[dep_source].append(dep_id)
+
+        for proj_info, file_info in select_files_for_dependency_level_backend(frontier):
+            key = get_graph_key_backend(proj_info['source'], proj_info['id_or_slug'])
+            graph.add_node(key, proj_info, file_info)
+            if on_file_selected: on_file_selected(proj_info, file_info)
+            for dep_source, dep_id, relation, pinned_version_id in get_file_dependencies_backend(proj_info['source'], file_info):
+                if dep_id is None: version_only_deps.setdefault(pinned_version_id, []).append((key, relation))
+                else: follow(key, dep_source, dep_id, relation, pinned_version_id)
+        if version_only_deps:
+            for version_id, version_info in get_modrinth_versions_bulk_backend(list(version_only_deps)).items():
+                for key, relation in version_only_deps[version_id]: follow(key, 'modrinth', version_info["project_id"], relation, version_id)
+
+        frontier = []
+        mods_by_id = get_cf_mods_by_ids_backend(next_ids['curseforge']) if next_ids['curseforge'] else {}
+        for mod_id in next_ids['curseforge']:
+            if mod_id in mods_by_id: frontier.append(make_cf_proj_info_backend(mods_by_id[mod_id]))
+            else: current_job().add_missed_item({"name": f"Dep ID {mod_id}", "url": f"CF_ID_{mod_id}", "reason": "Dep API fetch fail"})
+        modrinth_projects = get_modrinth_projects_bulk_backend(next_ids['modrinth']) if next_ids['modrinth'] else {}
+        for project_id in next_ids['modrinth']:
+            if project_id in modrinth_projects: frontier.append(make_modrinth_proj_info_backend(modrinth_projects[project_id]))
+            else: current_job().add_missed_item({"name": f"Dep ID {project_id}", "url": f"https://modrinth.com/project/{project_id}", "reason": "Dep API fetch fail"})
+    return graph
+
+def report_dependency_graph_backend(graph):
+    """Logs cycles, conflicts and version-pin mismatches in a resolved graph and writes it next to the downloads.
+
+    Incompatible selections and cycles made only of required dependencies also go to the missed-items summary; pin
+    mismatches are warnings only.
+    """
+    required_cycles = graph.find_required_cycles()
+    for cycle in graph.find_cycles():
+        description = ' -> '.join(graph.node_name(key) for key in cycle)
+        gui_log(f"Dependency cycle: {description}")
+        if cycle in required_cycles:
+            current_job().add_missed_item({"name": "Dependency cycle", "url": current_job().download_folder, "reason": f"Required dependencies form a cycle: {description}"})
+    for conflict in graph.find_conflicts():
+        gui_log(f"Dependency conflict: {conflict}")
+        current_job().add_missed_item({"name": "Dependency conflict", "url": current_job().download_folder, "reason": conflict})
+    for mismatch in graph.find_version_pin_mismatches():
+        gui_log(f"Warning: {mismatch}")
+    gui_log(f"Resolved {len(graph.nodes)} projects in the dependency graph.")
+    graph_path = os.path.join(current_job().download_folder, DEPENDENCY_GRAPH_NAME)
+    try:
+        with open(graph_path + ".tmp", "w", encoding="utf-8") as f: json.dump(graph.to_dict(), f, indent=2)
+        os.replace(graph_path + ".tmp", graph_path)
+    except OSError as e:
+        gui_log(f"Could not write {DEPENDENCY_GRAPH_NAME}: {e}")
+
+def get_dependency_seed_project_backend(mod_url):
+    """Resolves the single-mod URL (CurseForge or Modrinth) to the project info the dependency graph starts from."""
+    modrinth_match = MODRINTH_PROJECT_URL_RE.search(mod_url)
+    if modrinth_match:
+        id_or_slug = modrinth_match.group(1)
+        projects = get_modrinth_projects_bulk_backend([id_or_slug])
+        project = projects.get(id_or_slug) or projects.get(id_or_slug.lower())
+        if project: return make_modrinth_proj_info_backend(project)
+        current_job().add_missed_item({"name": "Main Mod URL", "url": mod_url, "reason": "Modrinth project not found"}); return None
+    main_type = get_project_type_from_url_backend(mod_url)
+    if not ("curseforge.com/minecraft/" in mod_url and main_type):
+        current_job().add_missed_item({"name": "Main Mod URL", "url": mod_url, "reason": "Invalid CF URL/type"}); return None
+    main_details = get_project_details_by_slug_backend(get_slug_from_url_backend(mod_url), main_type["classId"], mod_url)
+    if not main_details: return None
+    return dict(make_cf_proj_info_backend(main_details), cf_project_type_name=main_type["name"], original_url=mod_url)
+
+def get_best_version_candidates_for_seed_backend(seed):
+    """Projects voting in 'best' version analysis: the seed plus its project-level CF dependencies (walked with bulk /mods calls)."""
+    if seed['source'] == 'modrinth':
+        return [{'id_or_slug': seed['id_or_slug'], 'source': 'modrinth', 'name': seed['name'], 'modrinth_project': seed['modrinth_project']}]
+    candidates, visited, frontier = [], set(), [seed['id_or_slug']]
+    while frontier:
+        frontier = [mod_id for mod_id in dict.fromkeys(frontier) if mod_id not in visited]
+        if not frontier: break
+        visited.update(frontier)
+        next_frontier = []
+        for p_data in get_cf_mods_by_ids_backend(frontier).values():
+            candidates.append({'id_or_slug': p_data["slug"], 'source': 'curseforge', 'cf_mod_id': p_data["id"], 'name': p_data["name"], 'details': p_data})
+            next_frontier.extend(dep["modId"] for dep in p_data.get("dependencies", []) if CF_DEPENDENCY_RELATIONS.get(dep["relationType"]) in FOLLOWED_DEPENDENCY_RELATIONS)
+        frontier = next_frontier
+    return candidates
+
+@timed_phase_backend("single_mod")
+def process_single_mod_and_dependencies_backend(mod_url):
+    """Processes a single mod (CurseForge or Modrinth URL) and, recursively, the dependencies of the files chosen for it.
+
+    Returns the resolved DependencyGraph (also written to the download folder), or None.
+    """
+    seed = get_dependency_seed_project_backend(mod_url)
+    if not seed: return None
+
+    if current_job().mc_version_input.lower() != "best":
+        current_job().mc_version = current_job().mc_version_input
+        gui_log(f"Using specified MC Version: {current_job().mc_version}")
+    elif not determine_and_set_best_mc_version_backend(get_best_version_candidates_for_seed_backend(seed)):
+        return None
 
+    gui_log("Resolving dependencies...")
+    download_futures = []
+    def queue_download(proj_info, file_info):
+        download_futures.append(submit_download_backend(file_info, get_project_display_type_backend(proj_info), proj_info['original_url'], proj_info['source']))
+    graph = resolve_dependency_graph_backend([seed], queue_download)
+    report_dependency_graph_backend(graph)
+    current_job().set_progress_total_steps(len(download_futures))
+    wait_for_downloads_backend(download_futures)
+    return graph
+
+def resolve_modrinth_collection_project_backend(mod_slug_modrinth, mod_data=None):
+    """Maps one Modrinth collection slug to the project info used for download, preferring a CurseForge equivalent."""
+    cf_slug, cf_class_id, modrinth_page_url, mod_disp_name, mod_proj_type_api = find_curseforge_equivalent_backend(mod_slug_modrinth, mod_data)
+
+    if cf_slug and cf_class_id:
+        details = get_project_details_by_slug_backend(cf_slug, cf_class_id, modrinth_page_url)
+        if details:
+            return {
+                'id_or_slug': details['id'], 'name': details['name'], 'source': 'curseforge',
+                'cf_project_type_name': _CLASS_ID_TO_NAME_MAP.get(details['classId'], "Project"),
+                'original_url': modrinth_page_url, 'cf_slug': cf_slug, 'details': details
+            }
+    return {
+        'id_or_slug': mod_slug_modrinth, 'name': mod_disp_name, 'source': 'modrinth',
+        'modrinth_project_type_api': mod_proj_type_api, 'original_url': modrinth_page_url,
+        'modrinth_project': mod_data
+    }
+
+def resolve_and_queue_modrinth_collection_item_backend(mod_slug_modrinth, pipeline, mod_data, modrinth_proj_infos):
+    """Pipeline stage for one Modrinth collection slug: equivalent lookup, then file selection and download for CF equivalents.
+
+    Projects that stay on Modrinth are appended to modrinth_proj_infos, so their versions can be fetched in bulk once every slug is resolved.
+    """
+    proj_info = resolve_modrinth_collection_project_backend(mod_slug_modrinth, mod_data)
+    if not pipeline.claim(f"{proj_info['source']}_{proj_info['id_or_slug']}"): return None
+    if proj_info['source'] == 'modrinth':
+        modrinth_proj_infos.append(proj_info)
+        return None
+    return queue_project_download_backend(proj_info)
+
+def queue_modrinth_projects_backend(modrinth_proj_infos):
+    """Bulk-fetches versions for resolved Modrinth projects, then selects and queues their files. Returns the download Futures."""
+    modrinth_versions_by_project = prefetch_modrinth_versions_backend([p['modrinth_project'] for p in modrinth_proj_infos if p.get('modrinth_project')])
+    download_futures = []
+    for i, proj_info in enumerate(modrinth_proj_infos):
+        current_job().set_progress((i + 1) / len(modrinth_proj_infos))
+        proj_info['modrinth_versions'] = modrinth_versions_by_project.get((proj_info.get('modrinth_project') or {}).get('id'))
+        download_future = queue_project_download_backend(proj_info)
+        if download_future: download_futures.append(download_future)
+    return download_futures
+
+@timed_phase_backend("modrinth_collection")
 def process_modrinth_collection_backend(collection_url):
     """Processes mods from a Modrinth collection, finding CF equivalents or using Modrinth."""
-    global MISSED_ITEMS_GLOBAL, MC_VERSION_GLOBAL
     if not ("modrinth.com/collection/" in collection_url):
-        MISSED_ITEMS_GLOBAL.append({"name": "Modrinth Collection URL", "url": collection_url, "reason": "Invalid URL"}); return
+        current_job().add_missed_item({"name": "Modrinth Collection URL", "url": collection_url, "reason": "Invalid URL"}); return
 
     modrinth_slugs = get_modrinth_slugs_from_collection_backend(collection_url)
     if not modrinth_slugs: gui_log("No slugs from Modrinth collection."); return
-    
+    modrinth_projects = get_modrinth_projects_bulk_backend(modrinth_slugs)
+    gui_log(f"Fetched {len({p['id'] for p in modrinth_projects.values()})}/{len(modrinth_slugs)} Modrinth projects in bulk.")
+
+    if current_job().mc_version_input.lower() != "best":
+        current_job().mc_version = current_job().mc_version_input
+        gui_log(f"Using specified MC Version: {current_job().mc_version}")
+        gui_log(f"Resolving and downloading {len(modrinth_slugs)} Modrinth projects (CF equivalents preferred)...")
+        pipeline = ResolutionPipeline()
+        modrinth_proj_infos = []
+        for mod_slug_modrinth in modrinth_slugs:
+            pipeline.submit(resolve_and_queue_modrinth_collection_item_backend, mod_slug_modrinth, pipeline, modrinth_projects.get(mod_slug_modrinth.lower()), modrinth_proj_infos)
+        pipeline.finish(lambda: queue_modrinth_projects_backend(modrinth_proj_infos))
+        return
+
     projects_to_process_info = []
     projects_for_best_version_analysis = []
 
     gui_log(f"Analyzing {len(modrinth_slugs)} Modrinth projects for CF equivalents or direct download...")
     for mod_slug_modrinth in modrinth_slugs:
-        cf_slug, cf_class_id, modrinth_page_url, mod_disp_name, mod_proj_type_api = find_curseforge_equivalent_backend(mod_slug_modrinth)
-        
-        if cf_slug and cf_class_id:
-            details = get_project_details_by_slug_backend(cf_slug, cf_class_id, modrinth_page_url)
-            if details:
-                projects_to_process_info.append({
-                    'id_or_slug': details['id'], 'name': details['name'], 'source': 'curseforge', 
-                    'cf_project_type_name': _CLASS_ID_TO_NAME_MAP.get(details['classId'], "Project"), 
-                    'original_url': modrinth_page_url
-                })
-                projects_for_best_version_analysis.append({'id_or_slug': cf_slug, 'source': 'curseforge', 'cf_mod_id': details['id'], 'name': details['name']})
-            else:
-                projects_to_process_info.append({
-                    'id_or_slug': mod_slug_modrinth, 'name': mod_disp_name, 'source': 'modrinth', 
-                    'modrinth_project_type_api': mod_proj_type_api, 'original_url': modrinth_page_url
-                })
-                projects_for_best_version_analysis.append({'id_or_slug': mod_slug_modrinth, 'source': 'modrinth', 'name': mod_disp_name})
+        proj_info = resolve_modrinth_collection_project_backend(mod_slug_modrinth, modrinth_projects.get(mod_slug_modrinth.lower()))
+        projects_to_process_info.append(proj_info)
+        if proj_info['source'] == 'curseforge':
+            projects_for_best_version_analysis.append({'id_or_slug': proj_info['cf_slug'], 'source': 'curseforge', 'cf_mod_id': proj_info['id_or_slug'], 'name': proj_info['name'], 'details': proj_info.get('details')})
         else:
-            projects_to_process_info.append({
-                'id_or_slug': mod_slug_modrinth, 'name': mod_disp_name, 'source': 'modrinth', 
-                'modrinth_project_type_api': mod_proj_type_api, 'original_url': modrinth_page_url
-            })
-            projects_for_best_version_analysis.append({'id_or_slug': mod_slug_modrinth, 'source': 'modrinth', 'name': mod_disp_name})
-        time.sleep(0.05)
-
-    if MC_VERSION_INPUT_GLOBAL.lower() == "best":
-        if not projects_for_best_version_analysis:
-            gui_log("No projects found to determine 'best' version. Please specify a version.")
-            return
-        if not determine_and_set_best_mc_version_backend(projects_for_best_version_analysis):
-            return
-    else:
-        MC_VERSION_GLOBAL = MC_VERSION_INPUT_GLOBAL
-        gui_log(f"Using specified MC Version: {MC_VERSION_GLOBAL}")
+            projects_for_best_version_analysis.append({'id_or_slug': proj_info['id_or_slug'], 'source': 'modrinth', 'name': proj_info['name'], 'modrinth_project': proj_info.get('modrinth_project')})
 
-    threads = []
-    if app: app.set_progress_total_steps(len(projects_to_process_info))
-    processed_identifiers_for_dl = set()
+    if not projects_for_best_version_analysis:
+        gui_log("No projects found to determine 'best' version. Please specify a version.")
+        return
+    if not determine_and_set_best_mc_version_backend(projects_for_best_version_analysis):
+        return
 
-    for i, proj_info in enumerate(projects_to_process_info):
-        if app: app.set_progress((i + 1) / len(projects_to_process_info) if projects_to_process_info else 0)
-        identifier = f"{proj_info['source']}_{proj_info['id_or_slug']}"
-        if identifier in processed_identifiers_for_dl: continue
-        
-        file_info, source_api_used = None, None
-        if proj_info['source'] == 'curseforge':
-            file_info, source_api_used = get_latest_compatible_file_info_backend(
-                proj_info['id_or_slug'], proj_info['name'], 'curseforge', 
-                proj_info['cf_project_type_name'], proj_info['original_url']
-            )
-            display_type = proj_info['cf_project_type_name']
-        elif proj_info['source'] == 'modrinth':
-            file_info, source_api_used = get_latest_compatible_file_info_backend(
-                proj_info['id_or_slug'], proj_info['name'], 'modrinth', 
-                None, proj_info['original_url']
-            )
-            display_type = f"Modrinth {MODRINTH_API_TYPE_TO_DISPLAY_NAME.get(proj_info['modrinth_project_type_api'], 'Project')}"
-        
-        if file_info and source_api_used:
-            t = threading.Thread(target=download_worker_backend, args=(file_info, display_type, proj_info['original_url'], source_api_used))
-            threads.append(t); t.start(); processed_identifiers_for_dl.add(identifier); time.sleep(0.02)
-        else:
-             gui_log(f"Could not find compatible file for {proj_info['name']} from {proj_info['source']}")
-    
-    for t in threads: t.join()
+    current_job().set_progress_total_steps(len(projects_to_process_info))
+    unique_projects = {}
+    for proj_info in projects_to_process_info:
+        unique_projects.setdefault(f"{proj_info['source']}_{proj_info['id_or_slug']}", proj_info)
+    cf_projects = [p for p in unique_projects.values() if p['source'] == 'curseforge']
+    download_futures = queue_cf_projects_batched_backend(cf_projects)
+    download_futures.extend(queue_modrinth_projects_backend([p for p in unique_projects.values() if p['source'] == 'modrinth']))
+    wait_for_downloads_backend(download_futures)
 
+@timed_phase_backend("flexible_source")
 def process_flexible_source_download_backend(project_identifier):
     """Processes a single project, searching on CF and MR, and letting user choose if found on both."""
-    global MISSED_ITEMS_GLOBAL, MC_VERSION_GLOBAL
     
-    MC_VERSION_GLOBAL = MC_VERSION_INPUT_GLOBAL 
-    gui_log(f"Using specified MC Version: {MC_VERSION_GLOBAL}")
+    current_job().mc_version = current_job().mc_version_input 
+    gui_log(f"Using specified MC Version: {current_job().mc_version}")
 
     cf_project_details = None
     mr_project_details = None
@@ -602,21 +2428,23 @@ def process_flexible_source_download_backend(project_identifier):
         gui_log(f"  [1] CurseForge: {cf_project_details.get('name', 'N/A')} (ID: {cf_project_details.get('id', 'N/A')})")
         gui_log(f"  [2] Modrinth: {mr_project_details.get('title', 'N/A')} (Slug: {mr_project_details.get('slug', 'N/A')})")
         
-        app.user_choice_event.clear()
-        app.user_choice_value = None
-        app.prompt_for_user_choice(
-            f"Choose source for '{project_name_to_search}':\n1 for CurseForge, 2 for Modrinth",
-            [("1", "CurseForge"), ("2", "Modrinth")]
-        )
-        app.user_choice_event.wait(timeout=300) 
-
-        if app.user_choice_value == "1":
-            chosen_source = "curseforge"
-        elif app.user_choice_value == "2":
-            chosen_source = "modrinth"
+        prompt = current_job().progress
+        if not hasattr(prompt, 'prompt_for_user_choice'):
+            chosen_source = current_job().preferred_source
+            gui_log(f"No GUI to ask; using preferred source: {chosen_source}")
         else:
+            prompt.user_choice_event.clear()
+            prompt.user_choice_value = None
+            prompt.prompt_for_user_choice(
+                f"Choose source for '{project_name_to_search}':\n1 for CurseForge, 2 for Modrinth",
+                [("1", "CurseForge"), ("2", "Modrinth")]
+            )
+            prompt.user_choice_event.wait(timeout=300) 
+            chosen_source = {"1": "curseforge", "2": "modrinth"}.get(prompt.user_choice_value)
+
+        if not chosen_source:
             gui_log("No valid choice made or timeout. Aborting download for this item.")
-            MISSED_ITEMS_GLOBAL.append({"name": project_name_to_search, "url": project_identifier, "reason": "User did not choose a source or choice timed out."})
+            current_job().add_missed_item({"name": project_name_to_search, "url": project_identifier, "reason": "User did not choose a source or choice timed out."})
             return
             
     elif cf_project_details:
@@ -627,7 +2455,7 @@ def process_flexible_source_download_backend(project_identifier):
         gui_log(f"Project '{mr_project_details.get('title', project_name_to_search)}' found only on Modrinth. Proceeding.")
     else:
         gui_log(f"Project '{project_name_to_search}' not found on CurseForge or Modrinth.")
-        MISSED_ITEMS_GLOBAL.append({"name": project_name_to_search, "url": project_identifier, "reason": "Not found on either platform."})
+        current_job().add_missed_item({"name": project_name_to_search, "url": project_identifier, "reason": "Not found on either platform."})
         return
 
     file_info_to_download = None
@@ -647,7 +2475,7 @@ def process_flexible_source_download_backend(project_identifier):
             )
         else:
             gui_log(f"Could not get CurseForge ID for {cf_name}.")
-            MISSED_ITEMS_GLOBAL.append({"name": cf_name, "url": project_identifier, "reason": "CF ID missing after search."})
+            current_job().add_missed_item({"name": cf_name, "url": project_identifier, "reason": "CF ID missing after search."})
 
     elif chosen_source == "modrinth" and mr_project_details:
         mr_slug = mr_project_details.get('slug')
@@ -660,314 +2488,761 @@ def process_flexible_source_download_backend(project_identifier):
             )
         else:
             gui_log(f"Could not get Modrinth slug for {mr_title}.")
-            MISSED_ITEMS_GLOBAL.append({"name": mr_title, "url": project_identifier, "reason": "Modrinth slug missing."})
+            current_job().add_missed_item({"name": mr_title, "url": project_identifier, "reason": "Modrinth slug missing."})
 
     if file_info_to_download and source_api_used:
-        if app: app.set_progress_total_steps(1) 
-        if app: app.set_progress(0.5) 
+        current_job().set_progress_total_steps(1) 
+        current_job().set_progress(0.5) 
         download_worker_backend(file_info_to_download, display_type_name, project_identifier, source_api_used)
-        if app: app.set_progress(1)
+        current_job().set_progress(1)
     else:
         gui_log(f"No compatible file found for '{project_name_to_search}' from chosen source '{chosen_source}'.")
         
-class App(ctk.CTk):
-    def __init__(self):
-        super().__init__()
-        self.title("ModEase")
-        self.geometry("750x800")
-        ctk.set_appearance_mode("System")
-        ctk.set_default_color_theme("blue")
-
-        icon_path_ico = "ModEase.ico"
-        if os.path.exists(icon_path_ico):
-            try:
-                self.iconbitmap(icon_path_ico)
-            except Exception as e:
-                print(f"Could not set .ico icon: {e}")
+PROCESSING_MODES = {
+    "HTML Modlist": process_modlist_from_html_backend,
+    "Single Mod + Dependencies": process_single_mod_and_dependencies_backend,
+    "Modrinth Collection": process_modrinth_collection_backend,
+    "Flexible Source Download": process_flexible_source_download_backend,
+}
+RENAMED_MODES = {"Single Mod + Dependencies (CurseForge)": "Single Mod + Dependencies"}  # old names in lockfiles and manifests
+
+def get_lock_entry_key_backend(source_api, project_id, filename):
+    """Lockfile entries are keyed per project, so a newer file for the same project replaces the old one."""
+    return f"{source_api}:{project_id if project_id is not None else filename}"
+
+def record_lock_entry_backend(file_info, project_type_name_display, original_source_url, source_api):
+    """Adds a file that is now present in the download folder to this run's lockfile entries."""
+    hash_algo, file_hash = get_expected_hash_backend(file_info)
+    if source_api == 'curseforge': project_id, file_id = file_info.get("modId"), file_info.get("id")
+    else: project_id, file_id = file_info.get("projectId"), file_info.get("versionId")
+    entry = {
+        "source": source_api, "projectId": project_id, "fileId": file_id, "fileName": file_info.get("fileName"),
+        "url": file_info.get("downloadUrl"), "size": file_info.get("fileLength", -1),
+        "hashes": {hash_algo: file_hash} if file_hash else {},
+        "projectType": project_type_name_display, "originalUrl": original_source_url
+    }
+    current_job().set_lock_entry(get_lock_entry_key_backend(source_api, project_id, entry["fileName"]), entry)
+
+def lock_entry_to_file_info_backend(entry):
+    """Rebuilds the file_info dict the download functions expect from a lockfile entry."""
+    file_info = {"fileName": entry["fileName"], "downloadUrl": entry["url"], "fileLength": entry.get("size", -1), "hashes": entry.get("hashes") or {}}
+    if entry["source"] == 'curseforge': file_info.update(modId=entry.get("projectId"), id=entry.get("fileId"))
+    else: file_info.update(projectId=entry.get("projectId"), versionId=entry.get("fileId"))
+    return file_info
+
+def hash_input_backend(input_path_or_name):
+    """Returns the SHA-1 of a file input (e.g. an HTML modlist), or None for URLs and names."""
+    return hash_file_backend(input_path_or_name, "sha1") if os.path.isfile(input_path_or_name) else None
+
+def read_lockfile_backend(lock_path):
+    """Returns a parsed lockfile, or None when it is missing, unreadable or from an unknown format version."""
+    try:
+        with open(lock_path, "r", encoding="utf-8") as f: lock = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        gui_log(f"Ignoring unreadable lockfile {lock_path}: {e}")
+        return None
+    if not (isinstance(lock, dict) and lock.get("lockfileVersion") == LOCKFILE_VERSION): return None
+    lock["mode"] = RENAMED_MODES.get(lock.get("mode"), lock.get("mode"))
+    return lock
+
+def write_lockfile_backend(lock_path, mode, input_path_or_name, entries):
+    """Atomically writes the lockfile for a download folder."""
+    lock = {
+        "lockfileVersion": LOCKFILE_VERSION, "mode": mode, "input": input_path_or_name,
+        "inputSha1": hash_input_backend(input_path_or_name), "mcVersion": current_job().mc_version, "loader": current_job().loader,
+        "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "entries": [entries[key] for key in sorted(entries)]
+    }
+    tmp_path = lock_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f: json.dump(lock, f, indent=2)
+    os.replace(tmp_path, lock_path)
+
+def prune_removed_lock_entries_backend(old_lock, new_entries):
+    """Deletes files the previous lockfile pinned that this run no longer selected (removed projects and replaced versions)."""
+    kept_filenames = {entry["fileName"] for entry in new_entries.values()}
+    for entry in old_lock.get("entries", []):
+        filename = os.path.basename(entry.get("fileName") or "")
+        if not filename or filename in kept_filenames: continue
+        filepath = os.path.join(current_job().download_folder, filename)
+        if os.path.isfile(filepath):
+            os.remove(filepath)
+            gui_log(f"Pruned: {filename}")
+
+@timed_phase_backend("lockfile_sync")
+def sync_from_lockfile_backend(lock):
+    """Sync mode: re-checks the projects pinned in a lockfile with bulk calls and downloads only missing or updated files.
+
+    Falls back to a full run of the original mode when the locked HTML modlist has changed since.
+    """
+    job = current_job()
+    job.mc_version = job.mc_version_input = lock["mcVersion"]
+    job.set_loader(lock["loader"])
+    input_sha1 = hash_input_backend(lock["input"])
+    if lock.get("inputSha1") and input_sha1 and input_sha1 != lock["inputSha1"]:
+        gui_log(f"{lock['input']} changed since the lockfile was written; re-resolving it for MC {current_job().mc_version}...")
+        return PROCESSING_MODES[lock["mode"]](lock["input"])
+
+    entries = lock.get("entries", [])
+    gui_log(f"Syncing {len(entries)} locked files (MC: {current_job().mc_version}, L: {current_job().loader})...")
+    download_futures = []
+    cf_entries = [entry for entry in entries if entry["source"] == 'curseforge']
+    mods_by_id = get_cf_mods_by_ids_backend([entry["projectId"] for entry in cf_entries if entry.get("projectId")])
+    cf_projects = []
+    for entry in cf_entries:
+        details = mods_by_id.get(entry.get("projectId"))
+        if details:
+            cf_projects.append({
+                'id_or_slug': details["id"], 'name': details["name"], 'source': 'curseforge',
+                'cf_project_type_name': entry["projectType"], 'original_url': entry["originalUrl"], 'details': details
+            })
         else:
-            print(f"Icon file not found: {icon_path_ico} (for .ico)")
-
-        self.grid_columnconfigure(1, weight=1)
-        self.grid_rowconfigure(6, weight=1)
-
-        self.mode_label = ctk.CTkLabel(self, text="Select Mode:")
-        self.mode_label.grid(row=0, column=0, padx=10, pady=(10,0), sticky="w")
-        self.mode_var = ctk.StringVar(value="HTML Modlist")
-        self.mode_options = ["HTML Modlist", "Single Mod + Dependencies (CurseForge)", "Modrinth Collection", "Flexible Source Download"]
-        self.mode_menu = ctk.CTkOptionMenu(self, variable=self.mode_var, values=self.mode_options, command=self.update_input_label_and_browse)
-        self.mode_menu.grid(row=0, column=1, columnspan=2, padx=10, pady=(10,0), sticky="ew")
-
-        self.input_path_label = ctk.CTkLabel(self, text="Modlist HTML File:")
-        self.input_path_label.grid(row=1, column=0, padx=10, pady=5, sticky="w")
-        self.input_path_entry = ctk.CTkEntry(self, placeholder_text="Path or URL or Project Name")
-        self.input_path_entry.grid(row=1, column=1, padx=10, pady=5, sticky="ew")
-        self.browse_button = ctk.CTkButton(self, text="Browse", command=self.browse_file_or_folder)
-        self.browse_button.grid(row=1, column=2, padx=10, pady=5)
-
-        self.mc_version_label = ctk.CTkLabel(self, text="Minecraft Version (or 'best'):")
-        self.mc_version_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
-        self.mc_version_entry = ctk.CTkEntry(self, placeholder_text="e.g., 1.20.1 or best (not for Flexible mode)")
-        self.mc_version_entry.grid(row=2, column=1, columnspan=2, padx=10, pady=5, sticky="ew")
-
-        self.loader_label = ctk.CTkLabel(self, text="Mod Loader:")
-        self.loader_label.grid(row=3, column=0, padx=10, pady=5, sticky="w")
-        self.loader_var = ctk.StringVar(value=MODLOADER_CHOICES[0])
-        self.loader_menu = ctk.CTkOptionMenu(self, variable=self.loader_var, values=MODLOADER_CHOICES)
-        self.loader_menu.grid(row=3, column=1, columnspan=2, padx=10, pady=5, sticky="ew")
-
-        self.download_folder_label = ctk.CTkLabel(self, text="Download Folder:")
-        self.download_folder_label.grid(row=4, column=0, padx=10, pady=5, sticky="w")
-        self.download_folder_entry = ctk.CTkEntry(self, placeholder_text="Select download destination")
-        self.download_folder_entry.grid(row=4, column=1, padx=10, pady=5, sticky="ew")
-        self.download_folder_button = ctk.CTkButton(self, text="Select Folder", command=self.select_download_dir)
-        self.download_folder_button.grid(row=4, column=2, padx=10, pady=5)
-        
-        self.choice_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.choice_frame.grid(row=5, column=0, columnspan=3, padx=10, pady=5, sticky="ew")
-        self.choice_frame.grid_remove() 
-        
-        self.choice_prompt_label = ctk.CTkLabel(self.choice_frame, text="", wraplength=680)
-        self.choice_prompt_label.pack(pady=(0,5))
-        self.choice_input_entry = ctk.CTkEntry(self.choice_frame, placeholder_text="Enter choice")
-        self.choice_input_entry.pack(side=tk.LEFT, padx=(0,5), fill=tk.X, expand=True)
-        self.choice_submit_button = ctk.CTkButton(self.choice_frame, text="Submit Choice", command=self.submit_user_choice)
-        self.choice_submit_button.pack(side=tk.LEFT)
-        self.user_choice_event = threading.Event()
-        self.user_choice_value = None
-        self.valid_choices_for_prompt = []
-
-
-        self.log_textbox = ctk.CTkTextbox(self, wrap="word", state="disabled", height=200)
-        self.log_textbox.grid(row=6, column=0, columnspan=3, padx=10, pady=10, sticky="nsew")
-
-        self.progress_bar = ctk.CTkProgressBar(self, orientation="horizontal", mode="determinate")
-        self.progress_bar.set(0)
-        self.progress_bar.grid(row=7, column=0, columnspan=3, padx=10, pady=5, sticky="ew")
-
-        self.start_button = ctk.CTkButton(self, text="Start Processing", command=self.start_processing_thread)
-        self.start_button.grid(row=8, column=0, columnspan=3, padx=10, pady=10)
-        
-        self.update_input_label_and_browse()
-
-    def update_mc_version_display(self, version_str):
-        """Updates the MC version entry if 'best' was used."""
-        if self.mc_version_entry.get().lower() == "best":
-            current_text = self.mc_version_entry.get()
-            if "Best:" not in current_text: 
-                self.mc_version_entry.delete(0, tk.END)
-                self.mc_version_entry.insert(0, f"Best: {version_str}")
-
-
-    def update_input_label_and_browse(self, _=None):
-        """Updates the input label and browse button state based on mode."""
-        mode = self.mode_var.get()
-        if mode == "HTML Modlist":
-            self.input_path_label.configure(text="Modlist HTML File:")
-            self.browse_button.configure(state="normal", text="Browse File")
-        elif mode == "Single Mod + Dependencies (CurseForge)":
-            self.input_path_label.configure(text="CurseForge Mod URL:")
-            self.browse_button.configure(state="disabled", text="Browse")
-        elif mode == "Modrinth Collection":
-            self.input_path_label.configure(text="Modrinth Collection URL:")
-            self.browse_button.configure(state="disabled", text="Browse")
-        elif mode == "Flexible Source Download":
-            self.input_path_label.configure(text="Project Name or URL (CF/MR):")
-            self.browse_button.configure(state="disabled", text="Browse")
-
-
-    def browse_file_or_folder(self):
-        """Handles file browsing for HTML modlist mode."""
-        mode = self.mode_var.get()
-        path = ""
-        if mode == "HTML Modlist":
-            path = filedialog.askopenfilename(title="Select Modlist HTML File", filetypes=(("HTML files", "*.html"), ("All files", "*.*")))
-        if path:
-            self.input_path_entry.delete(0, tk.END)
-            self.input_path_entry.insert(0, path)
-            
-    def select_download_dir(self):
-        """Opens a dialog to select the download directory."""
-        folder_path = filedialog.askdirectory(title="Select Folder to Download Mods Into")
-        if folder_path:
-            self.download_folder_entry.delete(0, tk.END)
-            self.download_folder_entry.insert(0, folder_path)
-
-    def log_message(self, message):
-        """Appends a message to the log textbox in a thread-safe way."""
-        def _log():
-            self.log_textbox.configure(state="normal")
-            self.log_textbox.insert(tk.END, str(message) + "\n")
-            self.log_textbox.see(tk.END)
-            self.log_textbox.configure(state="disabled")
-        if self._check_thread_safety():
-            self.after(0, _log)
-        else: 
-             _log() 
-
-    def _check_thread_safety(self):
-        return threading.current_thread() is threading.main_thread() or hasattr(self, '_w')
-
-    def set_progress_total_steps(self, total_steps):
-        """Sets the total steps for the progress bar."""
-        self._total_steps = total_steps
-        self._current_step = 0
-        self.progress_bar.configure(mode="determinate")
-        self.progress_bar.set(0)
-
-    def update_progress_determinate_step(self, stop_indeterminate=False):
-        """Increments the progress bar by one step."""
-        if hasattr(self, '_total_steps') and self._total_steps > 0:
-            self._current_step +=1
-            progress_val = self._current_step / self._total_steps if self._total_steps > 0 else 0
-            self.progress_bar.set(min(progress_val, 1.0))
-        if stop_indeterminate and self.progress_bar.cget("mode") == "indeterminate":
-            self.progress_bar.configure(mode="determinate")
-            self.progress_bar.set(1)
-
-    def update_progress_indeterminate(self):
-        """Sets the progress bar to indeterminate mode and starts animation."""
-        self.progress_bar.configure(mode="indeterminate")
-        self.progress_bar.start()
-
-    def stop_progress_indeterminate(self):
-        """Stops indeterminate progress and sets mode to determinate."""
-        if self.progress_bar.cget("mode") == "indeterminate":
-            self.progress_bar.stop()
-            self.progress_bar.configure(mode="determinate")
+            download_futures.append(submit_download_backend(lock_entry_to_file_info_backend(entry), entry["projectType"], entry["originalUrl"], 'curseforge'))
+    download_futures.extend(queue_cf_projects_batched_backend(cf_projects))
+
+    modrinth_entries = [entry for entry in entries if entry["source"] == 'modrinth']
+    updates_by_hash = get_modrinth_updates_for_lock_entries_backend(modrinth_entries)
+    for entry in modrinth_entries:
+        version_info = next((updates_by_hash[h] for h in entry.get("hashes", {}).values() if h in updates_by_hash), None)
+        file_info = select_modrinth_file_from_versions_backend([version_info]) if version_info else None
+        download_futures.append(submit_download_backend(file_info or lock_entry_to_file_info_backend(entry), entry["projectType"], entry["originalUrl"], 'modrinth'))
+
+    current_job().set_progress_total_steps(len(download_futures))
+    wait_for_downloads_backend(download_futures)
+
+def run_processing_mode_backend(mode, input_path_or_name):
+    """Runs one processing mode (or a lockfile sync), then writes the download folder's lockfile.
+
+    When the previous lockfile came from the same mode and input, files it pinned that this run no longer selected are pruned;
+    after a run with failures, those entries are carried forward instead so nothing is deleted on a bad network day.
+    """
+    current_job().clear_lock_entries()
+    lock_path = os.path.join(current_job().download_folder, LOCKFILE_NAME)
+    old_lock = read_lockfile_backend(lock_path)
+    if mode == SYNC_MODE_NAME:
+        source_lock_path = input_path_or_name or lock_path
+        if os.path.isdir(source_lock_path): source_lock_path = os.path.join(source_lock_path, LOCKFILE_NAME)
+        source_lock = old_lock if source_lock_path == lock_path else read_lockfile_backend(source_lock_path)
+        if not source_lock:
+            current_job().add_missed_item({"name": "Lockfile", "url": source_lock_path, "reason": "No readable lockfile to sync from"})
+            return
+        mode, input_path_or_name = source_lock["mode"], source_lock["input"]
+        sync_from_lockfile_backend(source_lock)
+    else:
+        PROCESSING_MODES[mode](input_path_or_name)
 
-    def set_progress(self, value):
-        """Sets the progress bar to a specific value (0.0 to 1.0)."""
-        if self.progress_bar.cget("mode") == "indeterminate":
-             self.progress_bar.stop()
-             self.progress_bar.configure(mode="determinate")
-        self.progress_bar.set(value)
-
-    def prompt_for_user_choice(self, prompt_text, choices_map):
-        """Shows the choice input UI."""
-        def _show():
-            self.choice_prompt_label.configure(text=prompt_text)
-            self.valid_choices_for_prompt = [c[0] for c in choices_map] 
-            self.choice_input_entry.delete(0, tk.END)
-            self.choice_frame.grid()
-            self.choice_input_entry.focus()
-        self.after(0, _show)
-
-    def submit_user_choice(self):
-        """Handles submission of user's choice from the special input field."""
-        choice = self.choice_input_entry.get().strip()
-        if choice in self.valid_choices_for_prompt:
-            self.user_choice_value = choice
-            self.log_message(f"User chose option: {choice}")
+    new_entries = current_job().lock_entries
+    if not new_entries:
+        gui_log(f"Nothing was resolved; leaving {LOCKFILE_NAME} and existing files untouched.")
+        return
+    if old_lock and (old_lock.get("mode"), old_lock.get("input")) == (mode, input_path_or_name):
+        if current_job().missed_items:
+            carried = 0
+            for entry in old_lock.get("entries", []):
+                key = get_lock_entry_key_backend(entry["source"], entry.get("projectId"), entry["fileName"])
+                if key not in new_entries and os.path.isfile(os.path.join(current_job().download_folder, os.path.basename(entry["fileName"]))):
+                    new_entries[key] = entry; carried += 1
+            if carried: gui_log(f"Some items failed; kept {carried} previously locked files instead of pruning them.")
         else:
-            self.user_choice_value = None 
-            self.log_message(f"Invalid choice '{choice}'. Expected one of {self.valid_choices_for_prompt}.")
-        
-        self.choice_frame.grid_remove()
-        self.user_choice_event.set()
-
-
-    def start_processing_thread(self):
-        """Starts the backend processing in a new thread after validating inputs."""
-        global DOWNLOAD_FOLDER_GLOBAL, MC_VERSION_INPUT_GLOBAL, LOADER_GLOBAL, LOADER_API_ID_GLOBAL, MISSED_ITEMS_GLOBAL
-        MISSED_ITEMS_GLOBAL = []
-
-        input_path_or_name = self.input_path_entry.get().strip()
-        DOWNLOAD_FOLDER_GLOBAL = self.download_folder_entry.get().strip()
-        MC_VERSION_INPUT_GLOBAL = self.mc_version_entry.get().strip()
-        LOADER_GLOBAL = self.loader_var.get()
-        LOADER_API_ID_GLOBAL = MODLOADER_MAP_CF_API.get(LOADER_GLOBAL, 0)
-        current_mode = self.mode_var.get()
-
-        if not input_path_or_name:
-            messagebox.showerror("Input Error", "Input (Path/URL/Name) is required.")
-            return
-        if not DOWNLOAD_FOLDER_GLOBAL:
-            messagebox.showerror("Input Error", "Download folder is required.")
-            return
-        if not MC_VERSION_INPUT_GLOBAL:
-            messagebox.showerror("Input Error", "Minecraft version is required.")
-            return
-        if current_mode == "Flexible Source Download" and MC_VERSION_INPUT_GLOBAL.lower() == "best":
-            messagebox.showerror("Input Error", "'best' Minecraft version is not supported for 'Flexible Source Download' mode. Please specify a version.")
-            return
-        
-        os.makedirs(DOWNLOAD_FOLDER_GLOBAL, exist_ok=True)
-
-        self.log_textbox.configure(state="normal")
-        self.log_textbox.delete("1.0", tk.END)
-        self.log_textbox.configure(state="disabled")
-        self.log_message("Starting processing...")
-        self.log_message(f"Mode: {current_mode}")
-        self.log_message(f"MC Version Input: {MC_VERSION_INPUT_GLOBAL}")
-        self.log_message(f"Loader: {LOADER_GLOBAL}")
-        self.log_message(f"Download Folder: {DOWNLOAD_FOLDER_GLOBAL}")
-
-        self.start_button.configure(state="disabled", text="Processing...")
-        self.progress_bar.set(0)
-        
-        def threaded_task():
+            prune_removed_lock_entries_backend(old_lock, new_entries)
+    elif old_lock:
+        gui_log(f"Existing {LOCKFILE_NAME} was for a different input; replacing it without pruning.")
+    try:
+        write_lockfile_backend(lock_path, mode, input_path_or_name, new_entries)
+        gui_log(f"Wrote {LOCKFILE_NAME} ({len(new_entries)} files).")
+    except OSError as e:
+        gui_log(f"Could not write {LOCKFILE_NAME}: {e}")
+
+class AsyncEngine:
+    """asyncio resolve/select/download engine: thousands of lookups in flight on one thread, bounded by semaphores and cancellable.
+
+    Shares the response cache, rate limiter and file-selection rules with the threaded backend. Needs the optional httpx package.
+    """
+    def __init__(self, max_concurrency=ASYNC_MAX_CONCURRENCY, max_downloads=MAX_CONCURRENT_DOWNLOADS):
+        import httpx
+        self._httpx = httpx
+        self.max_concurrency = max_concurrency
+        self.max_downloads = max_downloads
+        self.loop = None
+        self.client = None
+        self._tasks = set()
+        self._memo = {}
+        self._host_semaphores = {}
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self._api_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._download_semaphore = asyncio.Semaphore(self.max_downloads)
+        self.client = self._httpx.AsyncClient(
+            http2=USE_HTTP2, follow_redirects=True, timeout=20,
+            limits=self._httpx.Limits(max_connections=self.max_concurrency + self.max_downloads)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+
+    def spawn(self, coro):
+        """Starts a task that is tracked for cancellation."""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def cancel(self):
+        """Cancels every in-flight task. Safe to call from any thread."""
+        if self.loop and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(lambda: [task.cancel() for task in list(self._tasks)])
+
+    async def memoize(self, key, coro_fn):
+        """Async counterpart of RunMemo: concurrent awaiters of the same key share one task."""
+        task = self._memo.get(key)
+        if task is None: task = self._memo[key] = self.spawn(coro_fn())
+        return await asyncio.shield(task)
+
+    async def _wait_for_rate_limit(self, host):
+        while (wait := rate_limiter.try_acquire(host)) > 0: await asyncio.sleep(wait)
+
+    def _host_semaphore(self, host):
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(download_scheduler.host_limit(host))
+        return self._host_semaphores[host]
+
+    async def request(self, url, params=None, use_cf_session=True, is_json=True, json_body=None):
+        """Async make_api_request_backend: the same CachedApiRequest bookkeeping (run off the loop) and retry decisions."""
+        api_request = CachedApiRequest(url, params, json_body, is_json)
+        answered, result = await asyncio.to_thread(api_request.lookup)
+        if answered: return result
+        request_headers = dict(session.headers if use_cf_session else MODRINTH_HEADERS, **api_request.headers)
+        host = api_request.host
+        start = time.perf_counter()
+        async with self._api_semaphore:
+            for attempt in range(MAX_REQUEST_RETRIES + 1):
+                await self._wait_for_rate_limit(host)
+                try:
+                    response = await self.client.request("POST" if json_body is not None else "GET", url, params=params, json=json_body, headers=request_headers)
+                except self._httpx.TransportError as e:
+                    delay = get_network_retry_delay_backend(host, e, attempt)
+                    if delay is None:
+                        api_request.fail(e)
+                        return None
+                    await asyncio.sleep(delay); continue
+                delay = get_response_retry_delay_backend(host, response.status_code, response, attempt)
+                if delay is None: break
+                await asyncio.sleep(delay)
+        return await asyncio.to_thread(api_request.finish, response.status_code, response.content, response.headers, time.perf_counter() - start)
+
+    async def get_project_details_by_slug(self, slug, class_id, original_source_url):
+        """Async get_project_details_by_slug_backend."""
+        params = {"gameId": GAME_ID_MINECRAFT, "slug": slug, "classId": class_id}
+        data_val = await self.memoize(("cf_slug", slug.lower(), class_id), lambda: self.request(f"{BASE_API_URL}/mods/search", params=params))
+        if data_val and data_val.get("data"):
+            for proj in data_val["data"]:
+                if proj["slug"].lower() == slug.lower(): return proj
+        current_job().add_missed_item({"name": slug, "url": original_source_url, "reason": f"CF project details not found (slug: {slug}, classId: {class_id})"})
+        return None
+
+    async def get_cf_file_history(self, cf_mod_id):
+        """Async get_cf_file_history_backend: the same paging plan, each step's pages requested concurrently."""
+        async def fetch_page(index):
+            files_data = await self.request(f"{BASE_API_URL}/mods/{cf_mod_id}/files", params=get_cf_files_page_params_backend(index))
+            return parse_cf_files_page_backend(files_data, index)
+        steps = iter_cf_file_history_steps_backend(cf_mod_id, await asyncio.to_thread(get_stored_file_history_backend, cf_mod_id))
+        try:
+            page_indexes = next(steps)
+            while True: page_indexes = steps.send(await asyncio.gather(*(fetch_page(index) for index in page_indexes)))
+        except StopIteration as done: files, complete, save_total_count = done.value
+        if save_total_count is not None: await asyncio.to_thread(store_file_history_backend, cf_mod_id, files, save_total_count)
+        return files, complete
+
+    async def get_cf_project_files(self, cf_mod_id):
+        """Async get_cf_project_files_backend."""
+        async def fetch():
+            files, complete = await self.get_cf_file_history(cf_mod_id)
+            return {"files": files, "complete": complete, "index": build_cf_file_index_backend(files)}
+        return await self.memoize(("cf_files", cf_mod_id), fetch)
+
+    async def get_modrinth_project_versions(self, project_id_or_slug):
+        """Async get_modrinth_project_versions_backend."""
+        async def fetch():
+            return await self.request(f"{MODRINTH_API_BASE_URL}/project/{project_id_or_slug}/version", use_cf_session=False) or []
+        return await self.memoize(("modrinth_versions", project_id_or_slug), fetch)
+
+    async def get_latest_compatible_file_info(self, project_id_or_slug, project_name_api, project_source, cf_project_type_name_if_any, original_source_url):
+        """Async get_latest_compatible_file_info_backend: the same CF selection plan, with its requests awaited."""
+        if project_source == 'curseforge':
+            project_files = await self.get_cf_project_files(project_id_or_slug) if ("cf_files", project_id_or_slug) in self._memo else None
+            steps = iter_cf_file_selection_steps_backend(project_name_api, cf_project_type_name_if_any, project_files)
             try:
-                if current_mode == "HTML Modlist":
-                    process_modlist_from_html_backend(input_path_or_name)
-                elif current_mode == "Single Mod + Dependencies (CurseForge)":
-                    process_single_mod_and_dependencies_backend(input_path_or_name)
-                elif current_mode == "Modrinth Collection":
-                    process_modrinth_collection_backend(input_path_or_name)
-                elif current_mode == "Flexible Source Download":
-                    process_flexible_source_download_backend(input_path_or_name)
-                self.log_message("Processing finished.")
-            except Exception as e:
-                self.log_message(f"An critical error occurred: {e}")
-                import traceback
-                self.log_message(traceback.format_exc())
-            finally:
-                self.after(0, self.processing_finished)
-
-        thread = threading.Thread(target=threaded_task, daemon=True)
-        thread.start()
+                step, params = next(steps)
+                while True:
+                    if step == "filtered": result = await self.request(f"{BASE_API_URL}/mods/{project_id_or_slug}/files", params=params)
+                    else: result = await self.get_cf_project_files(project_id_or_slug)
+                    step, params = steps.send(result)
+            except StopIteration as done: file_info = done.value
+            if file_info: return file_info, 'curseforge'
+            add_no_compatible_file_missed_item_backend(project_name_api, original_source_url, "CF")
+        elif project_source == 'modrinth':
+            file_info = select_modrinth_file_from_versions_backend(await self.get_modrinth_project_versions(project_id_or_slug))
+            if file_info: return file_info, 'modrinth'
+            add_no_compatible_file_missed_item_backend(project_name_api, original_source_url, "Modrinth")
+        return None, None
 
-    def processing_finished(self):
-        """Called when backend processing is complete to update GUI."""
-        self.start_button.configure(state="normal", text="Start Processing")
-        self.progress_bar.set(1)
-        self.stop_progress_indeterminate()
-        self.choice_frame.grid_remove() 
+    async def _download_to_part_file(self, dl_url, part_path, expected_len, hash_algo=None):
+        """Async download_to_part_file_backend."""
+        host = urlsplit(dl_url).hostname or ""
+        for attempt in range(DOWNLOAD_RESUME_ATTEMPTS):
+            offset = await asyncio.to_thread(get_resume_offset_backend, part_path, expected_len)
+            if offset and offset == expected_len: return await asyncio.to_thread(hash_file_backend, part_path, hash_algo) if hash_algo else None
+            request_headers = dict(MODRINTH_HEADERS)
+            if offset: request_headers["Range"] = f"bytes={offset}-"
+            await self._wait_for_rate_limit(host)
+            try:
+                async with self.client.stream("GET", dl_url, headers=request_headers, timeout=DOWNLOAD_TIMEOUT_SECONDS) as response:
+                    retry_after = rate_limiter.observe(host, response)
+                    if response.status_code in RETRYABLE_STATUS_CODES and attempt < DOWNLOAD_RESUME_ATTEMPTS - 1:
+                        await asyncio.sleep(get_retry_delay_backend(attempt, retry_after)); continue
+                    if response.status_code == 416 and offset:
+                        await asyncio.to_thread(os.remove, part_path); continue
+                    response.raise_for_status()
+                    start_offset = get_response_start_offset_backend(response.status_code, response.headers.get("Content-Range"), offset)
+                    total = get_download_total_backend(expected_len, response.headers, start_offset)
+                    digest = hashlib.new(hash_algo) if hash_algo else None
+                    if digest and start_offset: await asyncio.to_thread(hash_file_backend, part_path, hash_algo, digest, start_offset)
+                    f = await asyncio.to_thread(open, part_path, 'ab' if start_offset else 'wb')
+                    try:
+                        batch, batch_size = [], 0
+                        async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            batch.append(chunk); batch_size += len(chunk)
+                            if batch_size >= ASYNC_WRITE_BATCH_BYTES:
+                                await asyncio.to_thread(write_part_chunk_backend, f, digest, b"".join(batch))
+                                batch, batch_size = [], 0
+                        if batch: await asyncio.to_thread(write_part_chunk_backend, f, digest, b"".join(batch))
+                    finally: await asyncio.to_thread(f.close)
+                if total <= 0 or await asyncio.to_thread(os.path.getsize, part_path) == total: return digest.hexdigest() if digest else None
+            except self._httpx.TransportError:
+                if attempt >= DOWNLOAD_RESUME_ATTEMPTS - 1: raise
+                await asyncio.sleep(get_retry_delay_backend(attempt))
+        raise IOError(f"download incomplete after {DOWNLOAD_RESUME_ATTEMPTS} attempts")
+
+    async def _fetch_artifact(self, file_info, filepath):
+        """Async fetch_artifact_backend, under the global and per-host download limits. Returns filepath."""
+        dl_url = get_download_url_backend(file_info)
+        async with self._download_semaphore, self._host_semaphore(urlsplit(dl_url).hostname or ""):
+            start = time.perf_counter()
+            part_path = filepath + PART_FILE_SUFFIX
+            hash_algo = get_expected_hash_backend(file_info)[0]
+            actual_hash = await self._download_to_part_file(dl_url, part_path, file_info.get("fileLength", -1), hash_algo)
+            await asyncio.to_thread(finalize_download_backend, part_path, filepath, file_info, actual_hash)
+            await asyncio.to_thread(record_download_metrics_backend, dl_url, filepath, time.perf_counter() - start)
+        return filepath
+
+    async def download(self, file_info, project_type_name_display, original_source_url, source_api):
+        """Async download_worker_backend: streams into a resumable, hash-checked .part file, once per distinct file.
+
+        Hashing, store linking and file writes run in worker threads so they never stall other transfers on the loop.
+        """
+        filename = file_info.get("fileName")
+        filepath = await asyncio.to_thread(get_download_target_backend, file_info, project_type_name_display, original_source_url, source_api)
+        if not filepath: return
+        gui_log(f"Downloading ({source_api}) {project_type_name_display}: {filename}")
+        try:
+            fetched_path = await self.memoize(("download", get_artifact_key_backend(file_info)), lambda: self._fetch_artifact(file_info, filepath))
+            await asyncio.to_thread(place_fetched_artifact_backend, file_info, fetched_path, filepath)
+            record_lock_entry_backend(file_info, project_type_name_display, original_source_url, source_api)
+        except Exception as e:
+            current_job().metrics.inc("modease_downloads_total", result="failed")
+            current_job().add_missed_item({"name": filename, "url": original_source_url, "reason": f"Download error: {e}"})
+
+    async def get_cf_files_by_ids(self, file_ids):
+        """Async get_cf_files_by_ids_backend, its chunks requested concurrently."""
+        file_ids = list(dict.fromkeys(file_ids))
+        chunks = [file_ids[start:start + CF_BULK_CHUNK_SIZE] for start in range(0, len(file_ids), CF_BULK_CHUNK_SIZE)]
+        files_by_id = {}
+        for data_val in await asyncio.gather(*(self.request(f"{BASE_API_URL}/mods/files", json_body={"fileIds": chunk}) for chunk in chunks)):
+            if data_val and data_val.get("data"):
+                for file_info in data_val["data"]: files_by_id[file_info["id"]] = file_info
+        return files_by_id
+
+    async def resolve_cf_url(self, url, type_info):
+        """Slug lookup for one CurseForge URL. Returns the project info used for download, or None."""
+        details = await self.get_project_details_by_slug(get_slug_from_url_backend(url), type_info["classId"], url)
+        if not details: return None
+        return {
+            'id_or_slug': details["id"], 'name': details["name"], 'source': 'curseforge',
+            'cf_project_type_name': type_info["name"], 'original_url': url, 'details': details
+        }
+
+    async def select_and_download_cf_project(self, proj_info):
+        """Per-project file selection for a CF project its latestFilesIndexes could not serve, then download."""
+        file_info, source_api = await self.get_latest_compatible_file_info(proj_info['id_or_slug'], proj_info['name'], 'curseforge', proj_info['cf_project_type_name'], proj_info['original_url'])
+        if file_info: await self.download(file_info, proj_info['cf_project_type_name'], proj_info['original_url'], source_api)
+
+    async def process_modlist_from_html(self, modlist_path):
+        """Async HTML modlist mode for an explicit MC version: slugs are resolved concurrently, indexed files fetched in bulk, then everything downloads concurrently."""
+        raw_items = get_cf_items_from_html_backend(modlist_path)
+        if not raw_items: return
+        current_job().mc_version = current_job().mc_version_input
+        gui_log(f"Using specified MC Version: {current_job().mc_version}")
+        gui_log(f"Found {len(raw_items)} potential CF projects in HTML. Resolving and downloading (async engine)...")
+        cf_projects = []
+        for result in await asyncio.gather(*(self.spawn(self.resolve_cf_url(item["url"], item["type_data"])) for item in raw_items), return_exceptions=True):
+            if isinstance(result, asyncio.CancelledError): raise result
+            if isinstance(result, Exception): gui_log(f"Resolution error: {result}")
+            elif result: cf_projects.append(result)
+        chosen_file_ids = get_indexed_cf_file_ids_backend(cf_projects)
+        files_by_id = await self.get_cf_files_by_ids(chosen_file_ids.values()) if chosen_file_ids else {}
+        matched, unmatched = match_indexed_cf_files_backend(cf_projects, chosen_file_ids, files_by_id)
+        tasks = [self.spawn(self.download(file_info, proj_info['cf_project_type_name'], proj_info['original_url'], 'curseforge')) for proj_info, file_info in matched]
+        tasks += [self.spawn(self.select_and_download_cf_project(proj_info)) for proj_info in unmatched]
+        current_job().set_progress_total_steps(len(tasks))
+        for i, task in enumerate(asyncio.as_completed(tasks)):
+            try: await task
+            except asyncio.CancelledError: raise
+            except Exception as e: gui_log(f"Resolution error: {e}")
+            current_job().set_progress((i + 1) / len(tasks))
+
+def is_async_engine_available_backend():
+    """True when the asyncio engine's optional httpx package is installed; otherwise logs that the threaded pipeline is used."""
+    try: import httpx
+    except ImportError as e:
+        gui_log(f"Async engine unavailable ({e}); falling back to the threaded pipeline.")
+        return False
+    return True
+
+def run_async_engine_backend(engine_method_name, *args):
+    """Runs an AsyncEngine mode on a fresh event loop in the calling worker thread. The engine can be cancelled via the job's cancel()."""
+    job = current_job()
+    async def main():
+        async with AsyncEngine() as engine:
+            job.async_engine = engine
+            try: await getattr(engine, engine_method_name)(*args)
+            finally: job.async_engine = None
+    try: asyncio.run(main())
+    except asyncio.CancelledError: gui_log("Processing cancelled.")
+
+CLI_MODES = {
+    "html": "HTML Modlist",
+    "single": "Single Mod + Dependencies",
+    "collection": "Modrinth Collection",
+    "flexible": "Flexible Source Download",
+    "sync": SYNC_MODE_NAME,
+    "batch": BATCH_MODE_NAME,
+}
 
-        if MISSED_ITEMS_GLOBAL:
-            summary_title = "Download Summary - Missed/Skipped Items"
-            summary_body = "Warning: Some items had issues.\nCheck manually:\n\n"
-            
-            unique_missed = []
-            seen_identifiers = set()
-            for item in MISSED_ITEMS_GLOBAL:
-                identifier = item.get("url", "") + item.get("reason", "")
-                if identifier not in seen_identifiers:
-                    unique_missed.append(item)
-                    seen_identifiers.add(identifier)
-
-            for item in unique_missed:
-                summary_body += f"- Name/ID: {item.get('name', 'N/A')}\n  Reason: {item.get('reason', 'N/A')}\n  Source: {item.get('url', 'N/A')}\n\n"
-            
-            summary_window = ctk.CTkToplevel(self)
-            summary_window.title(summary_title)
-            summary_window.geometry("500x400")
-            
-            summary_textbox = ctk.CTkTextbox(summary_window, wrap="word", height=350, width=480)
-            summary_textbox.pack(padx=10, pady=10, fill="both", expand=True)
-            summary_textbox.insert("1.0", summary_body)
-            summary_textbox.configure(state="disabled")
-            
-            close_button = ctk.CTkButton(summary_window, text="Close", command=summary_window.destroy)
-            close_button.pack(pady=5)
-            summary_window.grab_set()
-        else:
-            self.log_message("All items processed successfully or already existed.")
-            messagebox.showinfo("Success", "All items processed successfully or already existed.")
-        self.progress_bar.set(0)
+def get_unique_missed_items_backend(missed_items):
+    """Drops repeated missed-item reports (same URL and reason), keeping the first of each."""
+    unique_missed, seen_identifiers = [], set()
+    for item in missed_items:
+        identifier = item.get("url", "") + item.get("reason", "")
+        if identifier not in seen_identifiers:
+            unique_missed.append(item)
+            seen_identifiers.add(identifier)
+    return unique_missed
+
+def run_job_backend(job, mode, input_path_or_name):
+    """Runs one processing mode (or a batch manifest) as `job`, in a fresh context so concurrent jobs never see each other's state."""
+    def run():
+        current_job_var.set(job)
+        os.makedirs(job.download_folder, exist_ok=True)
+        try:
+            if mode == BATCH_MODE_NAME: run_batch_manifest_backend(input_path_or_name)
+            else: run_processing_mode_backend(mode, input_path_or_name)
+        finally:
+            if job.parent is None: report_metrics_backend(job.metrics, job.metrics_path)
+    contextvars.copy_context().run(run)
+    return job.missed_items
+
+def report_metrics_backend(metrics, metrics_path=None):
+    """Logs a summary of a run's metrics (API traffic, cache hits, download volume, costliest phases) and optionally exports them."""
+    download_seconds = sum(total for _, total in metrics.histogram_totals("modease_download_seconds", "host").values())
+    downloaded_mb = metrics.counter_value("modease_download_bytes_total") / 1e6
+    phases = sorted(metrics.histogram_totals("modease_phase_seconds", "phase").items(), key=lambda item: -item[1][1])[:3]
+    gui_log(
+        f"Metrics: {metrics.counter_value('modease_api_requests_total')} API requests, "
+        f"{metrics.counter_value('modease_api_cache_hits_total')} cache hits, {metrics.counter_value('modease_http_retries_total')} retries; "
+        f"{downloaded_mb:.1f} MB downloaded" + (f" at {downloaded_mb / download_seconds:.1f} MB/s per stream" if download_seconds > 0 else "") + "; "
+        f"busiest phases (summed over threads): " + (", ".join(f"{phase} {total:.2f}s" for phase, (_, total) in phases) or "n/a")
+    )
+    if metrics_path:
+        try:
+            metrics.write(metrics_path)
+            gui_log(f"Wrote metrics to {metrics_path}")
+        except OSError as e: gui_log(f"Could not write metrics to {metrics_path}: {e}")
+
+def read_batch_manifest_backend(manifest_path, default_output_folder):
+    """Reads a batch manifest into a list of job specs. Raises ValueError on a malformed manifest.
+
+    The manifest is {"defaults": {...}, "jobs": [{...}, ...]} (or just the jobs list). Job keys: mode (a GUI mode name or CLI alias),
+    input, output, mcVersion, loader, offline, prefer. Relative paths are resolved against the manifest's folder; a job without
+    an output goes to <download folder>/<mcVersion>-<loader>, suffixed with a hash of its mode and input when other jobs
+    share that version and loader. Jobs that would still share an output folder (and its lockfile) are rejected.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f: manifest = json.load(f)
+    if isinstance(manifest, list): manifest = {"jobs": manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list) or not manifest["jobs"]:
+        raise ValueError("manifest has no 'jobs' list")
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    specs = []
+    for i, job in enumerate(manifest["jobs"]):
+        spec = {"mode": "html", "input": "", "mcVersion": "best", "loader": "forge", "offline": False, "prefer": "curseforge"}
+        spec.update(manifest.get("defaults") or {})
+        spec.update(job)
+        spec["mode"] = CLI_MODES.get(spec["mode"], RENAMED_MODES.get(spec["mode"], spec["mode"]))
+        spec["loader"] = str(spec["loader"]).lower()
+        if spec["mode"] not in PROCESSING_MODES and spec["mode"] != SYNC_MODE_NAME: raise ValueError(f"job {i + 1}: unknown mode {spec['mode']!r}")
+        if spec["loader"] not in MODLOADER_MAP_CF_API: raise ValueError(f"job {i + 1}: unknown loader {spec['loader']!r}")
+        if spec["mode"] == "Flexible Source Download" and str(spec["mcVersion"]).lower() == "best":
+            raise ValueError(f"job {i + 1}: 'best' Minecraft version is not supported for Flexible Source Download")
+        if spec["input"] and spec["mode"] in ("HTML Modlist", SYNC_MODE_NAME):
+            spec["input"] = os.path.join(manifest_dir, spec["input"])
+        if spec.get("output"): spec["output"] = os.path.join(manifest_dir, spec["output"])
+        spec.setdefault("name", f"{spec['mcVersion']} {spec['loader']}")
+        specs.append(spec)
+    default_folders = Counter(f"{spec['mcVersion']}-{spec['loader']}" for spec in specs if not spec.get("output"))
+    outputs = {}
+    for i, spec in enumerate(specs):
+        if not spec.get("output"):
+            folder = f"{spec['mcVersion']}-{spec['loader']}"
+            if default_folders[folder] > 1: folder += "-" + hashlib.sha1(f"{spec['mode']}\0{spec['input']}".encode("utf-8")).hexdigest()[:8]
+            spec["output"] = os.path.join(default_output_folder, folder)
+        output_key = os.path.normcase(os.path.abspath(spec["output"]))
+        if output_key in outputs: raise ValueError(f"jobs {outputs[output_key] + 1} and {i + 1} would both write to {spec['output']}")
+        outputs[output_key] = i
+    return specs
+
+def run_batch_manifest_backend(manifest_path):
+    """Batch mode: runs every job of a manifest concurrently as sub-jobs of the current job.
+
+    Sub-jobs share one API lookup memo and one download memo (on top of the shared scheduler, response cache and artifact
+    store), so a project resolved or a jar fetched for one (MC version, loader) combination is reused by the others.
+    """
+    parent = current_job()
+    try: specs = read_batch_manifest_backend(manifest_path, parent.download_folder)
+    except (OSError, ValueError) as e:
+        parent.add_missed_item({"name": "Batch manifest", "url": manifest_path, "reason": f"Invalid manifest: {e}"})
+        return
+    shared_memo, shared_downloads = RunMemo(), RunMemo()
+    jobs = [JobContext(spec["output"], spec["mcVersion"], spec["loader"], offline=bool(spec["offline"]) or parent.offline,
+                       preferred_source=spec["prefer"], quiet=parent.quiet, memo=shared_memo, downloads=shared_downloads,
+                       label=spec["name"], parent=parent, metrics=parent.metrics) for spec in specs]
+    parent.children = jobs
+    gui_log(f"Batch: {len(jobs)} jobs from {os.path.basename(manifest_path)} (max {BATCH_MAX_CONCURRENT_JOBS} at a time).")
+    parent.set_progress_total_steps(len(jobs))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(BATCH_MAX_CONCURRENT_JOBS, len(jobs))) as pool:
+        futures = {pool.submit(run_job_backend, job, spec["mode"], spec["input"]): job for job, spec in zip(jobs, specs)}
+        for future in concurrent.futures.as_completed(futures):
+            job = futures[future]
+            try: future.result()
+            except Exception as e: job.add_missed_item({"name": job.label, "url": manifest_path, "reason": f"Job failed: {e}"})
+            missed_items = job.missed_items
+            for item in missed_items: parent.add_missed_item(dict(item, reason=f"[{job.label}] {item.get('reason', '')}"))
+            gui_log(f"Batch job {job.label} finished ({len(missed_items)} missed) -> {job.download_folder}")
+            parent.update_progress_determinate_step()
+    parent.children = []
+
+def run_headless_backend(mode, input_path_or_name, download_folder, mc_version="best", loader="forge", offline=False, preferred_source="curseforge", quiet=False, metrics_path=None):
+    """Library entry point: runs one mode without the GUI and returns the missed/skipped items.
+
+    mode is a GUI mode name or a CLI alias ('html', 'single', 'collection', 'flexible', 'sync', 'batch'). Raises ValueError on bad input.
+    """
+    mode = CLI_MODES.get(mode, mode)
+    if mode not in PROCESSING_MODES and mode not in (SYNC_MODE_NAME, BATCH_MODE_NAME): raise ValueError(f"Unknown mode: {mode}")
+    if not input_path_or_name and mode != SYNC_MODE_NAME: raise ValueError("Input (Path/URL/Name) is required.")
+    if not download_folder: raise ValueError("Download folder is required.")
+    if mode == "Flexible Source Download" and str(mc_version).lower() == "best":
+        raise ValueError("'best' Minecraft version is not supported for 'Flexible Source Download' mode. Please specify a version.")
+    if loader.lower() not in MODLOADER_MAP_CF_API: raise ValueError(f"Unknown loader: {loader}")
+
+    job = JobContext(download_folder, mc_version, loader, offline=offline, preferred_source=preferred_source, quiet=quiet, metrics_path=metrics_path)
+    return run_job_backend(job, mode, input_path_or_name)
+
+def is_mirror_allowed_url_backend(url):
+    """Only the upstream API hosts and CurseForge/Modrinth sites and CDNs may be fetched through the mirror."""
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if parts.scheme not in ("http", "https"): return False
+    if host in (urlsplit(BASE_API_URL).hostname, urlsplit(MODRINTH_API_BASE_URL).hostname): return True
+    return any(host == suffix or host.endswith("." + suffix) for suffix in MIRROR_ALLOWED_HOST_SUFFIXES)
+
+def get_mirrored_artifact_backend(dl_url, hash_algo=None, file_hash=None):
+    """Returns the mirror's local copy of a file, fetching it upstream first if needed.
+
+    Files with a published hash are kept (verified) in the shared artifact store, others under MIRROR_CACHE_DIR by URL.
+    Concurrent requests for the same file share a single upstream fetch.
+    """
+    if file_hash:
+        if hash_algo not in HASH_ALGO_PREFERENCE or not re.fullmatch(r"[0-9a-f]+", file_hash): raise ValueError("bad hash")
+        key, path = (hash_algo, file_hash), get_artifact_store_path_backend(hash_algo, file_hash)
+    else:
+        key, path = ("url", dl_url), os.path.join(MIRROR_CACHE_DIR, hashlib.sha256(dl_url.encode("utf-8")).hexdigest())
+    if os.path.exists(path):
+        current_job().metrics.inc("modease_downloads_total", result="store")
+        return path
+    def fetch():
+        start, part_path = time.perf_counter(), path + PART_FILE_SUFFIX
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        actual_hash = download_to_part_file_backend(dl_url, part_path, -1, hash_algo if file_hash else None)
+        if file_hash and actual_hash != file_hash:
+            os.remove(part_path)
+            raise IOError(f"{hash_algo} mismatch (expected {file_hash[:12]}..., got {str(actual_hash)[:12]}...)")
+        os.replace(part_path, path)
+        record_download_metrics_backend(dl_url, path, time.perf_counter() - start)
+        current_job().metrics.inc("modease_downloads_total", result="downloaded")
+        gui_log(f"Mirrored: {dl_url}")
+        return path
+    fetched_path = current_job().downloads.get_or_compute(key, fetch)
+    if os.path.exists(fetched_path): return fetched_path
+    current_job().downloads.forget(key)  # the cached file was deleted since it was fetched
+    return current_job().downloads.get_or_compute(key, fetch)
+
+
+class MirrorRequestHandler(BaseHTTPRequestHandler):
+    """Serves the mirror endpoints: /cf/<path> and /modrinth/<path> (API proxy), /fetch?url= (pages) and /dl?url=&algo=&hash= (files).
+
+    API responses go through make_api_request_backend, so they share the mirror's response cache and upstream rate limits.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args): pass
+
+    def do_GET(self): self.handle_mirror_request()
+
+    def do_POST(self): self.handle_mirror_request()
+
+    def handle_mirror_request(self):
+        current_job_var.set(self.server.job)
+        parts = urlsplit(self.path)
+        params = dict(parse_qsl(parts.query))
+        try:
+            json_body = None
+            if self.command == "POST": json_body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"null")
+            prefix, _, rest = parts.path.lstrip("/").partition("/")
+            if prefix in ("cf", "modrinth") and rest:
+                upstream_url = f"{BASE_API_URL if prefix == 'cf' else MODRINTH_API_BASE_URL}/{rest}"
+                body = make_api_request_backend(upstream_url, params or None, use_cf_session=prefix == "cf", is_json=False, json_body=json_body)
+                self.send_body(body, "application/json")
+            elif parts.path == "/fetch" and is_mirror_allowed_url_backend(params.get("url", "")):
+                self.send_body(make_api_request_backend(params["url"], use_cf_session=False, is_json=False), "text/html; charset=utf-8")
+            elif parts.path == "/dl" and is_mirror_allowed_url_backend(params.get("url", "")):
+                self.send_file(get_mirrored_artifact_backend(params["url"], params.get("algo"), params.get("hash", "").lower()))
+            else:
+                self.send_error_body(404, "Unknown endpoint or URL not allowed")
+        except (ValueError, OSError, requests.exceptions.RequestException) as e:
+            gui_log(f"Mirror request failed for {self.path}: {e}")
+            self.send_error_body(502, str(e))
+
+    def send_error_body(self, status, description):
+        body = json.dumps({"error": "mirror", "description": description}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_body(self, body, content_type):
+        # The mirror already retried upstream; a 404 keeps clients from retrying a lookup that failed there.
+        if body is None: return self.send_error_body(404, "Not available upstream")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_file(self, path):
+        size = os.path.getsize(path)
+        match = re.match(r"^bytes=(\d+)-$", self.headers.get("Range") or "")
+        start = int(match.group(1)) if match else 0
+        if start >= size > 0: return self.send_error_body(416, "Range not satisfiable")
+        self.send_response(206 if start else 200)
+        if start: self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        self.send_header("Content-Type", "application/java-archive")
+        self.send_header("Content-Length", str(size - start))
+        self.end_headers()
+        with open(path, "rb") as f:
+            f.seek(start)
+            shutil.copyfileobj(f, self.wfile, DOWNLOAD_CHUNK_SIZE)
+
+
+def create_mirror_server_backend(bind=MIRROR_DEFAULT_BIND, quiet=False):
+    """Creates (without starting) a mirror server on "host:port". Call serve_forever() on it, shutdown() to stop."""
+    host, _, port = bind.rpartition(":")
+    try: server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), MirrorRequestHandler)
+    except ValueError: raise ValueError(f"Invalid bind address: {bind} (expected host:port)")
+    server.daemon_threads = True
+    server.job = JobContext(MIRROR_CACHE_DIR, quiet=quiet, label="mirror")
+    return server
+
+def serve_mirror_backend(bind=MIRROR_DEFAULT_BIND, quiet=False, metrics_path=None):
+    """Mirror mode: serves cached API responses and jars to other ModEase instances (mirrorUrl / --mirror) until interrupted.
+
+    Every artifact is fetched upstream once and then served from disk, so a fleet of machines shares one upstream download.
+    It listens on localhost unless given an explicit bind address (e.g. 0.0.0.0:8780), since anyone who can reach it
+    spends this host's CurseForge API key.
+    """
+    server = create_mirror_server_backend(bind or MIRROR_DEFAULT_BIND, quiet)
+    host, port = server.server_address[:2]
+    current_job_var.set(server.job)
+    print(f"ModEase mirror listening on http://{host}:{port} (upstream: {BASE_API_URL}, {MODRINTH_API_BASE_URL})", flush=True)
+    if not host.startswith("127.") and host != "::1":
+        print("Warning: the mirror is reachable from other machines and has no authentication; every client uses this host's API key.", flush=True)
+    try: server.serve_forever()
+    except KeyboardInterrupt: pass
+    finally:
+        server.server_close()
+        report_metrics_backend(server.job.metrics, metrics_path)
+
+def build_arg_parser_backend():
+    parser = argparse.ArgumentParser(prog="ModEase", description="Download Minecraft mods from CurseForge and Modrinth. Run with no arguments to open the GUI.")
+    parser.add_argument("mode", choices=list(CLI_MODES) + ["mirror"], help="html: HTML modlist; single: mod + dependencies; collection: Modrinth collection; flexible: project name or URL; sync: re-sync from a lockfile; batch: every job of a JSON manifest; mirror: serve a caching API/download mirror to other ModEase instances")
+    parser.add_argument("input", nargs="?", default="", help=f"modlist path, mod/collection URL, project name, lockfile (sync; defaults to the output folder's), batch manifest, or mirror bind address (default {MIRROR_DEFAULT_BIND}; e.g. 0.0.0.0:8780 to serve the LAN)")
+    parser.add_argument("-o", "--output", help="download folder, required except for mirror (batch: base folder for jobs without an output)")
+    parser.add_argument("-m", "--mc-version", default="best", help="Minecraft version, or 'best' (default)")
+    parser.add_argument("-l", "--loader", default="forge", choices=MODLOADER_CHOICES, type=str.lower)
+    parser.add_argument("--prefer", default="curseforge", choices=["curseforge", "modrinth"], help="source for flexible mode when a project is on both")
+    parser.add_argument("--offline", action="store_true", help="serve API responses from the cache only")
+    parser.add_argument("--http2", action="store_true", help="talk HTTP/2 to the APIs and download hosts (needs httpx[http2]; same as http2 in the config file or MODEASE_HTTP2=1)")
+    parser.add_argument("--async-engine", action="store_true", help="use the asyncio engine for HTML modlists with an explicit MC version (other modes always use the threaded pipeline)")
+    parser.add_argument("--metrics", metavar="PATH", help="write run metrics to PATH: Prometheus text for *.prom, JSON lines otherwise")
+    parser.add_argument("--mirror", metavar="URL", help="fetch API responses, pages and downloads through a ModEase mirror (overrides the config file and MODEASE_MIRROR_URL)")
+    parser.add_argument("--cf-api-url", metavar="URL", help=f"CurseForge API base URL (default {DEFAULT_CF_API_URL})")
+    parser.add_argument("--modrinth-api-url", metavar="URL", help=f"Modrinth API base URL (default {DEFAULT_MODRINTH_API_URL})")
+    parser.add_argument("--config", metavar="PATH", help="JSON config file with cfApiUrl, modrinthApiUrl, mirrorUrl, apiKey and http2 (default ~/.modease/config.json)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print missed items")
+    return parser
+
+def main(argv=None):
+    """Command-line entry point. With no arguments, launches the GUI; otherwise runs one mode headlessly.
+
+    Exits 0 when everything was downloaded or already present, 1 when items were missed, 2 on usage errors.
+    """
+    global USE_ASYNC_ENGINE
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        from ModEaseGUI import run_gui
+        run_gui()
+        return 0
+    parser = build_arg_parser_backend()
+    args = parser.parse_args(argv)
+    USE_ASYNC_ENGINE = USE_ASYNC_ENGINE or args.async_engine
+    try:
+        overrides = {"cfApiUrl": args.cf_api_url, "modrinthApiUrl": args.modrinth_api_url, "mirrorUrl": args.mirror, "http2": args.http2}
+        config = load_config_backend(args.config, overrides)
+        if args.mode == "mirror": config.pop("mirrorUrl", None)  # the mirror itself always talks to the upstream endpoints
+        apply_config_backend(config)
+        if args.mode == "mirror":
+            serve_mirror_backend(args.input, args.quiet, args.metrics)
+            return 0
+        missed_items = run_headless_backend(args.mode, args.input, args.output, args.mc_version, args.loader, args.offline, args.prefer, args.quiet, args.metrics)
+    except ValueError as e:
+        parser.error(str(e))
+    for item in get_unique_missed_items_backend(missed_items):
+        print(f"MISSED: {item.get('name', 'N/A')} - {item.get('reason', 'N/A')} ({item.get('url', 'N/A')})", file=sys.stderr)
+    return 1 if missed_items else 0
 
 
 if __name__ == "__main__":
-    if not API_KEY or API_KEY.startswith("$2a$10$8L"):
-        print("WARNING: API_KEY might be a placeholder. GUI will launch but API calls may fail.")
-    app = App()
-    app.mainloop()
\ No newline at end of file
+    sys.modules.setdefault("ModEase", sys.modules[__name__])
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""ModEase desktop GUI (customtkinter). Imported only when the GUI is launched, so headless runs never load Tk."""
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import filedialog, messagebox
+import os
+import threading
+from collections import deque
+
+import ModEase as backend
+
+GUI_REFRESH_INTERVAL_MS = 50
+LOG_MAX_LINES = 2000
+
+
+class App(ctk.CTk):
+    """Main window. Worker threads never touch Tk directly: log lines, progress updates and other widget changes are
+    queued under a lock and applied by the Tk loop every GUI_REFRESH_INTERVAL_MS, with all pending lines inserted at once."""
+    def __init__(self):
+        super().__init__()
+        backend.apply_config_backend(backend.load_config_backend())
+        self.title("ModEase")
+        self.geometry("750x800")
+        ctk.set_appearance_mode("System")
+        ctk.set_default_color_theme("blue")
+
+        icon_path_ico = "ModEase.ico"
+        if os.path.exists(icon_path_ico):
+            try:
+                self.iconbitmap(icon_path_ico)
+            except Exception as e:
+                print(f"Could not set .ico icon: {e}")
+        else:
+            print(f"Icon file not found: {icon_path_ico} (for .ico)")
+
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(6, weight=1)
+
+        self.mode_label = ctk.CTkLabel(self, text="Select Mode:")
+        self.mode_label.grid(row=0, column=0, padx=10, pady=(10,0), sticky="w")
+        self.mode_var = ctk.StringVar(value="HTML Modlist")
+        self.mode_options = ["HTML Modlist", "Single Mod + Dependencies", "Modrinth Collection", "Flexible Source Download", "Sync from Lockfile", "Batch Manifest"]
+        self.mode_menu = ctk.CTkOptionMenu(self, variable=self.mode_var, values=self.mode_options, command=self.update_input_label_and_browse)
+        self.mode_menu.grid(row=0, column=1, columnspan=2, padx=10, pady=(10,0), sticky="ew")
+
+        self.input_path_label = ctk.CTkLabel(self, text="Modlist HTML File:")
+        self.input_path_label.grid(row=1, column=0, padx=10, pady=5, sticky="w")
+        self.input_path_entry = ctk.CTkEntry(self, placeholder_text="Path or URL or Project Name")
+        self.input_path_entry.grid(row=1, column=1, padx=10, pady=5, sticky="ew")
+        self.browse_button = ctk.CTkButton(self, text="Browse", command=self.browse_file_or_folder)
+        self.browse_button.grid(row=1, column=2, padx=10, pady=5)
+
+        self.mc_version_label = ctk.CTkLabel(self, text="Minecraft Version (or 'best'):")
+        self.mc_version_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+        self.mc_version_entry = ctk.CTkEntry(self, placeholder_text="e.g., 1.20.1 or best (not for Flexible mode)")
+        self.mc_version_entry.grid(row=2, column=1, columnspan=2, padx=10, pady=5, sticky="ew")
+
+        self.loader_label = ctk.CTkLabel(self, text="Mod Loader:")
+        self.loader_label.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+        self.loader_var = ctk.StringVar(value=backend.MODLOADER_CHOICES[0])
+        self.loader_menu = ctk.CTkOptionMenu(self, variable=self.loader_var, values=backend.MODLOADER_CHOICES)
+        self.loader_menu.grid(row=3, column=1, padx=10, pady=5, sticky="ew")
+        self.offline_var = ctk.BooleanVar(value=False)
+        self.offline_checkbox = ctk.CTkCheckBox(self, text="Offline (cache only)", variable=self.offline_var)
+        self.offline_checkbox.grid(row=3, column=2, padx=10, pady=5, sticky="w")
+
+        self.download_folder_label = ctk.CTkLabel(self, text="Download Folder:")
+        self.download_folder_label.grid(row=4, column=0, padx=10, pady=5, sticky="w")
+        self.download_folder_entry = ctk.CTkEntry(self, placeholder_text="Select download destination")
+        self.download_folder_entry.grid(row=4, column=1, padx=10, pady=5, sticky="ew")
+        self.download_folder_button = ctk.CTkButton(self, text="Select Folder", command=self.select_download_dir)
+        self.download_folder_button.grid(row=4, column=2, padx=10, pady=5)
+        
+        self.choice_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.choice_frame.grid(row=5, column=0, columnspan=3, padx=10, pady=5, sticky="ew")
+        self.choice_frame.grid_remove() 
+        
+        self.choice_prompt_label = ctk.CTkLabel(self.choice_frame, text="", wraplength=680)
+        self.choice_prompt_label.pack(pady=(0,5))
+        self.choice_input_entry = ctk.CTkEntry(self.choice_frame, placeholder_text="Enter choice")
+        self.choice_input_entry.pack(side=tk.LEFT, padx=(0,5), fill=tk.X, expand=True)
+        self.choice_submit_button = ctk.CTkButton(self.choice_frame, text="Submit Choice", command=self.submit_user_choice)
+        self.choice_submit_button.pack(side=tk.LEFT)
+        self.user_choice_event = threading.Event()
+        self.user_choice_value = None
+        self.valid_choices_for_prompt = []
+
+
+        self.log_textbox = ctk.CTkTextbox(self, wrap="word", state="disabled", height=200)
+        self.log_textbox.grid(row=6, column=0, columnspan=3, padx=10, pady=10, sticky="nsew")
+
+        self.progress_bar = ctk.CTkProgressBar(self, orientation="horizontal", mode="determinate")
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=7, column=0, columnspan=3, padx=10, pady=5, sticky="ew")
+
+        self.start_button = ctk.CTkButton(self, text="Start Processing", command=self.start_processing_thread)
+        self.start_button.grid(row=8, column=0, columnspan=3, padx=10, pady=10)
+        
+        self.update_input_label_and_browse()
+        self.job = None
+        self._ui_lock = threading.Lock()
+        self._pending_log_lines = deque(maxlen=LOG_MAX_LINES)
+        self._pending_ui_calls = deque()
+        self._reset_progress_state()
+        self._rendered_progress = None
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(GUI_REFRESH_INTERVAL_MS, self._pump_ui_events)
+
+    def on_close(self):
+        """Cancels an in-flight async run before closing the window."""
+        if self.job: self.job.cancel()
+        self.destroy()
+
+    def update_mc_version_display(self, version_str):
+        """Updates the MC version entry if 'best' was used."""
+        self._queue_ui_call(self._show_mc_version, version_str)
+
+    def _show_mc_version(self, version_str):
+        if self.mc_version_entry.get().lower() == "best":
+            current_text = self.mc_version_entry.get()
+            if "Best:" not in current_text: 
+                self.mc_version_entry.delete(0, tk.END)
+                self.mc_version_entry.insert(0, f"Best: {version_str}")
+
+
+    def update_input_label_and_browse(self, _=None):
+        """Updates the input label and browse button state based on mode."""
+        mode = self.mode_var.get()
+        if mode == "HTML Modlist":
+            self.input_path_label.configure(text="Modlist HTML File:")
+            self.browse_button.configure(state="normal", text="Browse File")
+        elif mode == "Single Mod + Dependencies":
+            self.input_path_label.configure(text="Mod URL (CurseForge or Modrinth):")
+            self.browse_button.configure(state="disabled", text="Browse")
+        elif mode == "Modrinth Collection":
+            self.input_path_label.configure(text="Modrinth Collection URL:")
+            self.browse_button.configure(state="disabled", text="Browse")
+        elif mode == "Flexible Source Download":
+            self.input_path_label.configure(text="Project Name or URL (CF/MR):")
+            self.browse_button.configure(state="disabled", text="Browse")
+        elif mode == "Sync from Lockfile":
+            self.input_path_label.configure(text="Lockfile (blank = download folder's):")
+            self.browse_button.configure(state="normal", text="Browse File")
+        elif mode == "Batch Manifest":
+            self.input_path_label.configure(text="Batch Manifest (JSON):")
+            self.browse_button.configure(state="normal", text="Browse File")
+
+
+    def browse_file_or_folder(self):
+        """Handles file browsing for HTML modlist mode."""
+        mode = self.mode_var.get()
+        path = ""
+        if mode == "HTML Modlist":
+            path = filedialog.askopenfilename(title="Select Modlist HTML File", filetypes=(("HTML files", "*.html"), ("All files", "*.*")))
+        elif mode == "Sync from Lockfile":
+            path = filedialog.askopenfilename(title="Select Lockfile", filetypes=(("Lockfiles", "*.lock.json"), ("All files", "*.*")))
+        elif mode == "Batch Manifest":
+            path = filedialog.askopenfilename(title="Select Batch Manifest", filetypes=(("JSON files", "*.json"), ("All files", "*.*")))
+        if path:
+            self.input_path_entry.delete(0, tk.END)
+            self.input_path_entry.insert(0, path)
+            
+    def select_download_dir(self):
+        """Opens a dialog to select the download directory."""
+        folder_path = filedialog.askdirectory(title="Select Folder to Download Mods Into")
+        if folder_path:
+            self.download_folder_entry.delete(0, tk.END)
+            self.download_folder_entry.insert(0, folder_path)
+
+    def log_message(self, message):
+        """Queues a message for the log textbox; safe to call from any thread. Only the newest LOG_MAX_LINES are kept."""
+        with self._ui_lock: self._pending_log_lines.append(str(message))
+
+    def _reset_progress_state(self):
+        self._total_steps = 0
+        self._current_step = 0
+        self._progress_value = None
+        self._busy_count = 0
+
+    def set_progress_total_steps(self, total_steps):
+        """Sets the total steps for the progress bar."""
+        with self._ui_lock:
+            self._total_steps = total_steps
+            self._current_step = 0
+            self._progress_value = None
+
+    def update_progress_determinate_step(self, stop_indeterminate=False):
+        """Counts one finished step (and, with stop_indeterminate, one finished busy task)."""
+        with self._ui_lock:
+            self._current_step += 1
+            self._progress_value = None
+            if stop_indeterminate: self._busy_count = max(self._busy_count - 1, 0)
+
+    def update_progress_indeterminate(self):
+        """Counts one busy task; the bar animates only while tasks are busy and no step total is known."""
+        with self._ui_lock: self._busy_count += 1
+
+    def _queue_ui_call(self, fn, *args):
+        """Queues fn(*args) to run on the Tk thread at the next refresh; safe to call from any thread."""
+        with self._ui_lock: self._pending_ui_calls.append((fn, args))
+
+    def _pump_ui_events(self):
+        self._flush_ui_events()
+        self.after(GUI_REFRESH_INTERVAL_MS, self._pump_ui_events)
+
+    def _flush_ui_events(self):
+        """Applies queued log lines in one insert, renders the aggregated progress state, then runs queued widget calls.
+        Runs on the Tk thread."""
+        with self._ui_lock:
+            lines = list(self._pending_log_lines)
+            self._pending_log_lines.clear()
+            calls = list(self._pending_ui_calls)
+            self._pending_ui_calls.clear()
+            if self._progress_value is not None: progress = ("determinate", self._progress_value)
+            elif self._total_steps > 0: progress = ("determinate", min(self._current_step / self._total_steps, 1.0))
+            elif self._busy_count > 0: progress = ("indeterminate", None)
+            else: progress = self._rendered_progress
+        if lines:
+            self.log_textbox.configure(state="normal")
+            self.log_textbox.insert(tk.END, "\n".join(lines) + "\n")
+            excess_lines = int(self.log_textbox.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+            if excess_lines > 0: self.log_textbox.delete("1.0", f"{excess_lines + 1}.0")
+            self.log_textbox.see(tk.END)
+            self.log_textbox.configure(state="disabled")
+        if progress and progress != self._rendered_progress:
+            mode, value = progress
+            if mode == "indeterminate":
+                self.progress_bar.configure(mode="indeterminate")
+                self.progress_bar.start()
+            else:
+                self.stop_progress_indeterminate()
+                self.progress_bar.set(value)
+            self._rendered_progress = progress
+        for fn, args in calls: fn(*args)
+
+    def stop_progress_indeterminate(self):
+        """Stops indeterminate progress and sets mode to determinate."""
+        if self.progress_bar.cget("mode") == "indeterminate":
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+
+    def set_progress(self, value):
+        """Sets the progress bar to a specific value (0.0 to 1.0)."""
+        with self._ui_lock: self._progress_value = value
+
+    def prompt_for_user_choice(self, prompt_text, choices_map):
+        """Shows the choice input UI."""
+        def _show():
+            self.choice_prompt_label.configure(text=prompt_text)
+            self.valid_choices_for_prompt = [c[0] for c in choices_map] 
+            self.choice_input_entry.delete(0, tk.END)
+            self.choice_frame.grid()
+            self.choice_input_entry.focus()
+        self._queue_ui_call(_show)
+
+    def submit_user_choice(self):
+        """Handles submission of user's choice from the special input field."""
+        choice = self.choice_input_entry.get().strip()
+        if choice in self.valid_choices_for_prompt:
+            self.user_choice_value = choice
+            self.log_message(f"User chose option: {choice}")
+        else:
+            self.user_choice_value = None 
+            self.log_message(f"Invalid choice '{choice}'. Expected one of {self.valid_choices_for_prompt}.")
+        
+        self.choice_frame.grid_remove()
+        self.user_choice_event.set()
+
+
+    def start_processing_thread(self):
+        """Starts the backend processing in a new thread after validating inputs."""
+        input_path_or_name = self.input_path_entry.get().strip()
+        job = backend.JobContext(
+            download_folder=self.download_folder_entry.get().strip(),
+            mc_version_input=self.mc_version_entry.get().strip(),
+            loader=self.loader_var.get(),
+            offline=self.offline_var.get(),
+            progress=self,
+        )
+        current_mode = self.mode_var.get()
+
+        if not input_path_or_name and current_mode != "Sync from Lockfile":
+            messagebox.showerror("Input Error", "Input (Path/URL/Name) is required.")
+            return
+        if not job.download_folder:
+            messagebox.showerror("Input Error", "Download folder is required.")
+            return
+        if not job.mc_version_input and current_mode not in ("Sync from Lockfile", "Batch Manifest"):
+            messagebox.showerror("Input Error", "Minecraft version is required.")
+            return
+        if current_mode == "Flexible Source Download" and job.mc_version_input.lower() == "best":
+            messagebox.showerror("Input Error", "'best' Minecraft version is not supported for 'Flexible Source Download' mode. Please specify a version.")
+            return
+        self.job = job
+
+        self.log_textbox.configure(state="normal")
+        self.log_textbox.delete("1.0", tk.END)
+        self.log_textbox.configure(state="disabled")
+        with self._ui_lock:
+            self._pending_log_lines.clear()
+            self._reset_progress_state()
+        self._rendered_progress = None
+        self.log_message("Starting processing...")
+        self.log_message(f"Mode: {current_mode}")
+        self.log_message(f"MC Version Input: {job.mc_version_input}")
+        self.log_message(f"Loader: {job.loader}")
+        self.log_message(f"Download Folder: {job.download_folder}")
+        if job.offline: self.log_message("Offline mode: serving API responses from cache only.")
+
+        self.start_button.configure(state="disabled", text="Processing...")
+        self.progress_bar.set(0)
+        
+        def threaded_task():
+            try:
+                backend.run_job_backend(job, current_mode, input_path_or_name)
+                self.log_message("Processing finished.")
+            except Exception as e:
+                self.log_message(f"An critical error occurred: {e}")
+                import traceback
+                self.log_message(traceback.format_exc())
+            finally:
+                self._queue_ui_call(self.processing_finished)
+
+        thread = threading.Thread(target=threaded_task, daemon=True)
+        thread.start()
+
+    def processing_finished(self):
+        """Called when backend processing is complete to update GUI."""
+        self._flush_ui_events()
+        with self._ui_lock: self._reset_progress_state()
+        self.start_button.configure(state="normal", text="Start Processing")
+        self.progress_bar.set(1)
+        self.stop_progress_indeterminate()
+        self.choice_frame.grid_remove() 
+
+        missed_items = self.job.missed_items if self.job else []
+        if missed_items:
+            summary_title = "Download Summary - Missed/Skipped Items"
+            summary_body = "Warning: Some items had issues.\nCheck manually:\n\n"
+            
+            for item in backend.get_unique_missed_items_backend(missed_items):
+                summary_body += f"- Name/ID: {item.get('name', 'N/A')}\n  Reason: {item.get('reason', 'N/A')}\n  Source: {item.get('url', 'N/A')}\n\n"
+            
+            summary_window = ctk.CTkToplevel(self)
+            summary_window.title(summary_title)
+            summary_window.geometry("500x400")
+            
+            summary_textbox = ctk.CTkTextbox(summary_window, wrap="word", height=350, width=480)
+            summary_textbox.pack(padx=10, pady=10, fill="both", expand=True)
+            summary_textbox.insert("1.0", summary_body)
+            summary_textbox.configure(state="disabled")
+            
+            close_button = ctk.CTkButton(summary_window, text="Close", command=summary_window.destroy)
+            close_button.pack(pady=5)
+            summary_window.grab_set()
+        else:
+            self.log_message("All items processed successfully or already existed.")
+            messagebox.showinfo("Success", "All items processed successfully or already existed.")
+        self.progress_bar.set(0)
+
+
+def run_gui():
+    """Creates the window and runs the Tk main loop. Each run passes the window to its JobContext as the progress/log sink."""
+    if not backend.API_KEY or backend.API_KEY.startswith("$2a$10$8L"):
+        print("WARNING: API_KEY might be a placeholder. GUI will launch but API calls may fail.")
+    App().mainloop()
+
+
+if __name__ == "__main__":
+    run_gui()
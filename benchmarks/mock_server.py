@@ -0,0 +1,310 @@
+"""Local stand-in for the CurseForge and Modrinth APIs, used by the offline benchmarks.
+
+Serves a deterministic synthetic pack of N projects (CF mods, Modrinth projects, a collection page and jar downloads),
+with configurable latency, a server-side rate limit and jar size. Responses recorded from the real APIs can be replayed
+on top of it with --recording (JSON lines: {"method", "path", "query"?, "status"?, "body"}; "query" omitted matches any).
+
+    python benchmarks/mock_server.py --projects 250 --latency-ms 30 --rate-limit 50
+"""
+import argparse
+import functools
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+
+CF_MOD_ID_BASE = 100000
+CF_FILE_ID_BASE = 10000000
+GAME_VERSIONS = ("1.20.1", "1.19.2", "1.18.2")
+LOADERS = (("Forge", 1), ("Fabric", 4))
+CF_PAGE_SIZE_LIMIT = 50
+LONG_HISTORY_EVERY = 10
+LONG_HISTORY_RELEASES = 10
+COLLECTION_PATH_RE = re.compile(r"^/modrinth\.com/collection/[^/]+$")
+
+
+class SyntheticPack:
+    """Deterministic pack of `size` projects. Project i requires projects 2i+1 and 2i+2, so dependency trees stay shallow.
+
+    Every LONG_HISTORY_EVERY-th CF project also has LONG_HISTORY_RELEASES - 1 older releases per version and loader, so its
+    file history spans more than one CF_PAGE_SIZE_LIMIT page."""
+    def __init__(self, size, jar_bytes=64 * 1024, base_url=""):
+        self.size = size
+        self.jar_bytes = jar_bytes
+        self.base_url = base_url
+
+    def dependency_indexes(self, i):
+        return [d for d in (2 * i + 1, 2 * i + 2) if d < self.size]
+
+    def cf_release_count(self, i):
+        return LONG_HISTORY_RELEASES if i % LONG_HISTORY_EVERY == 0 else 1
+
+    def cf_file_id(self, i, version_index, loader_index, release=0):
+        return CF_FILE_ID_BASE + i * 10000 + release * 100 + version_index * 10 + loader_index
+
+    def split_cf_file_id(self, file_id):
+        """Returns (project index, version index, loader index, release) for a CF file ID, or None. Release 0 is the newest."""
+        i, rest = divmod(file_id - CF_FILE_ID_BASE, 10000)
+        release, rest = divmod(rest, 100)
+        if not 0 <= i < self.size or release >= self.cf_release_count(i) or rest // 10 >= len(GAME_VERSIONS) or rest % 10 >= len(LOADERS): return None
+        return i, rest // 10, rest % 10, release
+
+    @functools.lru_cache(maxsize=None)
+    def jar(self, file_id):
+        seed = hashlib.sha256(str(file_id).encode()).digest()
+        return (seed * (self.jar_bytes // len(seed) + 1))[:self.jar_bytes]
+
+    @functools.lru_cache(maxsize=None)
+    def jar_hashes(self, file_id):
+        body = self.jar(file_id)
+        return hashlib.sha1(body).hexdigest(), hashlib.sha512(body).hexdigest()
+
+    def cf_mod(self, i):
+        return {
+            "id": CF_MOD_ID_BASE + i, "slug": f"bench-mod-{i}", "name": f"Bench Mod {i}", "classId": 6,
+            "links": {"websiteUrl": f"https://www.curseforge.com/minecraft/mc-mods/bench-mod-{i}"},
+            "latestFilesIndexes": [
+                {"gameVersion": gv, "fileId": self.cf_file_id(i, v, l), "filename": f"bench-mod-{i}-{gv}-{name.lower()}.jar", "modLoader": loader_id}
+                for v, gv in enumerate(GAME_VERSIONS) for l, (name, loader_id) in enumerate(LOADERS)
+            ],
+        }
+
+    def cf_file(self, i, v, l, release=0):
+        file_id, gv, loader = self.cf_file_id(i, v, l, release), GAME_VERSIONS[v], LOADERS[l][0]
+        suffix = f"-r{release}" if release else ""
+        return {
+            "id": file_id, "modId": CF_MOD_ID_BASE + i, "fileName": f"bench-mod-{i}-{gv}-{loader.lower()}{suffix}.jar",
+            "fileLength": self.jar_bytes, "fileDate": f"{2024 - release}-{12 - v:02d}-01T00:00:00Z", "gameVersions": [gv, loader],
+            "modLoaders": [loader], "downloadUrl": f"{self.base_url}/dl/{file_id}",
+            "hashes": [{"value": self.jar_hashes(file_id)[0], "algo": 1}],
+            "dependencies": [{"modId": CF_MOD_ID_BASE + d, "relationType": 3} for d in self.dependency_indexes(i)],
+        }
+
+    def cf_files(self, i):
+        return [self.cf_file(i, v, l, r) for r in range(self.cf_release_count(i)) for v in range(len(GAME_VERSIONS)) for l in range(len(LOADERS))]
+
+    def modrinth_project(self, i):
+        return {
+            "id": f"mr{i:06d}", "slug": f"bench-mr-{i}", "title": f"Bench Mod {i}" if i % 2 else f"Modrinth Only {i}",
+            "project_type": "mod", "versions": [f"mv{i:06d}-{v}-{l}" for v in range(len(GAME_VERSIONS)) for l in range(len(LOADERS))],
+        }
+
+    def modrinth_version(self, i, v, l):
+        file_id = self.cf_file_id(i, v, l)
+        sha1, sha512 = self.jar_hashes(file_id)
+        return {
+            "id": f"mv{i:06d}-{v}-{l}", "project_id": f"mr{i:06d}", "game_versions": [GAME_VERSIONS[v]],
+            "loaders": [LOADERS[l][0].lower()], "date_published": f"2024-{12 - v:02d}-01T00:00:00Z",
+            "dependencies": [{"project_id": f"mr{d:06d}", "version_id": None, "dependency_type": "required"} for d in self.dependency_indexes(i)],
+            "files": [{"filename": f"bench-mr-{i}-{GAME_VERSIONS[v]}-{LOADERS[l][0].lower()}.jar", "url": f"{self.base_url}/dl/{file_id}",
+                       "size": self.jar_bytes, "primary": True, "hashes": {"sha1": sha1, "sha512": sha512}}],
+        }
+
+    def modrinth_index(self, id_or_slug):
+        """Returns the project index for a Modrinth project ID or slug, or None."""
+        match = re.match(r"^(?:mr(\d+)|bench-mr-(\d+))$", id_or_slug)
+        i = int(match.group(1) or match.group(2)) if match else -1
+        return i if 0 <= i < self.size else None
+
+    def modrinth_version_by_id(self, version_id):
+        match = re.match(r"^mv(\d+)-(\d+)-(\d+)$", version_id)
+        if not match: return None
+        i, v, l = map(int, match.groups())
+        return self.modrinth_version(i, v, l) if i < self.size and v < len(GAME_VERSIONS) and l < len(LOADERS) else None
+
+    def collection_html(self):
+        cards = "".join(f'<div class="project-card"><a href="/mod/bench-mr-{i}">Project {i}</a></div>\n' for i in range(self.size))
+        return f"<html><body><div class=\"collection\">{cards}</div></body></html>"
+
+    def modlist_html(self):
+        rows = "".join(f'<li><a href="https://www.curseforge.com/minecraft/mc-mods/bench-mod-{i}">Bench Mod {i}</a></li>\n' for i in range(self.size))
+        return f"<html><body><ul>{rows}</ul></body></html>"
+
+
+class BenchHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class MockServer:
+    """Threaded HTTP server for a SyntheticPack. `counts` tallies requests per endpoint; reset it between measurements."""
+    def __init__(self, pack, latency_ms=0.0, jitter_ms=0.0, rate_limit=0.0, recording=None, host="127.0.0.1", port=0):
+        self.pack = pack
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.recorded = load_recording(recording) if recording else []
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._tokens = rate_limit
+        self._refilled_at = time.monotonic()
+        self.httpd = BenchHTTPServer((host, port), make_handler(self))
+        self.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        pack.base_url = self.base_url
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, name="mock-server", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def count(self, key):
+        with self._lock: self.counts[key] += 1
+
+    def take_token(self):
+        """Server-side token bucket (rate_limit requests/s, one second of burst). Returns False when the client should get a 429."""
+        if self.rate_limit <= 0: return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1: return False
+            self._tokens -= 1
+            return True
+
+    def find_recorded(self, method, path, query):
+        for entry in self.recorded:
+            if entry["method"] == method and entry["path"] == path and entry.get("query", query) == query: return entry
+        return None
+
+    def route(self, method, path, query, body):
+        """Returns (status, JSON-able body or bytes) for an API request."""
+        pack = self.pack
+        if path == "/v1/mods/search":
+            if "slug" in query:
+                return 200, {"data": [pack.cf_mod(i) for i in range(pack.size) if f"bench-mod-{i}" == query["slug"].lower()][:1]}
+            name = query.get("searchFilter", "").lower()
+            match = re.match(r"^bench mod (\d+)$", name)
+            hits = [pack.cf_mod(int(match.group(1)))] if match and int(match.group(1)) < pack.size else []
+            return 200, {"data": hits, "pagination": {"index": 0, "pageSize": len(hits), "resultCount": len(hits), "totalCount": len(hits)}}
+        if path == "/v1/mods" and method == "POST":
+            return 200, {"data": [pack.cf_mod(m - CF_MOD_ID_BASE) for m in body.get("modIds", []) if 0 <= m - CF_MOD_ID_BASE < pack.size]}
+        if path == "/v1/mods/files" and method == "POST":
+            return 200, {"data": [pack.cf_file(*parts) for f in body.get("fileIds", []) if (parts := pack.split_cf_file_id(f))]}
+        match = re.match(r"^/v1/mods/(\d+)/files$", path)
+        if match:
+            i = int(match.group(1)) - CF_MOD_ID_BASE
+            if not 0 <= i < pack.size: return 404, {"error": "not found"}
+            files = pack.cf_files(i)
+            if "gameVersion" in query: files = [f for f in files if query["gameVersion"] in f["gameVersions"]]
+            if query.get("modLoaderType"): files = [f for f in files if any(name == f["modLoaders"][0] for name, loader_id in LOADERS if str(loader_id) == query["modLoaderType"])]
+            index, page_size = int(query.get("index", 0)), min(int(query.get("pageSize", CF_PAGE_SIZE_LIMIT)), CF_PAGE_SIZE_LIMIT)
+            page = files[index:index + page_size]
+            return 200, {"data": page, "pagination": {"index": index, "pageSize": page_size, "resultCount": len(page), "totalCount": len(files)}}
+        match = re.match(r"^/v2/project/([^/]+)/version$", path)
+        if match:
+            i = pack.modrinth_index(match.group(1))
+            if i is None: return 404, {"error": "not found"}
+            return 200, [pack.modrinth_version(i, v, l) for v in range(len(GAME_VERSIONS)) for l in range(len(LOADERS))]
+        match = re.match(r"^/v2/project/([^/]+)$", path)
+        if match:
+            i = pack.modrinth_index(match.group(1))
+            return (200, pack.modrinth_project(i)) if i is not None else (404, {"error": "not found"})
+        if path == "/v2/projects":
+            indexes = [pack.modrinth_index(x) for x in json.loads(query.get("ids", "[]"))]
+            return 200, [pack.modrinth_project(i) for i in indexes if i is not None]
+        if path == "/v2/versions":
+            return 200, [v for x in json.loads(query.get("ids", "[]")) if (v := pack.modrinth_version_by_id(x))]
+        if path == "/v2/search":
+            name = query.get("query", "").lower()
+            hits = [dict(pack.modrinth_project(i), project_id=f"mr{i:06d}") for i in range(pack.size) if pack.modrinth_project(i)["title"].lower() == name]
+            return 200, {"hits": hits[:int(query.get("limit", 10))]}
+        if path == "/v2/version_files/update" and method == "POST":
+            return 200, {}
+        if COLLECTION_PATH_RE.match(path):
+            return 200, pack.collection_html().encode("utf-8")
+        return 404, {"error": "not found"}
+
+
+def load_recording(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args): pass
+
+        def send_body(self, status, payload, content_type=None, extra_headers=()):
+            body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type or ("text/html" if isinstance(payload, bytes) else "application/json"))
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in extra_headers: self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def handle_request(self, method):
+            url = urlsplit(self.path)
+            query = dict(parse_qsl(url.query))
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            endpoint = re.sub(r"\d+", "N", url.path) if not url.path.startswith("/v2/project/") else re.sub(r"/project/[^/]+", "/project/ID", url.path)
+            server.count(f"{method} {endpoint}")
+            if server.latency_ms or server.jitter_ms:
+                time.sleep((server.latency_ms + random.uniform(0, server.jitter_ms)) / 1000)
+            if not server.take_token():
+                server.count("429")
+                return self.send_body(429, {"error": "rate limited"}, extra_headers=[("Retry-After", "1")])
+            match = re.match(r"^/dl/(\d+)$", url.path)
+            if match: return self.send_jar(int(match.group(1)))
+            recorded = server.find_recorded(method, url.path, query)
+            if recorded:
+                payload = recorded.get("body")
+                return self.send_body(recorded.get("status", 200), payload.encode("utf-8") if isinstance(payload, str) else payload)
+            status, payload = server.route(method, url.path, query, body)
+            self.send_body(status, payload)
+
+        def send_jar(self, file_id):
+            if not server.pack.split_cf_file_id(file_id): return self.send_body(404, {"error": "not found"})
+            jar = server.pack.jar(file_id)
+            range_match = re.match(r"^bytes=(\d+)-$", self.headers.get("Range") or "")
+            start = int(range_match.group(1)) if range_match else 0
+            if start >= len(jar) and range_match:
+                return self.send_body(416, {"error": "range not satisfiable"}, extra_headers=[("Content-Range", f"bytes */{len(jar)}")])
+            headers = [("Content-Range", f"bytes {start}-{len(jar) - 1}/{len(jar)}")] if range_match else []
+            self.send_body(206 if range_match else 200, jar[start:], "application/java-archive", headers)
+
+        def do_GET(self): self.handle_request("GET")
+
+        def do_POST(self): self.handle_request("POST")
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a synthetic CurseForge/Modrinth stand-in for offline benchmarking.")
+    parser.add_argument("--projects", type=int, default=250, help="synthetic pack size")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="extra random delay per request, up to this much")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests per second before answering 429 (0 = unlimited)")
+    parser.add_argument("--jar-kb", type=int, default=64, help="size of every synthetic jar")
+    parser.add_argument("--recording", help="JSON lines of recorded responses to replay ahead of the synthetic ones")
+    parser.add_argument("--write-modlist", metavar="PATH", help="write an HTML modlist for the pack to PATH and exit")
+    args = parser.parse_args(argv)
+    pack = SyntheticPack(args.projects, args.jar_kb * 1024)
+    if args.write_modlist:
+        with open(args.write_modlist, "w", encoding="utf-8") as f: f.write(pack.modlist_html())
+        return 0
+    server = MockServer(pack, args.latency_ms, args.jitter_ms, args.rate_limit, args.recording, port=args.port).start()
+    print(f"Serving {args.projects} synthetic projects at {server.base_url} (CF API: {server.base_url}/v1, Modrinth API: {server.base_url}/v2)")
+    try:
+        while True: time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+"""Offline benchmarks: runs ModEase's four modes against the local mock server on synthetic packs of several sizes.
+
+Every case runs in a fresh subprocess with an empty response cache, file history and artifact store, a throwaway home
+directory and no MODEASE_* variables (so the machine's ModEase config never applies), and reports wall time, the number
+of requests the mock server saw (and how many it rate limited), missed items and the worker's peak RSS.
+
+    python benchmarks/run_benchmarks.py --sizes 50 250 1000 --latency-ms 20 --json results.json
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from mock_server import SyntheticPack, MockServer
+
+DEFAULT_SIZES = (50, 250, 1000)
+DEFAULT_MODES = ("html", "single", "collection", "flexible")
+
+
+def get_peak_rss_kb():
+    """Peak resident set size of this process in KiB, or None where it can't be measured (Windows).
+
+    On Linux, VmHWM is read because ru_maxrss also counts the memory of the parent the worker was forked from.
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"): return int(line.split()[1])
+    except OSError: pass
+    try: import resource
+    except ImportError: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_worker(args):
+    """Runs one mode in this process against the mock server and prints a JSON result line."""
+    sys.path.insert(0, REPO_DIR)
+    import ModEase
+    work_dir = tempfile.mkdtemp(prefix="modease-bench-")
+    ModEase.BASE_API_URL = args.base_url + "/v1"
+    ModEase.MODRINTH_API_BASE_URL = args.base_url + "/v2"
+    ModEase.response_cache = ModEase.ResponseCache(os.path.join(work_dir, "cache.sqlite3"))
+    ModEase.file_history_store = ModEase.FileHistoryStore(os.path.join(work_dir, "file_history.sqlite3"))
+    ModEase.ARTIFACT_STORE_DIR = os.path.join(work_dir, "store")
+    ModEase.USE_ASYNC_ENGINE = args.async_engine
+    try:
+        start = time.perf_counter()
+        missed = ModEase.run_headless_backend(args.mode, args.input, os.path.join(work_dir, "out"), args.mc_version, args.loader,
+                                              preferred_source="curseforge", quiet=True)
+        wall = time.perf_counter() - start
+        jars = [f for f in os.listdir(os.path.join(work_dir, "out")) if f.endswith(".jar")]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print(json.dumps({"wall_seconds": round(wall, 3), "jars": len(jars), "missed": len(missed), "peak_rss_kb": get_peak_rss_kb()}))
+
+
+def get_mode_input(mode, pack, work_dir):
+    if mode == "html":
+        path = os.path.join(work_dir, "modlist.html")
+        with open(path, "w", encoding="utf-8") as f: f.write(pack.modlist_html())
+        return path
+    if mode == "single": return "https://www.curseforge.com/minecraft/mc-mods/bench-mod-0"
+    if mode == "collection": return f"{pack.base_url}/modrinth.com/collection/bench"
+    return "Bench Mod 1"
+
+
+def run_case(mode, size, args):
+    """Serves a fresh pack of `size` projects and measures one mode on it in a subprocess."""
+    pack = SyntheticPack(size, args.jar_kb * 1024)
+    server = MockServer(pack, args.latency_ms, args.jitter_ms, args.rate_limit, args.recording).start()
+    try:
+        with tempfile.TemporaryDirectory(prefix="modease-bench-input-") as work_dir:
+            env = {key: value for key, value in os.environ.items() if not key.startswith("MODEASE_")}
+            env["HOME"] = env["USERPROFILE"] = os.path.join(work_dir, "home")
+            mc_version = "1.20.1" if mode == "flexible" and args.mc_version == "best" else args.mc_version
+            command = [sys.executable, os.path.abspath(__file__), "--worker", "--base-url", server.base_url, "--mode", mode,
+                       "--input", get_mode_input(mode, pack, work_dir), "--mc-version", mc_version, "--loader", args.loader]
+            if args.async_engine: command.append("--async-engine")
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout, env=env)
+        if completed.returncode != 0:
+            return {"mode": mode, "projects": size, "error": (completed.stderr or completed.stdout).strip().splitlines()[-1:]}
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        requests_seen = sum(n for key, n in server.counts.items() if key != "429" and not key.startswith("GET /dl/"))
+        downloads_seen = sum(n for key, n in server.counts.items() if key.startswith("GET /dl/"))
+        return dict(result, mode=mode, projects=size, api_requests=requests_seen, download_requests=downloads_seen, rate_limited=server.counts["429"])
+    finally:
+        server.stop()
+
+
+def format_row(result):
+    if "error" in result: return f"{result['mode']:<11} {result['projects']:>6}  ERROR: {' '.join(result['error'])}"
+    rss = f"{result['peak_rss_kb'] / 1024:.1f}" if result["peak_rss_kb"] else "n/a"
+    return (f"{result['mode']:<11} {result['projects']:>6} {result['wall_seconds']:>9.2f} {result['api_requests']:>9} "
+            f"{result['download_requests']:>9} {result['rate_limited']:>6} {result['jars']:>6} {result['missed']:>7} {rss:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ModEase's modes offline against a synthetic CurseForge/Modrinth stand-in.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="synthetic pack sizes")
+    parser.add_argument("--modes", nargs="+", default=list(DEFAULT_MODES), choices=DEFAULT_MODES)
+    parser.add_argument("--mc-version", default="1.20.1", help="version to resolve for, or 'best' (flexible always uses 1.20.1)")
+    parser.add_argument("--loader", default="forge")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="mock server requests per second before 429s (0 = unlimited)")
+    parser.add_argument("--jar-kb", type=int, default=64)
+    parser.add_argument("--recording", help="recorded responses for the mock server to replay (see mock_server.py)")
+    parser.add_argument("--async-engine", action="store_true", help="use ModEase's asyncio engine where supported")
+    parser.add_argument("--timeout", type=float, default=1800, help="seconds before a case is abandoned")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as a JSON list")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        run_worker(args)
+        return 0
+
+    print(f"{'mode':<11} {'projects':>6} {'wall (s)':>9} {'api reqs':>9} {'downloads':>9} {'429s':>6} {'jars':>6} {'missed':>7} {'peak MiB':>9}")
+    results = []
+    for size in args.sizes:
+        for mode in args.modes:
+            result = run_case(mode, size, args)
+            results.append(result)
+            print(format_row(result), flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(results, f, indent=2)
+    return 1 if any("error" in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+@pytest.fixture
+def job(tmp_path):
+    job = backend.JobContext(download_folder=str(tmp_path), mc_version_input="best", loader="forge", quiet=True)
+    token = backend.current_job_var.set(job)
+    yield job
+    backend.current_job_var.reset(token)
+
+
+def test_best_version_is_decided_once_it_cannot_be_overtaken():
+    assert backend.is_best_version_decided_backend({"1.20.1": 0b111, "1.19.2": 0b1}, 2)
+    assert backend.is_best_version_decided_backend({"1.20.1": 0b111, "1.19.2": 0b11}, 1)
+    assert not backend.is_best_version_decided_backend({"1.20.1": 0b111, "1.21": 0b11}, 1)
+    assert backend.get_best_version_leader_backend({"1.19.2": 0b11, "1.20.1": 0b101}) == ("1.20.1", 2)
+
+
+def test_early_exit_stops_running_analyses(job, monkeypatch):
+    released, finished, outcomes = threading.Event(), threading.Event(), []
+    slow_projects = 2
+
+    def get_versions(project):
+        if not project["slow"]: return {"1.20.1"}
+        released.wait(5)
+        backend.current_job().add_missed_item({"name": project["name"], "url": "", "reason": "late"})
+        try: backend.make_api_request_backend("http://127.0.0.1:9/never")
+        except backend.WorkAbandoned: outcomes.append("abandoned")
+        if len(outcomes) == slow_projects: finished.set()
+        return {"1.19.2"}
+
+    monkeypatch.setattr(backend, "RESOLVE_WORKERS", 8)
+    monkeypatch.setattr(backend, "get_project_mc_versions_backend", get_versions)
+    projects = [{"name": f"slow {i}", "slow": True} for i in range(slow_projects)] + [{"name": f"fast {i}", "slow": False} for i in range(4)]
+
+    assert backend.determine_and_set_best_mc_version_backend(projects)
+    released.set()
+    assert finished.wait(5)
+    assert job.mc_version == "1.20.1"
+    assert outcomes == ["abandoned"] * slow_projects
+    assert job.missed_items == []
@@ -0,0 +1,79 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+PAGE = backend.CF_FILES_PAGE_SIZE
+
+
+@pytest.fixture
+def job(tmp_path):
+    job = backend.JobContext(download_folder=str(tmp_path), mc_version_input="1.20.1", loader="forge", quiet=True)
+    token = backend.current_job_var.set(job)
+    yield job
+    backend.current_job_var.reset(token)
+
+
+def make_files(count, start=0):
+    """CF files newest first, as /mods/{id}/files pages them: higher id means newer."""
+    return [{"id": i, "fileDate": f"2024-01-01T00:00:{i:05d}"} for i in reversed(range(start, start + count))]
+
+
+def make_stored(files):
+    return {"files": files, "total_count": len(files), "watermark": max(backend.get_cf_file_sort_key_backend(f) for f in files)}
+
+
+def run_plan(stored, api_files, offline=False):
+    """Drives the paging plan against an in-memory file list. Returns (result, the page indexes requested per step)."""
+    steps = backend.iter_cf_file_history_steps_backend(1, stored)
+    requested = []
+    try:
+        page_indexes = next(steps)
+        while True:
+            requested.append(list(page_indexes))
+            page_indexes = steps.send([(None, None) if offline else (api_files[i:i + PAGE], len(api_files)) for i in page_indexes])
+    except StopIteration as done:
+        return done.value, requested
+
+
+def test_merge_replaces_by_id_and_reports_changes():
+    stored = make_files(3)
+    files, complete, changed = backend.merge_cf_file_history_backend(stored, [dict(stored[0], fileName="renamed.jar")], 3)
+    assert (len(files), complete, changed) == (3, True, True)
+    assert backend.merge_cf_file_history_backend(stored, stored[:1], 3)[1:] == (True, False)
+    assert backend.merge_cf_file_history_backend(stored, [], 4)[1] is False
+
+
+def test_first_fetch_requests_every_remaining_page_in_one_step(job):
+    api_files = make_files(PAGE * 2 + 5)
+    (files, complete, save_total_count), requested = run_plan(None, api_files)
+    assert requested == [[0], [PAGE, PAGE * 2]]
+    assert (len(files), complete, save_total_count) == (len(api_files), True, len(api_files))
+
+
+def test_refresh_stops_at_the_watermark(job):
+    api_files = make_files(PAGE * 3)
+    stored = make_stored(api_files[PAGE + 3:])
+    (files, complete, save_total_count), requested = run_plan(stored, api_files)
+    assert requested == [[0], [PAGE]]
+    assert (len(files), complete, save_total_count) == (len(api_files), True, len(api_files))
+
+
+def test_unchanged_history_is_not_resaved_and_offline_uses_the_store(job):
+    api_files = make_files(PAGE + 1)
+    stored = make_stored(api_files)
+    assert run_plan(stored, api_files) == ((api_files, True, None), [[0]])
+    assert run_plan(stored, api_files, offline=True)[0] == (api_files, True, None)
+    assert run_plan(None, api_files, offline=True)[0] == ([], False, None)
+
+
+def test_removed_files_trigger_a_full_refetch(job):
+    api_files = make_files(PAGE * 2)
+    stored = make_stored(make_files(PAGE * 2 + 1))
+    (files, complete, save_total_count), requested = run_plan(stored, api_files)
+    assert requested == [[0], [PAGE]]
+    assert sorted(f["id"] for f in files) == sorted(f["id"] for f in api_files)
+    assert (complete, save_total_count) == (True, len(api_files))
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+@pytest.fixture
+def job(tmp_path):
+    job = backend.JobContext(download_folder=str(tmp_path), mc_version_input="1.20.1", loader="forge", quiet=True)
+    job.mc_version = "1.20.1"
+    token = backend.current_job_var.set(job)
+    yield job
+    backend.current_job_var.reset(token)
+
+
+def make_project(project_id, indexes):
+    details = {"id": project_id, "latestFilesIndexes": [
+        {"gameVersion": game_version, "fileId": file_id, "modLoader": mod_loader} for game_version, file_id, mod_loader in indexes
+    ]}
+    return {"id_or_slug": project_id, "name": f"P{project_id}", "cf_project_type_name": "Mod", "original_url": "", "details": details}
+
+
+def test_indexed_files_are_matched_and_the_rest_fall_back(job):
+    projects = [
+        make_project(1, [("1.20.1", 10, 1), ("1.20.1", 11, 1), ("1.19.2", 12, 1)]),
+        make_project(2, [("1.20.1", 20, 4)]),
+        make_project(3, [("1.20.1", 30, 1)]),
+    ]
+    chosen = backend.get_indexed_cf_file_ids_backend(projects)
+    assert chosen == {1: 11, 3: 30}
+
+    files_by_id = {11: {"id": 11, "downloadUrl": "https://example.invalid/a.jar", "gameVersions": ["1.20.1"]}}
+    matched, unmatched = backend.match_indexed_cf_files_backend(projects, chosen, files_by_id)
+    assert [(p["id_or_slug"], f["id"]) for p, f in matched] == [(1, 11)]
+    assert [p["id_or_slug"] for p in unmatched] == [2, 3]
+
+
+def test_project_batch_queues_full_batches_and_flushes_the_rest(job, monkeypatch):
+    queued = []
+    monkeypatch.setattr(backend, "queue_cf_projects_batched_backend", lambda batch: queued.append([p["id_or_slug"] for p in batch]) or ["future"])
+    batch = backend.CfProjectBatch(batch_size=2)
+    assert batch.add(make_project(1, [])) == []
+    assert batch.add(make_project(2, [])) == ["future"]
+    assert batch.add(make_project(3, [])) == []
+    assert batch.flush() == ["future"]
+    assert batch.flush() == []
+    assert queued == [[1, 2], [3]]
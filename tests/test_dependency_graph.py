@@ -0,0 +1,78 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+@pytest.fixture
+def job(tmp_path):
+    job = backend.JobContext(download_folder=str(tmp_path), mc_version_input="1.20.1", loader="fabric", quiet=True)
+    token = backend.current_job_var.set(job)
+    yield job
+    backend.current_job_var.reset(token)
+
+
+def make_graph(edges, version_ids=None):
+    graph = backend.DependencyGraph()
+    for key in dict.fromkeys([k for k, _, _ in edges] + [d for _, d, _ in edges]):
+        graph.add_node(key, {"name": key.upper()}, {"versionId": (version_ids or {}).get(key)})
+    for key, dep_key, relation in edges: graph.add_dependency(key, dep_key, relation)
+    return graph
+
+
+def test_topological_order_lists_dependencies_first():
+    graph = make_graph([("a", "b", "required"), ("b", "c", "required"), ("a", "c", "optional")])
+    order = graph.topological_order()
+    assert order.index("c") < order.index("b") < order.index("a")
+    assert graph.find_cycles() == []
+
+
+def test_cycles_are_found_and_only_all_required_ones_count():
+    graph = make_graph([("a", "b", "required"), ("b", "c", "required"), ("c", "a", "required"), ("c", "d", "required"), ("d", "c", "optional")])
+    cycles = graph.find_cycles()
+    assert sorted(len(cycle) for cycle in cycles) == [3, 4]
+    assert graph.find_required_cycles() == [cycle for cycle in cycles if len(cycle) == 4]
+    assert sorted(graph.topological_order()) == ["a", "b", "c", "d"]
+
+
+def test_version_pin_mismatch_is_a_warning_not_a_missed_item(job):
+    graph = make_graph([("a", "b", "required")], version_ids={"b": "v2"})
+    graph.add_dependency("a", "b", "required", pinned_version_id="v1")
+    graph.add_dependency("a", "x", "incompatible")
+    assert graph.find_conflicts() == []
+    assert graph.find_version_pin_mismatches() == ["A pins version v1 of B, but v2 was selected"]
+
+    backend.report_dependency_graph_backend(graph)
+    assert job.missed_items == []
+    assert os.path.isfile(os.path.join(job.download_folder, backend.DEPENDENCY_GRAPH_NAME))
+
+
+def test_selected_incompatible_projects_are_missed_items(job):
+    graph = make_graph([("a", "b", "incompatible")])
+    backend.report_dependency_graph_backend(graph)
+    assert [item["reason"] for item in job.missed_items] == ["A is incompatible with B"]
+
+
+def test_modrinth_seed_accepts_mixed_case_project_id(job, monkeypatch):
+    project = {"id": "AANobbMI", "slug": "sodium", "title": "Sodium", "project_type": "mod", "versions": []}
+    monkeypatch.setattr(backend, "make_api_request_backend", lambda url, params=None, **kwargs: [project])
+    seed = backend.get_dependency_seed_project_backend("https://modrinth.com/mod/AANobbMI")
+    assert seed["id_or_slug"] == "AANobbMI"
+    assert backend.get_dependency_seed_project_backend("https://modrinth.com/mod/Sodium")["name"] == "Sodium"
+    assert job.missed_items == []
+
+
+def test_one_failed_selection_does_not_abort_the_level(job, monkeypatch):
+    def select(id_or_slug, name, *args):
+        if id_or_slug == "bad": raise ValueError("boom")
+        return {"fileName": f"{id_or_slug}.jar"}, None
+    monkeypatch.setattr(backend, "get_modrinth_versions_bulk_backend", lambda version_ids: {})
+    monkeypatch.setattr(backend, "get_latest_compatible_file_info_backend", select)
+    projects = [{"id_or_slug": slug, "name": slug, "source": "modrinth", "original_url": f"https://modrinth.com/mod/{slug}"} for slug in ("good", "bad")]
+
+    selected = backend.select_files_for_dependency_level_backend(projects)
+    assert [(p["id_or_slug"], f["fileName"]) for p, f in selected] == [("good", "good.jar")]
+    assert [item["name"] for item in job.missed_items] == ["bad"]
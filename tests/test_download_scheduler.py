@@ -0,0 +1,44 @@
+import contextvars
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+def test_jobs_run_by_priority_then_submission_order():
+    scheduler = backend.DownloadScheduler(max_workers=1)
+    release, order = threading.Event(), []
+    blocker = scheduler.submit(release.wait, host="h")
+    futures = [scheduler.submit(order.append, name, host=host, priority=priority)
+               for name, host, priority in [("late", "h", 5), ("first", "h", 1), ("second", "other", 1), ("middle", "h", 3)]]
+    release.set()
+    for future in [blocker] + futures: future.result(timeout=5)
+    assert order == ["first", "second", "middle", "late"]
+
+
+def test_per_host_limit_caps_concurrency_without_blocking_other_hosts():
+    scheduler = backend.DownloadScheduler(max_workers=4, per_host_limits={"slow": 1}, default_host_limit=3)
+    lock, running, peak = threading.Lock(), {"slow": 0, "fast": 0}, {"slow": 0, "fast": 0}
+
+    def work(host):
+        with lock:
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+        time.sleep(0.05)
+        with lock: running[host] -= 1
+
+    futures = [scheduler.submit(work, host, host=host) for host in ["slow"] * 3 + ["fast"] * 3]
+    for future in futures: future.result(timeout=5)
+    assert peak == {"slow": 1, "fast": 3}
+
+
+def test_jobs_run_in_the_submitters_context_and_surface_exceptions():
+    var = contextvars.ContextVar("var", default=None)
+    scheduler = backend.DownloadScheduler(max_workers=2)
+    var.set("job-a")
+    assert scheduler.submit(var.get).result(timeout=5) == "job-a"
+    failed = scheduler.submit(lambda: 1 / 0)
+    assert isinstance(failed.exception(timeout=5), ZeroDivisionError)
@@ -0,0 +1,44 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+def make_file(file_id, date, game_versions, loaders):
+    return {"id": file_id, "fileDate": date, "gameVersions": game_versions, "modLoaders": loaders}
+
+
+FILES = [
+    make_file(1, "2023-01-01", ["1.20.1"], ["Forge"]),
+    make_file(2, "2024-01-01", ["1.20.1"], ["Fabric"]),
+    make_file(3, "2024-06-01", ["1.20"], ["Forge"]),
+    make_file(4, "2022-01-01", ["1.20.1"], []),
+]
+
+
+def test_strict_selection_picks_the_newest_exact_match_per_loader():
+    index = backend.build_cf_file_index_backend(FILES)
+    assert [f["id"] for f in index.entries] == [3, 2, 1, 4]
+    assert index.select("1.20.1")["id"] == 2
+    assert index.select("1.20.1", "forge")["id"] == 1
+    assert index.select("1.20.1", "quilt")["id"] == 4
+    assert index.select("1.19.2", "forge") is None
+
+
+def test_loose_selection_accepts_prefix_versions():
+    index = backend.build_cf_file_index_backend(FILES)
+    assert index.select("1.20.1", "forge", loose=True)["id"] == 3
+    assert index.select("1.20.2", "forge") is None
+    assert index.select("1.20.2", "forge", loose=True)["id"] == 3
+
+
+def test_filtered_page_falls_back_from_strict_to_loose(tmp_path):
+    job = backend.JobContext(download_folder=str(tmp_path), mc_version_input="1.20.2", loader="forge", quiet=True)
+    job.mc_version = "1.20.2"
+    token = backend.current_job_var.set(job)
+    try:
+        assert backend.select_cf_file_from_filtered_list_backend(FILES, is_mod=True)["id"] == 3
+        assert backend.select_cf_file_from_filtered_list_backend(FILES + [make_file(5, "2021-01-01", ["1.20.2"], ["Forge"])], is_mod=True)["id"] == 5
+    finally:
+        backend.current_job_var.reset(token)
@@ -0,0 +1,114 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+FAKE_MODE = "Fake Mode"
+
+
+def make_entry(project_id, filename):
+    return {
+        "source": "curseforge", "projectId": project_id, "fileId": project_id * 10, "fileName": filename,
+        "url": f"https://example.invalid/{filename}", "size": 3, "hashes": {}, "projectType": "Mod", "originalUrl": "",
+    }
+
+
+@pytest.fixture
+def job(tmp_path):
+    job = backend.JobContext(download_folder=str(tmp_path), mc_version_input="1.20.1", loader="forge", quiet=True)
+    token = backend.current_job_var.set(job)
+    yield job
+    backend.current_job_var.reset(token)
+
+
+@pytest.fixture
+def fake_mode(monkeypatch):
+    """Registers a processing mode that "downloads" whichever entries the test hands it."""
+    selected = []
+
+    def run(input_path_or_name):
+        for entry in selected:
+            with open(os.path.join(backend.current_job().download_folder, entry["fileName"]), "wb") as f: f.write(b"jar")
+            backend.current_job().set_lock_entry(backend.get_lock_entry_key_backend(entry["source"], entry["projectId"], entry["fileName"]), entry)
+
+    monkeypatch.setitem(backend.PROCESSING_MODES, FAKE_MODE, run)
+    return selected
+
+
+def test_lockfile_round_trip(job, tmp_path):
+    lock_path = str(tmp_path / backend.LOCKFILE_NAME)
+    entries = {"curseforge:2": make_entry(2, "b.jar"), "curseforge:1": make_entry(1, "a.jar")}
+    backend.write_lockfile_backend(lock_path, FAKE_MODE, "some-input", entries)
+
+    lock = backend.read_lockfile_backend(lock_path)
+    assert lock["lockfileVersion"] == backend.LOCKFILE_VERSION
+    assert (lock["mode"], lock["input"], lock["mcVersion"], lock["loader"]) == (FAKE_MODE, "some-input", "1.20.1", "forge")
+    assert [e["fileName"] for e in lock["entries"]] == ["a.jar", "b.jar"]
+    assert backend.lock_entry_to_file_info_backend(lock["entries"][0])["id"] == 10
+    assert not os.path.exists(lock_path + ".tmp")
+
+
+def test_read_lockfile_rejects_missing_and_unknown_versions(job, tmp_path):
+    lock_path = tmp_path / backend.LOCKFILE_NAME
+    assert backend.read_lockfile_backend(str(lock_path)) is None
+    lock_path.write_text(json.dumps({"lockfileVersion": backend.LOCKFILE_VERSION + 1, "entries": []}), encoding="utf-8")
+    assert backend.read_lockfile_backend(str(lock_path)) is None
+
+
+def test_read_lockfile_maps_renamed_modes(job, tmp_path):
+    lock_path = tmp_path / backend.LOCKFILE_NAME
+    lock_path.write_text(json.dumps({"lockfileVersion": backend.LOCKFILE_VERSION, "mode": "Single Mod + Dependencies (CurseForge)", "entries": []}), encoding="utf-8")
+    assert backend.read_lockfile_backend(str(lock_path))["mode"] == backend.CLI_MODES["single"]
+
+
+def test_same_mode_and_input_prunes_dropped_files(job, tmp_path, fake_mode):
+    fake_mode[:] = [make_entry(1, "a.jar"), make_entry(2, "b.jar")]
+    backend.run_processing_mode_backend(FAKE_MODE, "pack.html")
+    fake_mode[:] = [make_entry(1, "a.jar")]
+    backend.run_processing_mode_backend(FAKE_MODE, "pack.html")
+
+    assert (tmp_path / "a.jar").exists()
+    assert not (tmp_path / "b.jar").exists()
+    assert [e["fileName"] for e in backend.read_lockfile_backend(str(tmp_path / backend.LOCKFILE_NAME))["entries"]] == ["a.jar"]
+
+
+def test_different_input_does_not_prune(job, tmp_path, fake_mode):
+    fake_mode[:] = [make_entry(1, "a.jar"), make_entry(2, "b.jar")]
+    backend.run_processing_mode_backend(FAKE_MODE, "pack.html")
+    fake_mode[:] = [make_entry(1, "a.jar")]
+    backend.run_processing_mode_backend(FAKE_MODE, "other-pack.html")
+
+    assert (tmp_path / "a.jar").exists()
+    assert (tmp_path / "b.jar").exists()
+    assert backend.read_lockfile_backend(str(tmp_path / backend.LOCKFILE_NAME))["input"] == "other-pack.html"
+
+
+def test_failed_run_carries_entries_forward_instead_of_pruning(job, tmp_path, fake_mode):
+    fake_mode[:] = [make_entry(1, "a.jar"), make_entry(2, "b.jar")]
+    backend.run_processing_mode_backend(FAKE_MODE, "pack.html")
+    fake_mode[:] = [make_entry(1, "a.jar")]
+    job.add_missed_item({"name": "b", "url": "", "reason": "network"})
+    backend.run_processing_mode_backend(FAKE_MODE, "pack.html")
+
+    assert (tmp_path / "b.jar").exists()
+    assert len(backend.read_lockfile_backend(str(tmp_path / backend.LOCKFILE_NAME))["entries"]) == 2
+
+
+def test_prefetch_only_checks_files_locked_as_modrinth(job, tmp_path, monkeypatch):
+    cf_entry = make_entry(1, "cf.jar")
+    mr_entry = dict(make_entry(2, "mr.jar"), source="modrinth", projectId="MR2")
+    for entry in (cf_entry, mr_entry): (tmp_path / entry["fileName"]).write_bytes(entry["fileName"].encode())
+    backend.write_lockfile_backend(str(tmp_path / backend.LOCKFILE_NAME), FAKE_MODE, "pack", {"a": cf_entry, "b": mr_entry})
+    hashed = []
+    monkeypatch.setattr(backend, "get_modrinth_updates_by_hash_backend", lambda file_hashes, algorithm="sha1": hashed.extend(file_hashes) or {})
+    monkeypatch.setattr(backend, "get_modrinth_versions_bulk_backend", lambda version_ids: {
+        vid: {"id": vid, "project_id": "MR3", "date_published": date} for vid, date in zip(version_ids, ["2024-05-01", "2023-01-01", "2025-02-01"])
+    })
+
+    versions = backend.prefetch_modrinth_versions_backend([{"id": "MR2", "versions": []}, {"id": "MR3", "versions": ["v1", "v2", "v3"]}])
+    assert hashed == [backend.hash_file_backend(str(tmp_path / "mr.jar"), "sha1")]
+    assert [v["id"] for v in versions["MR3"]] == ["v3", "v1", "v2"]
@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+def test_mc_version_ordering():
+    versions = ["1.20", "1.9.4", "1.20.1", "1.19.2", "1.20.10", "1.8"]
+    assert sorted(versions, key=backend.McVersion.of) == ["1.8", "1.9.4", "1.19.2", "1.20", "1.20.1", "1.20.10"]
+    assert backend.McVersion.of("1.20.1") is backend.McVersion.of("1.20.1")
+    assert backend.McVersion.of("1.20.1-rc2").key == (1, 20, 1)
+    assert backend.McVersion.of("rc2").key == (0,)
+    assert backend.McVersion.of("24w14a").key == (24,)
+    assert backend.parse_version_string_backend("1.20.1") == (1, 20, 1)
+
+
+def test_version_matcher_strict_and_loose():
+    matcher = backend.McVersionMatcher.for_version("1.20.1")
+    assert matcher is backend.McVersionMatcher.for_version("1.20.1")
+    assert matcher.matches(["1.19.2", "1.20.1"])
+    assert not matcher.matches(["1.20"])
+    assert matcher.matches(["1.20"], loose=True)
+    assert matcher.matches(["1.20.1-pre1"], loose=True)
+    assert not matcher.matches(["1.19.2", "1.21"], loose=True)
@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+def make_metrics():
+    metrics = backend.Metrics(buckets=(0.1, 1.0))
+    metrics.inc("modease_downloads_total", result="ok")
+    metrics.inc("modease_downloads_total", 2, result="failed")
+    metrics.observe("modease_api_request_seconds", 0.05, host="api.example")
+    metrics.observe("modease_api_request_seconds", 0.5, host="api.example")
+    metrics.observe("modease_api_request_seconds", 3.0, host="api.example")
+    return metrics
+
+
+def test_prometheus_output_has_cumulative_buckets_and_one_type_line_per_metric():
+    assert make_metrics().to_prometheus().splitlines() == [
+        "# TYPE modease_downloads_total counter",
+        'modease_downloads_total{result="failed"} 2',
+        'modease_downloads_total{result="ok"} 1',
+        "# TYPE modease_api_request_seconds histogram",
+        'modease_api_request_seconds_bucket{host="api.example",le="0.1"} 1',
+        'modease_api_request_seconds_bucket{host="api.example",le="1.0"} 2',
+        'modease_api_request_seconds_bucket{host="api.example",le="+Inf"} 3',
+        'modease_api_request_seconds_sum{host="api.example"} 3.55',
+        'modease_api_request_seconds_count{host="api.example"} 3',
+    ]
+
+
+def test_prometheus_label_values_are_escaped():
+    metrics = backend.Metrics()
+    metrics.inc("modease_errors_total", reason='bad "quote"\\ and\nnewline')
+    assert metrics.to_prometheus().splitlines()[1] == 'modease_errors_total{reason="bad \\"quote\\"\\\\ and\\nnewline"} 1'
+
+
+def test_jsonl_and_summaries_match_the_recorded_values():
+    metrics = make_metrics()
+    metrics.record_event("phase", phase="slug_lookup", seconds=0.2)
+    records = [json.loads(line) for line in metrics.to_jsonl().splitlines()]
+    assert [r["type"] for r in records] == ["phase", "counter", "counter", "histogram"]
+    assert records[-1]["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 3}
+    assert metrics.counter_value("modease_downloads_total") == 3
+    assert metrics.histogram_totals("modease_api_request_seconds", "host") == {"api.example": (3, 3.55)}
@@ -0,0 +1,34 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(backend.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_the_burst_then_paces_at_the_rate(clock):
+    limiter = backend.HostRateLimiter({"api.example": (2.0, 3)})
+    assert [limiter.try_acquire("api.example") for _ in range(3)] == [0, 0, 0]
+    assert limiter.try_acquire("api.example") == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert limiter.try_acquire("api.example") == 0
+    assert limiter.try_acquire("other.example") == 0
+
+
+def test_server_hints_block_the_host(clock):
+    limiter = backend.HostRateLimiter()
+    response = SimpleNamespace(headers={"X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": "7", "Retry-After": "3"})
+    assert limiter.observe("api.example", response) == 3.0
+    assert limiter.try_acquire("api.example") == pytest.approx(7.0)
+    clock[0] += 7
+    assert limiter.try_acquire("api.example") == 0
+    assert limiter.observe("api.example", SimpleNamespace(headers={"Retry-After": "soon"})) is None
@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ModEase as backend
+
+
+def get_last_access(cache, key):
+    return cache._conn.execute("SELECT last_access FROM responses WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_hits_only_rewrite_last_access_once_it_is_stale(tmp_path):
+    cache = backend.ResponseCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("k", "https://api.example.invalid/v1/mods/1", b"body")
+    written = get_last_access(cache, "k")
+    assert cache.get("k")["body"] == b"body"
+    assert get_last_access(cache, "k") == written
+
+    stale = written - backend.HTTP_CACHE_ACCESS_RESOLUTION_SECONDS - 1
+    cache._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (stale, "k"))
+    assert cache.get("k")["fresh"]
+    assert get_last_access(cache, "k") > stale